@@ -1,10 +1,16 @@
 from flask import Flask
 from flask_cors import CORS
-from config import config
+from config import config, build_engine_options, build_replica_binds
 from models import db
-from services import (CacheService, UserService, BookService, 
+from routing import init_replicas
+from metrics import registry, init_metrics, pool_collector, hit_ratio
+from timing import init_request_timing
+from slow_queries import init_slow_query_log
+from rate_limit import init_rate_limiting
+from services import (CacheService, CounterService, UserService, BookService,
                      BorrowingService, ReservationService, StatisticsService)
 from routes import create_routes
+from cli import register_commands
 import os
 
 def create_app(config_name=None):
@@ -21,16 +27,33 @@ def create_app(config_name=None):
     # Enable CORS
     CORS(app)
     
+    # Prometheus metrics at GET /metrics
+    init_metrics(app)
+    
+    # Per-request SQL/cache timing (Server-Timing header + log line)
+    init_request_timing(app)
+    
+    # 429 for clients over their token bucket, 503 for expensive routes under load
+    init_rate_limiting(app)
+    
     # Initialize database
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', build_engine_options(app.config))
+    app.config['SQLALCHEMY_BINDS'] = {**build_replica_binds(app.config), **app.config.get('SQLALCHEMY_BINDS', {})}
     db.init_app(app)
+    init_replicas(app, db)
+    init_slow_query_log(app, db)
+    with app.app_context():
+        registry.add_collector('db_pool', pool_collector(db.engine))
+    registry.add_derived('cache_hit_ratio', hit_ratio('cache_requests_total', 'cache_hit_ratio'))
     
     # Initialize services
     cache_service = CacheService(app.config)
-    user_service = UserService(cache_service)
+    counter_service = CounterService(app.config)
+    user_service = UserService(cache_service, counter_service)
     book_service = BookService(cache_service)
-    borrowing_service = BorrowingService(cache_service, user_service, book_service)
-    reservation_service = ReservationService(cache_service)
-    statistics_service = StatisticsService(cache_service)
+    borrowing_service = BorrowingService(cache_service, user_service, book_service, counter_service)
+    reservation_service = ReservationService(cache_service, counter_service)
+    statistics_service = StatisticsService(cache_service, counter_service)
     
     # Create and register routes
     api_blueprint = create_routes(
@@ -43,6 +66,9 @@ def create_app(config_name=None):
     
     app.register_blueprint(api_blueprint)
     
+    # Register maintenance CLI commands
+    register_commands(app, statistics_service=statistics_service, user_service=user_service)
+    
     return app
 
 # Create app instance at module level for WSGI servers (gunicorn, etc.)
@@ -0,0 +1,91 @@
+"""
+Async (ASGI) serving mode for the layered backend.
+
+Serves the same /api routes as app.py from async services on async SQLAlchemy
+and redis.asyncio, so one process can keep many slow requests in flight:
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+
+It has the WSGI app's GET /metrics, sampled Server-Timing and rate limiting /
+load shedding (asgi_middleware.py). Admin tooling (bulk import, timeseries,
+pool metrics) and read-replica routing remain on the WSGI app.
+"""
+import contextlib
+import os
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
+from starlette.routing import Route
+from config import config
+from async_services import (create_session_factory, AsyncCacheService, AsyncCounterService,
+                            AsyncUserService, AsyncBookService, AsyncBorrowingService,
+                            AsyncReservationService, AsyncStatisticsService)
+from async_routes import create_async_routes
+from asgi_middleware import RequestMetricsMiddleware, RequestTimingMiddleware, RateLimitMiddleware
+from metrics import registry, hit_ratio
+
+
+async def prometheus_metrics(request):
+    return Response(registry.render(), media_type='text/plain; version=0.0.4')
+
+
+def create_asgi_app(config_name=None, overrides=None):
+    """Application factory for the async app"""
+    if config_name is None:
+        config_name = os.getenv('FLASK_ENV', 'development')
+
+    config_class = config[config_name]
+    app_config = {key: getattr(config_class, key) for key in dir(config_class) if key.isupper()}
+    app_config.update(overrides or {})
+
+    # Initialize database and services
+    sessions = create_session_factory(app_config)
+    cache_service = AsyncCacheService(app_config)
+    counter_service = AsyncCounterService(app_config)
+    user_service = AsyncUserService(sessions, cache_service, counter_service)
+    book_service = AsyncBookService(sessions, cache_service)
+    borrowing_service = AsyncBorrowingService(sessions, cache_service, counter_service)
+    reservation_service = AsyncReservationService(sessions, cache_service, counter_service)
+    statistics_service = AsyncStatisticsService(sessions, cache_service, counter_service)
+    registry.add_derived('cache_hit_ratio', hit_ratio('cache_requests_total', 'cache_hit_ratio'))
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        await cache_service.connect()
+        yield
+        await cache_service.close()
+        await sessions.kw['bind'].dispose()
+
+    # Same order as app.py: metrics see every response, including timing and rejections
+    middleware = [
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*']),
+        Middleware(RequestMetricsMiddleware)
+    ]
+    sample_rate = float(app_config.get('REQUEST_TIMING_SAMPLE_RATE', 0.0))
+    if sample_rate > 0:
+        middleware.append(Middleware(RequestTimingMiddleware, sample_rate=sample_rate))
+    if RateLimitMiddleware.enabled(app_config):
+        middleware.append(Middleware(RateLimitMiddleware, app_config=app_config))
+
+    app = Starlette(
+        routes=[
+            create_async_routes(
+                user_service=user_service,
+                book_service=book_service,
+                borrowing_service=borrowing_service,
+                reservation_service=reservation_service,
+                statistics_service=statistics_service
+            ),
+            Route('/metrics', prometheus_metrics, methods=['GET'])
+        ],
+        middleware=middleware,
+        lifespan=lifespan
+    )
+    app.state.config = app_config
+    app.state.sessions = sessions
+
+    return app
+
+# Create app instance at module level for ASGI servers (uvicorn, etc.)
+app = create_asgi_app()
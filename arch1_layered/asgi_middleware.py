@@ -0,0 +1,166 @@
+"""
+Request metrics, Server-Timing and rate limiting for asgi_app.py.
+
+Pure ASGI counterparts of init_metrics (metrics.py), init_request_timing
+(timing.py) and init_rate_limiting (rate_limit.py). They read the same
+settings and report the same metric names, route labels, headers and log
+line, so dashboards and limits cover both apps alike.
+"""
+import json
+import random
+import re
+import time
+from typing import Optional, Tuple
+import redis.asyncio as aioredis
+from starlette.datastructures import Headers
+from starlette.routing import Match, Mount
+from metrics import MetricsRegistry, registry, describe_request_metrics, record_request
+from rate_limit import (AsyncRateLimiter, LoadShedder, client_address, limiter_redis_options,
+                        rate_limit_settings, record_rejection, route_class)
+from timing import RequestTimer, _current_timer, configure_json_logger, log_request_timing, logger
+
+_STARLETTE_PARAM = re.compile(r'{(\w+)(?::(\w+))?}')
+
+
+def _flask_template(path: str) -> str:
+    """'/api/books/{book_id:int}' -> '/api/books/<int:book_id>', the label app.py reports"""
+    return _STARLETTE_PARAM.sub(lambda m: f'<{m.group(2)}:{m.group(1)}>' if m.group(2) else f'<{m.group(1)}>', path)
+
+
+def _match(routes, scope) -> Tuple[Optional[str], Optional[str]]:
+    for route in routes:
+        match, child_scope = route.matches(scope)
+        if isinstance(route, Mount) and match != Match.NONE:
+            endpoint, path = _match(route.routes, {**scope, **child_scope})
+            if endpoint:
+                return f'{route.name}.{endpoint}', route.path + path
+        elif match == Match.FULL:
+            return route.name, route.path
+    return None, None
+
+
+def resolve_route(scope) -> Tuple[Optional[str], str]:
+    """(endpoint named as in app.py, e.g. 'api.search_books', route label) for a request
+
+    Wrong-method and unknown paths are (None, 'unmatched'), as in the Flask app.
+    Call it before passing the request on: routing rewrites the scope's root_path.
+    """
+    if 'library.route' not in scope:
+        endpoint, path = _match(scope['app'].routes, scope)
+        scope['library.route'] = (endpoint, _flask_template(path) if path else 'unmatched')
+    return scope['library.route']
+
+
+class RequestMetricsMiddleware:
+    """Per-route request counts, errors, latency and in-flight requests in the metrics registry"""
+
+    def __init__(self, app, metrics: MetricsRegistry = registry):
+        self.app = app
+        self.metrics = metrics
+        describe_request_metrics(metrics)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status = 500
+        _, route = resolve_route(scope)
+        self.metrics.gauge_add('http_requests_in_flight')
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.gauge_add('http_requests_in_flight', amount=-1)
+            record_request(self.metrics, scope['method'], route, status, time.perf_counter() - started)
+
+
+class RequestTimingMiddleware:
+    """Server-Timing header and request_timing log line for REQUEST_TIMING_SAMPLE_RATE of requests"""
+
+    def __init__(self, app, sample_rate: float):
+        self.app = app
+        self.sample_rate = sample_rate
+        configure_json_logger(logger)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return await self.app(scope, receive, send)
+
+        endpoint, _ = resolve_route(scope)
+        timer = RequestTimer()
+        token = _current_timer.set(timer)
+
+        async def send_with_timing(message):
+            if message['type'] == 'http.response.start':
+                total_seconds = time.perf_counter() - timer.started
+                message = {**message, 'headers': [
+                    *message.get('headers', []),
+                    (b'server-timing', timer.server_timing(total_seconds).encode('latin-1'))
+                ]}
+                log_request_timing(timer, total_seconds, scope['method'], scope['path'], endpoint,
+                                   message['status'])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timer.reset(token)
+
+
+class RateLimitMiddleware:
+    """429 for clients over their route class's token bucket, 503 for expensive routes under load"""
+
+    def __init__(self, app, app_config):
+        self.app = app
+        limits, max_in_flight = rate_limit_settings(app_config)
+        self.limiter = AsyncRateLimiter(aioredis.Redis(**limiter_redis_options(app_config)), limits) if limits else None
+        self.shedder = LoadShedder(max_in_flight) if max_in_flight > 0 else None
+        self.client_header = app_config.get('RATE_LIMIT_CLIENT_HEADER')
+
+    @staticmethod
+    def enabled(app_config) -> bool:
+        limits, max_in_flight = rate_limit_settings(app_config)
+        return bool(limits) or max_in_flight > 0
+
+    async def __call__(self, scope, receive, send):
+        cost_class = None
+        if scope['type'] == 'http' and scope['method'] != 'OPTIONS':
+            cost_class = route_class(resolve_route(scope)[0])
+        if cost_class is None:
+            return await self.app(scope, receive, send)
+
+        entered = False
+        try:
+            if self.shedder:
+                entered = True
+                if self.shedder.should_shed(cost_class, self.shedder.enter()):
+                    return await self._reject(send, 'shed', cost_class, 503, 1, 'Server busy, please retry')
+
+            if self.limiter:
+                client = client_address(Headers(scope=scope).get(self.client_header) if self.client_header else None,
+                                        (scope.get('client') or (None,))[0])
+                allowed, retry_after = await self.limiter.allow(cost_class, client)
+                if not allowed:
+                    return await self._reject(send, 'rate_limited', cost_class, 429, retry_after, 'Too many requests')
+
+            await self.app(scope, receive, send)
+        finally:
+            if entered:
+                self.shedder.exit()
+
+    @staticmethod
+    async def _reject(send, reason: str, cost_class: str, status: int, retry_after: float, message: str):
+        body = json.dumps({'error': message}).encode()
+        await send({'type': 'http.response.start', 'status': status, 'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (b'retry-after', record_rejection(reason, cost_class, retry_after).encode())
+        ]})
+        await send({'type': 'http.response.body', 'body': body})
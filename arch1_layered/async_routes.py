@@ -0,0 +1,221 @@
+from datetime import datetime, timezone
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+from async_services import (AsyncUserService, AsyncBookService, AsyncBorrowingService,
+                            AsyncReservationService, AsyncStatisticsService)
+
+
+async def _json_body(request: Request):
+    """Parsed JSON body, or None if it is missing or malformed"""
+    try:
+        return await request.json()
+    except Exception:
+        return None
+
+
+def _int_arg(request: Request, name: str, default: int) -> int:
+    """Integer query parameter with Flask's `type=int` fallback to the default"""
+    try:
+        return int(request.query_params[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def create_async_routes(user_service: AsyncUserService, book_service: AsyncBookService,
+                        borrowing_service: AsyncBorrowingService, reservation_service: AsyncReservationService,
+                        statistics_service: AsyncStatisticsService) -> Mount:
+    """The routes.py API contract served by the async services"""
+
+    # Health check endpoint
+    async def health_check(request):
+        """System health check"""
+        return JSONResponse({
+            'status': 'healthy',
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'version': '1.0.0'
+        })
+
+    # User Management Routes
+    async def register_user(request):
+        """Register a new user"""
+        try:
+            data = await _json_body(request)
+            if not data:
+                return JSONResponse({'error': 'No data provided'}, 400)
+
+            success, message, user = await user_service.create_user(
+                student_id=data.get('student_id'),
+                name=data.get('name'),
+                email=data.get('email'),
+                role=data.get('role', 'student')
+            )
+
+            if success:
+                return JSONResponse({
+                    'message': message,
+                    'user': user.to_dict()
+                }, 201)
+            else:
+                return JSONResponse({'error': message}, 400)
+
+        except Exception as e:
+            return JSONResponse({'error': str(e)}, 500)
+
+    async def get_user(request):
+        """Get user by ID"""
+        user = await user_service.get_user_by_id(request.path_params['user_id'])
+        if not user:
+            return JSONResponse({'error': 'User not found'}, 404)
+        return JSONResponse({'user': user.to_dict()})
+
+    async def login_user(request):
+        """Simple user authentication"""
+        try:
+            data = await _json_body(request)
+            if not data or 'student_id' not in data:
+                return JSONResponse({'error': 'Student ID is required'}, 400)
+
+            success, message, user = await user_service.authenticate_user(data['student_id'])
+
+            if success:
+                return JSONResponse({
+                    'message': message,
+                    'user': user.to_dict()
+                })
+            else:
+                return JSONResponse({'error': message}, 401)
+
+        except Exception as e:
+            return JSONResponse({'error': str(e)}, 500)
+
+    # Book Management Routes
+    async def get_books(request):
+        """Get books with pagination and filtering"""
+        result = await book_service.get_books(
+            page=_int_arg(request, 'page', 1),
+            per_page=_int_arg(request, 'limit', 10),
+            category=request.query_params.get('category')
+        )
+        return JSONResponse(result)
+
+    async def search_books(request):
+        """Search books by title or author"""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return JSONResponse({'error': 'Search query parameter "q" is required'}, 400)
+
+        result = await book_service.search_books(query)
+        return JSONResponse(result)
+
+    async def get_book(request):
+        """Get book details by ID"""
+        book = await book_service.get_book_by_id(request.path_params['book_id'])
+        if not book:
+            return JSONResponse({'error': 'Book not found'}, 404)
+        return JSONResponse({'book': book.to_dict()})
+
+    async def get_popular_books(request):
+        """Get most popular books"""
+        popular_books = await book_service.get_popular_books(limit=_int_arg(request, 'limit', 10))
+        return JSONResponse({'popular_books': popular_books})
+
+    # Borrowing Routes
+    async def borrow_book(request):
+        """Borrow a book"""
+        try:
+            data = await _json_body(request)
+            if not data or 'user_id' not in data or 'book_id' not in data:
+                return JSONResponse({'error': 'user_id and book_id are required'}, 400)
+
+            success, message, borrowing = await borrowing_service.borrow_book(
+                user_id=data['user_id'],
+                book_id=data['book_id']
+            )
+
+            if success:
+                return JSONResponse({
+                    'message': message,
+                    'borrowing': borrowing.to_dict()
+                })
+            else:
+                return JSONResponse({'error': message}, 400)
+
+        except Exception as e:
+            return JSONResponse({'error': str(e)}, 500)
+
+    async def return_book(request):
+        """Return a borrowed book"""
+        try:
+            success, message, borrowing = await borrowing_service.return_book(request.path_params['borrowing_id'])
+
+            if success:
+                return JSONResponse({
+                    'message': message,
+                    'borrowing': borrowing.to_dict()
+                })
+            else:
+                return JSONResponse({'error': message}, 400)
+
+        except Exception as e:
+            return JSONResponse({'error': str(e)}, 500)
+
+    async def get_user_borrowed_books(request):
+        """Get user's currently borrowed books"""
+        result = await borrowing_service.get_user_borrowed_books(request.path_params['user_id'])
+        return JSONResponse(result)
+
+    async def get_overdue_books(request):
+        """Get all overdue books (admin only)"""
+        overdue_books = await borrowing_service.get_overdue_books()
+        return JSONResponse({
+            'overdue_books': overdue_books,
+            'count': len(overdue_books)
+        })
+
+    # Reservation Routes
+    async def create_reservation(request):
+        """Create a book reservation"""
+        try:
+            data = await _json_body(request)
+            if not data or 'user_id' not in data or 'book_id' not in data:
+                return JSONResponse({'error': 'user_id and book_id are required'}, 400)
+
+            success, message, reservation = await reservation_service.create_reservation(
+                user_id=data['user_id'],
+                book_id=data['book_id']
+            )
+
+            if success:
+                return JSONResponse({
+                    'message': message,
+                    'reservation': reservation.to_dict()
+                }, 201)
+            else:
+                return JSONResponse({'error': message}, 400)
+
+        except Exception as e:
+            return JSONResponse({'error': str(e)}, 500)
+
+    # Statistics Routes
+    async def get_statistics(request):
+        """Get system statistics"""
+        stats = await statistics_service.get_system_statistics()
+        return JSONResponse(stats)
+
+    return Mount('/api', name='api', routes=[
+        Route('/health', health_check, methods=['GET']),
+        Route('/users/register', register_user, methods=['POST']),
+        Route('/users/login', login_user, methods=['POST']),
+        Route('/users/{user_id:int}', get_user, methods=['GET']),
+        Route('/users/{user_id:int}/borrowed', get_user_borrowed_books, methods=['GET']),
+        Route('/books', get_books, methods=['GET']),
+        Route('/books/search', search_books, methods=['GET']),
+        Route('/books/popular', get_popular_books, methods=['GET']),
+        Route('/books/{book_id:int}', get_book, methods=['GET']),
+        Route('/borrow', borrow_book, methods=['POST']),
+        Route('/return/{borrowing_id:int}', return_book, methods=['POST']),
+        Route('/overdue', get_overdue_books, methods=['GET']),
+        Route('/reserve', create_reservation, methods=['POST']),
+        Route('/admin/stats', get_statistics, methods=['GET']),
+    ])
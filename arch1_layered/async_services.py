@@ -0,0 +1,500 @@
+"""
+Async counterparts of the services in services.py, used by asgi_app.py.
+
+They return the same shapes, use the same cache keys and expiries, and take
+their business rules (validation, availability and limit checks, fines,
+counter deltas) and queries from the helpers on the synchronous services, so
+the two apps stay interchangeable behind the same /api contract. Only the I/O
+lives here.
+"""
+import json
+import math
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import redis.asyncio as aioredis
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from models import User, Book, Borrowing, Reservation, LibraryCounter
+from config import Config
+from timing import timed_async_cache_call
+from metrics import registry
+from services import (CACHE_HIT, CACHE_MISS, CACHE_ERROR, CounterService, UserService, BookService, BorrowingService, ReservationService,
+                      StatisticsService)
+
+
+def async_database_url(uri: str) -> str:
+    """Swap the synchronous driver in a database URL for its asyncio equivalent"""
+    scheme, _, rest = uri.partition('://')
+    backend = scheme.split('+')[0]
+    if backend in ('postgres', 'postgresql'):
+        return f'postgresql+asyncpg://{rest}'
+    if backend == 'sqlite':
+        return f'sqlite+aiosqlite://{rest}'
+    return uri
+
+
+def build_async_engine_options(app_config, uri: str) -> dict:
+    """Same DB_* pool settings as build_engine_options, for an AsyncEngine"""
+    if uri.startswith('sqlite'):
+        return {}
+
+    options = {
+        'pool_size': app_config.get('DB_POOL_SIZE', 5),
+        'max_overflow': app_config.get('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': app_config.get('DB_POOL_TIMEOUT', 10),
+        'pool_recycle': app_config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': app_config.get('DB_POOL_PRE_PING', True),
+    }
+
+    statement_timeout = app_config.get('DB_STATEMENT_TIMEOUT_MS', 0)
+    if statement_timeout and uri.startswith('postgresql'):
+        options['connect_args'] = {'server_settings': {'statement_timeout': str(statement_timeout)}}
+
+    return options
+
+
+def _naive_utc(value):
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _strip_timezones(conn, cursor, statement, parameters, context, executemany):
+    """asyncpg rejects aware datetimes for the models' TIMESTAMP WITHOUT TIME ZONE
+    columns (psycopg2 converts them silently), so bind them as naive UTC"""
+    if executemany:
+        return statement, [tuple(_naive_utc(value) for value in row) for row in parameters]
+    return statement, tuple(_naive_utc(value) for value in parameters)
+
+
+def create_session_factory(app_config) -> async_sessionmaker:
+    uri = async_database_url(app_config.get('SQLALCHEMY_DATABASE_URI') or '')
+    engine = create_async_engine(uri, **build_async_engine_options(app_config, uri))
+    if engine.dialect.name == 'postgresql':
+        event.listen(engine.sync_engine, 'before_cursor_execute', _strip_timezones, retval=True)
+    # Objects are serialized after commit, so keep their loaded state
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+class AsyncCacheService:
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.redis_client = None
+        self.cache_enabled = False
+
+    async def connect(self) -> None:
+        try:
+            self.redis_client = aioredis.Redis(
+                host=self.config.get('REDIS_HOST', 'localhost'),
+                port=self.config.get('REDIS_PORT', 6379),
+                db=self.config.get('REDIS_DB', 0),
+                decode_responses=True
+            )
+            await self.redis_client.ping()
+            self.cache_enabled = True
+            print("Redis cache connected successfully")
+
+        except Exception as e:
+            self.redis_client = None
+            self.cache_enabled = False
+            print(f"Redis cache not available: {e}")
+
+    async def close(self) -> None:
+        if self.redis_client is not None:
+            await self.redis_client.close()
+
+    @timed_async_cache_call
+    async def get(self, key: str) -> Optional[str]:
+        if not self.cache_enabled:
+            return None
+        try:
+            value = await self.redis_client.get(key)
+        except Exception:
+            registry.inc('cache_requests_total', CACHE_ERROR)
+            return None
+        registry.inc('cache_requests_total', CACHE_HIT if value is not None else CACHE_MISS)
+        return value
+
+    @timed_async_cache_call
+    async def set(self, key: str, value: str, expiry: int = 300) -> bool:
+        if not self.cache_enabled:
+            return False
+        try:
+            return await self.redis_client.setex(key, expiry, value)
+        except Exception:
+            return False
+
+    @timed_async_cache_call
+    async def clear_pattern(self, pattern: str) -> int:
+        if not self.cache_enabled:
+            return 0
+        try:
+            keys = await self.redis_client.keys(pattern)
+            if keys:
+                return await self.redis_client.delete(*keys)
+            return 0
+        except Exception:
+            return 0
+
+
+class AsyncCounterService:
+    """library_counters access for the async app; deltas come from CounterService"""
+
+    def __init__(self, config: Config):
+        self.counters = CounterService(config)
+        self.enabled = self.counters.enabled
+
+    async def increment(self, session: AsyncSession, **deltas: int) -> None:
+        for statement in self.counters.statements(**deltas):
+            await session.execute(statement)
+
+    async def snapshot(self, session: AsyncSession) -> Optional[Dict[str, int]]:
+        rows = (await session.execute(select(LibraryCounter.name, LibraryCounter.value))).all()
+        values = {name: value for name, value in rows}
+        if any(name not in values for name in CounterService.COUNTER_NAMES):
+            return None
+        return values
+
+    async def lock(self, session: AsyncSession) -> None:
+        for statement in CounterService.lock_statements(session.bind.dialect.name):
+            await session.execute(statement)
+
+    async def rebuild(self, session: AsyncSession, values: Dict[str, int]) -> None:
+        try:
+            await session.execute(CounterService.rebuild_statement(values, session.bind.dialect.name))
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+class AsyncUserService:
+
+    def __init__(self, sessions: async_sessionmaker, cache_service: AsyncCacheService,
+                 counter_service: Optional[AsyncCounterService] = None):
+        self.sessions = sessions
+        self.cache = cache_service
+        self.counters = counter_service or AsyncCounterService({})
+
+    async def create_user(self, student_id: str, name: str, email: str, role: str = 'student') -> Tuple[bool, str, Optional[User]]:
+        async with self.sessions() as session:
+            try:
+                error = UserService.new_user_error(student_id, name, email)
+                if not error:
+                    existing_user = await session.scalar(UserService.existing_user_statement(student_id, email))
+                    error = UserService.new_user_error(student_id, name, email, existing_user)
+                if error:
+                    return False, error, None
+
+                user = User(student_id=student_id,
+                            name=name,
+                            email=email,
+                            role=role)
+
+                session.add(user)
+                await self.counters.increment(session, **UserService.user_counter_deltas(role))
+                await session.commit()
+
+                return True, "User created successfully", user
+
+            except Exception as e:
+                await session.rollback()
+                return False, f"Error creating user: {str(e)}", None
+
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        async with self.sessions() as session:
+            return await session.get(User, user_id)
+
+    async def get_user_by_student_id(self, student_id: str) -> Optional[User]:
+        async with self.sessions() as session:
+            return await session.scalar(select(User).filter_by(student_id=student_id).limit(1))
+
+    async def authenticate_user(self, student_id: str) -> Tuple[bool, str, Optional[User]]:
+        user = await self.get_user_by_student_id(student_id)
+        if user:
+            return True, "Authentication successful", user
+        return False, "User not found", None
+
+
+class AsyncBookService:
+
+    def __init__(self, sessions: async_sessionmaker, cache_service: AsyncCacheService):
+        self.sessions = sessions
+        self.cache = cache_service
+
+    async def get_books(self, page: int = 1, per_page: int = 10, category: str = None) -> Dict:
+        try:
+            cache_key = f"books:page:{page}:per_page:{per_page}:category:{category or 'all'}"
+            cached_result = await self.cache.get(cache_key)
+
+            if cached_result:
+                return {**json.loads(cached_result), 'source': 'cache'}
+
+            # Same fallbacks as Flask-SQLAlchemy's paginate(error_out=False)
+            current_page = page if page and page > 0 else 1
+            page_size = per_page if per_page and per_page > 0 else 20
+
+            statement = BookService.available_books_statement(category)
+            async with self.sessions() as session:
+                total = await session.scalar(select(func.count()).select_from(statement.subquery()))
+                books = (await session.scalars(
+                    statement.limit(page_size).offset((current_page - 1) * page_size)
+                )).all()
+
+            pages = math.ceil(total / page_size) if total else 0
+            result = {
+                'books': [book.to_dict() for book in books],
+                'pagination': {
+                    'page': page,
+                    'pages': pages,
+                    'total': total,
+                    'has_next': current_page < pages,
+                    'has_prev': current_page > 1
+                },
+                'source': 'database'
+            }
+
+            await self.cache.set(cache_key, json.dumps({
+                'books': result['books'],
+                'pagination': result['pagination']
+            }), 300)
+
+            return result
+
+        except Exception as e:
+            return {'error': str(e), 'books': [], 'pagination': {}}
+
+    async def search_books(self, query: str) -> Dict:
+        try:
+            if not query.strip():
+                return {'error': 'Search query cannot be empty', 'books': []}
+
+            cache_key = f"search:{query.lower().strip()}"
+            cached_result = await self.cache.get(cache_key)
+
+            if cached_result:
+                return {**json.loads(cached_result), 'source': 'cache'}
+
+            async with self.sessions() as session:
+                books = (await session.scalars(BookService.search_statement(query))).all()
+
+            result = {
+                'books': [book.to_dict() for book in books],
+                'query': query,
+                'count': len(books),
+                'source': 'database'
+            }
+
+            await self.cache.set(cache_key, json.dumps({
+                'books': result['books'],
+                'query': result['query'],
+                'count': result['count']
+            }), 600)
+
+            return result
+
+        except Exception as e:
+            return {'error': str(e), 'books': [], 'query': query, 'count': 0}
+
+    async def get_book_by_id(self, book_id: int) -> Optional[Book]:
+        async with self.sessions() as session:
+            return await session.get(Book, book_id)
+
+    async def get_popular_books(self, limit: int = 10) -> List[Dict]:
+        try:
+            async with self.sessions() as session:
+                popular_books = (await session.execute(BookService.popular_statement(limit))).all()
+
+            return [{
+                **book.to_dict(),
+                'borrow_count': count
+            } for book, count in popular_books]
+
+        except Exception as e:
+            return []
+
+
+class AsyncBorrowingService:
+
+    def __init__(self, sessions: async_sessionmaker, cache_service: AsyncCacheService,
+                 counter_service: Optional[AsyncCounterService] = None):
+        self.sessions = sessions
+        self.cache = cache_service
+        self.counters = counter_service or AsyncCounterService({})
+
+    async def borrow_book(self, user_id: int, book_id: int, loan_days: int = 14) -> Tuple[bool, str, Optional[Borrowing]]:
+        """Process book borrowing"""
+        async with self.sessions() as session:
+            try:
+                user = await session.get(User, user_id)
+                book = await session.get(Book, book_id)
+
+                # User.can_borrow_book() lazy-loads, which async sessions cannot do, so count here
+                error = BorrowingService.borrow_error(user, book)
+                if not error:
+                    active_count = await session.scalar(BorrowingService.active_count_statement(user_id))
+                    existing_borrowing = await session.scalar(BorrowingService.active_loan_statement(user_id, book_id))
+                    error = BorrowingService.borrow_error(user, book, active_count, existing_borrowing)
+                if error:
+                    return False, error, None
+
+                borrowing, deltas = BorrowingService.lend(user_id, book, loan_days)
+
+                session.add(borrowing)
+                await self.counters.increment(session, **deltas)
+                await session.commit()
+
+                await self.cache.clear_pattern('books:*')
+                await self.cache.clear_pattern(f'user:{user_id}:*')
+
+                return True, "Book borrowed successfully", borrowing
+
+            except Exception as e:
+                await session.rollback()
+                return False, f"Error borrowing book: {str(e)}", None
+
+    async def return_book(self, borrowing_id: int) -> Tuple[bool, str, Optional[Borrowing]]:
+        """Process book return"""
+        async with self.sessions() as session:
+            try:
+                borrowing = await session.get(Borrowing, borrowing_id)
+                error = BorrowingService.return_error(borrowing)
+                if error:
+                    return False, error, None
+
+                book = await session.get(Book, borrowing.book_id)
+                await self.counters.increment(session, **BorrowingService.take_back(borrowing, book))
+                await session.commit()
+
+                await self.cache.clear_pattern('books:*')
+                await self.cache.clear_pattern(f'user:{borrowing.user_id}:*')
+
+                return True, "Book returned successfully", borrowing
+
+            except Exception as e:
+                await session.rollback()
+                return False, f"Error returning book: {str(e)}", None
+
+    async def get_user_borrowed_books(self, user_id: int) -> Dict:
+        """Get user's currently borrowed books"""
+        try:
+            cache_key = f'user:{user_id}:borrowed'
+            cached_result = await self.cache.get(cache_key)
+
+            if cached_result:
+                return {**json.loads(cached_result), 'source': 'cache'}
+
+            async with self.sessions() as session:
+                borrowings = (await session.execute(BorrowingService.borrowed_statement(user_id))).all()
+
+            borrowed_books = [BorrowingService.borrowed_book_dict(borrowing, book) for borrowing, book in borrowings]
+
+            result = {
+                'borrowed_books': borrowed_books,
+                'count': len(borrowed_books),
+                'user_id': user_id,
+                'source': 'database'
+            }
+
+            await self.cache.set(cache_key, json.dumps({
+                'borrowed_books': result['borrowed_books'],
+                'count': result['count'],
+                'user_id': result['user_id']
+            }), 300)
+
+            return result
+
+        except Exception as e:
+            return {'error': str(e), 'borrowed_books': [], 'count': 0, 'user_id': user_id}
+
+    async def get_overdue_books(self) -> List[Dict]:
+        """Get all overdue books"""
+        try:
+            async with self.sessions() as session:
+                overdue_borrowings = (await session.execute(BorrowingService.overdue_statement())).all()
+
+            return [{
+                'borrowing': borrowing.to_dict(),
+                'book': book.to_dict(),
+                'user': user.to_dict()
+            } for borrowing, book, user in overdue_borrowings]
+
+        except Exception as e:
+            return []
+
+
+class AsyncReservationService:
+
+    def __init__(self, sessions: async_sessionmaker, cache_service: AsyncCacheService,
+                 counter_service: Optional[AsyncCounterService] = None):
+        self.sessions = sessions
+        self.cache = cache_service
+        self.counters = counter_service or AsyncCounterService({})
+
+    async def create_reservation(self, user_id: int, book_id: int) -> Tuple[bool, str, Optional[Reservation]]:
+        async with self.sessions() as session:
+            try:
+                existing_reservation = await session.scalar(
+                    ReservationService.active_reservation_statement(user_id, book_id))
+                error = ReservationService.reservation_error(existing_reservation)
+                if error:
+                    return False, error, None
+
+                max_priority = await session.scalar(ReservationService.max_priority_statement(book_id))
+                reservation = ReservationService.queue_reservation(user_id, book_id, max_priority)
+
+                session.add(reservation)
+                await self.counters.increment(session, reservations_active=1)
+                await session.commit()
+
+                return True, "Reservation created successfully", reservation
+
+            except Exception as e:
+                await session.rollback()
+                return False, f"Error creating reservation: {str(e)}", None
+
+
+class AsyncStatisticsService:
+
+    def __init__(self, sessions: async_sessionmaker, cache_service: AsyncCacheService,
+                 counter_service: Optional[AsyncCounterService] = None):
+        self.sessions = sessions
+        self.cache = cache_service
+        self.counters = counter_service or AsyncCounterService({})
+
+    async def get_system_statistics(self) -> Dict:
+        try:
+            if self.counters.enabled:
+                return await self._get_counter_statistics()
+
+            cached_result = await self.cache.get(StatisticsService.CACHE_KEY)
+
+            if cached_result:
+                return {**json.loads(cached_result), 'source': 'cache'}
+
+            async with self.sessions() as session:
+                stats = StatisticsService._build_statistics(await self._count_all(session))
+
+            await self.cache.set(StatisticsService.CACHE_KEY, json.dumps(stats), StatisticsService.CACHE_EXPIRY)
+
+            return {**stats, 'source': 'database'}
+
+        except Exception as e:
+            return {'error': str(e)}
+
+    async def _get_counter_statistics(self) -> Dict:
+        async with self.sessions() as session:
+            counts = await self.counters.snapshot(session)
+            if counts is None:
+                await self.counters.lock(session)
+                counts = await self._count_all(session)
+                await self.counters.rebuild(session, counts)
+            else:
+                counts['borrowings_overdue'] = await session.scalar(StatisticsService.overdue_count_statement())
+
+        return {**StatisticsService._build_statistics(counts), 'source': 'counters'}
+
+    async def _count_all(self, session: AsyncSession) -> Dict[str, int]:
+        row = (await session.execute(StatisticsService.count_all_statement())).one()
+        return {key: int(value or 0) for key, value in row._mapping.items()}
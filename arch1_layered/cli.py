@@ -0,0 +1,61 @@
+import click
+import migrations
+from services import StatisticsService, UserService
+
+def register_commands(app, statistics_service: StatisticsService, user_service: UserService):
+    """Register maintenance commands on the Flask CLI (run with `flask --app app <command>`)"""
+
+    @app.cli.command('rollup-stats')
+    @click.option('--since', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+                  help='First day to (re)build. Defaults to the day after the last rollup.')
+    @click.option('--through', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+                  help='Last day to build. Defaults to yesterday (UTC).')
+    def rollup_stats(since, through):
+        """Build daily_stats rollups; intended to run nightly from cron"""
+        result = statistics_service.rollup_daily_stats(
+            since=since.date() if since else None,
+            through=through.date() if through else None
+        )
+        if 'error' in result:
+            raise click.ClickException(result['error'])
+        click.echo(f"Rolled up {result['days']} day(s) from {result['since']} through {result['through']}")
+
+    @app.cli.command('import-users')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), default=None,
+                  help='Input format. Defaults to the file extension (.csv or .ndjson/.jsonl).')
+    @click.option('--batch-size', type=int, default=1000, show_default=True,
+                  help='Rows per INSERT ... ON CONFLICT DO NOTHING statement.')
+    def import_users(path, fmt, batch_size):
+        """Bulk import users from a CSV or NDJSON file"""
+        if fmt is None:
+            fmt = 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv'
+
+        with open(path, newline='', encoding='utf-8') as handle:
+            report = user_service.bulk_import_users(
+                user_service.parse_import_rows(handle, fmt), batch_size=batch_size
+            )
+
+        for detail in report['error_details']:
+            click.echo(f"line {detail['line']}: {detail['error']}", err=True)
+        click.echo(f"created={report['created']} skipped={report['skipped']} errors={report['errors']}")
+
+    @app.cli.command('migrate')
+    @click.option('--status', is_flag=True, help='List applied and pending migrations without applying any.')
+    @click.option('--target', default=None, help='Stop after this version (e.g. 0001).')
+    def migrate(status, target):
+        """Apply pending schema migrations (migrations/NNNN_*.py)"""
+        engine = migrations.migration_engine(app.config['SQLALCHEMY_DATABASE_URI'])
+        try:
+            if status:
+                applied = migrations.applied_versions(engine)
+                for migration in migrations.discover():
+                    state = applied[migration.version].isoformat() if migration.version in applied else 'pending'
+                    click.echo(f"{migration.version} {migration.name}: {state}")
+                return
+
+            for migration in migrations.migrate(engine, target=target):
+                click.echo(f"Applied {migration.version} {migration.name}")
+            click.echo("Schema is up to date" if target is None else f"Migrated through {target}")
+        finally:
+            engine.dispose()
@@ -11,6 +11,18 @@ class Config:
     DATABASE_URL = os.getenv('DATABASE_URL')
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
 
+    # Connection pool (per process; total connections = workers * (size + overflow))
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 10))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))  # 0 disables
+
+    # Optional read replicas (comma-separated URLs) for @read_only service methods
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    DB_REPLICA_EJECT_SECONDS = int(os.getenv('DB_REPLICA_EJECT_SECONDS', 30))
+
     REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
     REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
     REDIS_DB = int(os.getenv('REDIS_DB', 0))
@@ -20,6 +32,29 @@ class Config:
     LOAN_PERIOD_DAYS = int(os.getenv('LOAN_PERIOD_DAYS', 14))
     CACHE_EXPIRY_SECONDS = int(os.getenv('CACHE_EXPIRY_SECONDS', 300))
 
+    # Fraction of requests that get a Server-Timing header and a timing log line (0 disables)
+    REQUEST_TIMING_SAMPLE_RATE = float(os.getenv('REQUEST_TIMING_SAMPLE_RATE', 0.1))
+
+    # Log statements slower than this (0 disables) and keep the slowest fingerprints
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+    SLOW_QUERY_TOP_N = int(os.getenv('SLOW_QUERY_TOP_N', 20))
+    SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', 'false').lower() == 'true'  # PostgreSQL only
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS = int(os.getenv('SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS', 300))
+
+    # Token bucket per client and route class (read, search, write, admin) in Redis,
+    # as "<class>=<requests per second>:<burst>,..."; over-limit requests get 429.
+    # Off by default: load tests and benchmarks send everything from one address
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'false').lower() == 'true'
+    RATE_LIMITS = os.getenv('RATE_LIMITS', 'read=20:60,search=10:60,write=5:20,admin=1:10')
+    RATE_LIMIT_CLIENT_HEADER = os.getenv('RATE_LIMIT_CLIENT_HEADER', 'X-Real-IP')  # set by nginx.conf
+    RATE_LIMIT_REDIS_TIMEOUT_MS = int(os.getenv('RATE_LIMIT_REDIS_TIMEOUT_MS', 50))
+
+    # Per-worker in-flight requests above which routes get 503 (search/admin from half of it; 0 disables)
+    LOAD_SHED_MAX_IN_FLIGHT = int(os.getenv('LOAD_SHED_MAX_IN_FLIGHT', 0))
+
+    # Serve /api/admin/stats from the library_counters table instead of COUNT queries
+    STATS_COUNTERS_ENABLED = os.getenv('STATS_COUNTERS_ENABLED', 'false').lower() == 'true'
+
 class DevelopmentConfig(Config):
     DEBUG=TRUE
     FLASK_ENV='development'
@@ -28,6 +63,37 @@ class ProductionConfig(Config):
     DEBUG=False
     FLASK_ENV='production'
 
+def build_engine_options(app_config, uri=None) -> dict:
+    """Translate the DB_* settings into SQLAlchemy engine options for the configured database"""
+    uri = uri or app_config.get('SQLALCHEMY_DATABASE_URI') or ''
+    if uri.startswith('sqlite'):
+        # SQLite uses its own single-connection pools; the QueuePool options do not apply
+        return {}
+
+    from metrics import InstrumentedQueuePool
+
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': app_config.get('DB_POOL_SIZE', 5),
+        'max_overflow': app_config.get('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': app_config.get('DB_POOL_TIMEOUT', 10),
+        'pool_recycle': app_config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': app_config.get('DB_POOL_PRE_PING', True),
+    }
+
+    statement_timeout = app_config.get('DB_STATEMENT_TIMEOUT_MS', 0)
+    if statement_timeout and uri.startswith('postgresql'):
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+
+    return options
+
+def build_replica_binds(app_config) -> dict:
+    """One SQLALCHEMY_BINDS entry per replica URL, with the same pool settings as the primary"""
+    return {
+        f'replica_{index}': {'url': url, **build_engine_options(app_config, url)}
+        for index, url in enumerate(app_config.get('DATABASE_REPLICA_URLS') or [])
+    }
+
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
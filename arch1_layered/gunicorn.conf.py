@@ -0,0 +1,79 @@
+"""
+Gunicorn configuration for the layered backend.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+
+Every setting can be overridden through the environment (see OPERATIONS.md).
+Send SIGHUP to the master process for a graceful reload: new workers are
+started with the new code/config and old workers finish their in-flight
+requests before exiting.
+"""
+import glob
+import multiprocessing
+import os
+import tempfile
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# sync    - one request per worker process (CPU-bound work, simplest)
+# gthread - GUNICORN_THREADS requests per worker (I/O waits on Postgres/Redis)
+# gevent  - cooperative greenlets, GUNICORN_WORKER_CONNECTIONS per worker
+#           (requires `pip install gevent psycogreen`)
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Load the app once in the master so workers fork with it already imported.
+# gevent must patch the standard library before the app is imported, so it
+# loads the app in each worker instead.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false' if worker_class == 'gevent' else 'true').lower() == 'true'
+
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Recycle workers periodically to bound memory growth; jitter avoids
+# every worker restarting at the same moment.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Workers publish their /metrics totals here so any of them can answer a scrape.
+# Set before the app is (pre)loaded, since metrics.py reads it at import.
+metrics_dir = os.environ.get('METRICS_DIR') or tempfile.mkdtemp(prefix='library-metrics-')
+os.environ['METRICS_DIR'] = metrics_dir
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.getenv('GUNICORN_ERROR_LOG', '-')
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Start from empty metrics when reusing a METRICS_DIR from a previous run"""
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+        os.remove(path)
+
+
+def child_exit(server, worker):
+    """Keep an exited worker's request counts in the /metrics totals"""
+    from metrics import mark_process_dead
+    mark_process_dead(metrics_dir, worker.pid)
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections"""
+    if worker_class == 'gevent':
+        try:
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+        except ImportError:
+            server.log.warning("psycogreen not installed; psycopg2 calls will block the gevent loop")
+
+    if preload_app:
+        # Connections opened in the master must not be shared across processes
+        from app import app
+        from models import db
+        with app.app_context():
+            db.engine.dispose(close=False)
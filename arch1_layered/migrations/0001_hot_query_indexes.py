@@ -0,0 +1,28 @@
+"""Composite and partial indexes for the hot borrowing and reservation queries
+
+- idx_borrowings_active_user_book: (user_id, book_id) WHERE NOT returned. Serves the
+  borrowing-limit count and the borrowed-books list (user_id, returned) and the
+  duplicate-loan check (user_id, book_id, returned).
+- idx_borrowings_active_due_date: (due_date) WHERE NOT returned, for the overdue list.
+- idx_reservations_book_status_priority: (book_id, status, priority), for the duplicate
+  reservation check and MAX(priority) of a book's active queue.
+
+The single-column index on borrowings.returned is dropped: every query filtering on it
+is now served by a partial index, and planners kept choosing it over them.
+"""
+from sqlalchemy import column, false
+from migrations import create_index, drop_index
+
+TRANSACTIONAL = False  # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+
+
+def upgrade(connection):
+    active = column('returned') == false()
+    create_index(connection, 'idx_borrowings_active_user_book', 'borrowings', ['user_id', 'book_id'], where=active)
+    create_index(connection, 'idx_borrowings_active_due_date', 'borrowings', ['due_date'], where=active)
+    create_index(connection, 'idx_reservations_book_status_priority', 'reservations',
+                 ['book_id', 'status', 'priority'])
+
+    # Created by 01-init.sql and by db.create_all() respectively
+    drop_index(connection, 'idx_borrowings_returned')
+    drop_index(connection, 'ix_borrowings_returned')
@@ -0,0 +1,144 @@
+"""Versioned schema migrations for the layered backend (run with `flask --app app migrate`)
+
+Each migration is a module in this package named `NNNN_description.py` with an
+`upgrade(connection)` function. Modules that set `TRANSACTIONAL = False` run in
+autocommit mode, which PostgreSQL requires for CREATE/DROP INDEX CONCURRENTLY;
+those must be idempotent so a failed run can simply be repeated. Applied
+versions are recorded in the `schema_migrations` table.
+"""
+import importlib
+import os
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import Column, DateTime, MetaData, String, Table, create_engine, insert, select, text
+from sqlalchemy.pool import NullPool
+
+_MODULE_NAME = re.compile(r'^(\d{4})_(\w+)\.py$')
+_LOCK_ID = 0x6c6962  # pg_advisory_lock key shared by concurrent `flask migrate` runs
+
+schema_migrations = Table(
+    'schema_migrations', MetaData(),
+    Column('version', String(20), primary_key=True),
+    Column('name', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+
+class Migration:
+    def __init__(self, version: str, name: str, module):
+        self.version = version
+        self.name = name
+        self.module = module
+        self.transactional = getattr(module, 'TRANSACTIONAL', True)
+        self.description = (module.__doc__ or '').strip().splitlines()[0] if module.__doc__ else name
+
+    def __repr__(self):
+        return f'<Migration {self.version} {self.name}>'
+
+
+def discover() -> List[Migration]:
+    """All migrations in this package, oldest first"""
+    migrations = []
+    for filename in sorted(os.listdir(os.path.dirname(__file__))):
+        match = _MODULE_NAME.match(filename)
+        if match:
+            module = importlib.import_module(f'{__name__}.{filename[:-3]}')
+            migrations.append(Migration(match.group(1), match.group(2), module))
+    return migrations
+
+
+def applied_versions(engine) -> Dict[str, datetime]:
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        return dict(connection.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at)).all())
+
+
+def pending(engine) -> List[Migration]:
+    applied = applied_versions(engine)
+    return [migration for migration in discover() if migration.version not in applied]
+
+
+def migrate(engine, target: Optional[str] = None) -> List[Migration]:
+    """Apply pending migrations up to and including `target`; returns those applied"""
+    with engine.connect() as lock_connection:
+        if engine.dialect.name == 'postgresql':
+            # Poll rather than block in pg_advisory_lock: a waiting statement holds a
+            # snapshot that the holder's CREATE INDEX CONCURRENTLY waits on, and as the
+            # lock sits on another backend PostgreSQL never reports the deadlock
+            while not lock_connection.execute(text('SELECT pg_try_advisory_lock(:id)'), {'id': _LOCK_ID}).scalar():
+                lock_connection.commit()
+                time.sleep(1)
+            lock_connection.commit()
+        try:
+            applied = []
+            for migration in pending(engine):
+                if target is not None and migration.version > target:
+                    break
+                _apply(engine, migration)
+                applied.append(migration)
+            return applied
+        finally:
+            if engine.dialect.name == 'postgresql':
+                lock_connection.execute(text('SELECT pg_advisory_unlock(:id)'), {'id': _LOCK_ID})
+                lock_connection.commit()
+
+
+def _apply(engine, migration: Migration) -> None:
+    if migration.transactional:
+        with engine.begin() as connection:
+            migration.module.upgrade(connection)
+            _record(connection, migration)
+        return
+
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        migration.module.upgrade(connection)
+    with engine.begin() as connection:
+        _record(connection, migration)
+
+
+def _record(connection, migration: Migration) -> None:
+    connection.execute(insert(schema_migrations).values(
+        version=migration.version, name=migration.name, applied_at=datetime.now(timezone.utc)
+    ))
+
+
+def migration_engine(database_uri: str):
+    """Engine for running migrations: no pool and no statement_timeout, since index builds can take minutes"""
+    return create_engine(database_uri, poolclass=NullPool)
+
+
+# Helpers for migration modules
+
+def create_index(connection, name: str, table: str, columns: List[str], where=None) -> None:
+    """CREATE INDEX IF NOT EXISTS, CONCURRENTLY on PostgreSQL so writes to the table are not blocked
+
+    `where` is a SQLAlchemy expression for a partial index, rendered for the
+    connection's dialect (e.g. `returned = false` on PostgreSQL, `returned = 0` on SQLite)
+    so that it matches the predicate the ORM emits.
+    """
+    predicate = ''
+    if where is not None:
+        predicate = ' WHERE ' + str(where.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+
+    concurrently = ''
+    if connection.dialect.name == 'postgresql':
+        concurrently = 'CONCURRENTLY '
+        # An interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index behind
+        # that IF NOT EXISTS would silently keep
+        invalid = connection.execute(text(
+            'SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+            'WHERE pg_class.relname = :name AND NOT pg_index.indisvalid'
+        ), {'name': name}).first()
+        if invalid:
+            drop_index(connection, name)
+
+    connection.execute(text(
+        f'CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {table} ({", ".join(columns)}){predicate}'
+    ))
+
+
+def drop_index(connection, name: str) -> None:
+    concurrently = 'CONCURRENTLY ' if connection.dialect.name == 'postgresql' else ''
+    connection.execute(text(f'DROP INDEX {concurrently}IF EXISTS {name}'))
@@ -1,7 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime, timezone
+from routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     __tablename__ = "users"
@@ -103,9 +104,17 @@ class Borrowing(db.Model):
     borrowed_date = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     due_date = db.Column(db.DateTime, nullable=False)
     returned_date = db.Column(db.DateTime)
-    returned = db.Column(db.Boolean, default=False, index=True)
+    returned = db.Column(db.Boolean, default=False)
     fine_amount = db.Column(db.Float, default=0.0)
 
+    # Partial indexes over active loans (migrations/0001_hot_query_indexes.py)
+    __table_args__ = (
+        db.Index('idx_borrowings_active_user_book', user_id, book_id,
+                 postgresql_where=returned == False, sqlite_where=returned == False),
+        db.Index('idx_borrowings_active_due_date', due_date,
+                 postgresql_where=returned == False, sqlite_where=returned == False),
+    )
+
     def __repr__(self):
         return f'<Borrowing User:{self.user_id} Book:{self.book_id} Returned:{self.returned}>'
     
@@ -165,6 +174,10 @@ class Reservation(db.Model):
     status = db.Column(db.String(20), default='active')  # active, fulfilled, cancelled
     priority = db.Column(db.Integer, default=1)  # for queue ordering
     notified = db.Column(db.Boolean, default=False)
+
+    __table_args__ = (
+        db.Index('idx_reservations_book_status_priority', book_id, status, priority),
+    )
     
     def __repr__(self):
         return f'<Reservation User:{self.user_id} Book:{self.book_id} Status:{self.status}>'
@@ -179,4 +192,41 @@ class Reservation(db.Model):
             'status': self.status,
             'priority': self.priority,
             'notified': self.notified
-        }
\ No newline at end of file
+        }
+
+class LibraryCounter(db.Model):
+    """Counter model - incrementally maintained totals for system statistics"""
+    __tablename__ = 'library_counters'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<LibraryCounter {self.name}={self.value}>'
+
+
+class DailyStat(db.Model):
+    """Daily rollup model - one row of activity totals per calendar day (UTC)"""
+    __tablename__ = 'daily_stats'
+
+    day = db.Column(db.Date, primary_key=True)
+    borrows = db.Column(db.Integer, nullable=False, default=0)
+    returns = db.Column(db.Integer, nullable=False, default=0)
+    new_users = db.Column(db.Integer, nullable=False, default=0)
+    overdue = db.Column(db.Integer, nullable=False, default=0)  # open overdue loans at end of day
+    fines = db.Column(db.Float, nullable=False, default=0.0)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f'<DailyStat {self.day}>'
+
+    def to_dict(self):
+        """Convert daily rollup to dictionary"""
+        return {
+            'day': self.day.isoformat(),
+            'borrows': self.borrows,
+            'returns': self.returns,
+            'new_users': self.new_users,
+            'overdue': self.overdue,
+            'fines': self.fines
+        }
@@ -0,0 +1,135 @@
+"""
+Concurrency benchmark for the WSGI (app.py) and ASGI (asgi_app.py) servers.
+
+Start the server under test, then point this script at it, e.g.
+
+    gunicorn -c gunicorn.conf.py -b 127.0.0.1:5000 app:app
+    uvicorn asgi_app:app --port 5001 --workers 3 --no-access-log
+
+    python performance_tests/async_vs_wsgi.py --url http://127.0.0.1:5000 --concurrency 256
+    python performance_tests/async_vs_wsgi.py --url http://127.0.0.1:5001 --concurrency 256
+
+Each of --concurrency clients keeps one HTTP/1.1 keep-alive connection open
+and issues GET requests back to back for --duration seconds. Only the
+standard library is used so the load generator itself stays lightweight.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = ['/api/health', '/api/books', '/api/books/search?q=data', '/api/admin/stats']
+
+
+async def _open(host, port):
+    return await asyncio.open_connection(host, port)
+
+
+async def _get(reader, writer, host, path):
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n'.encode())
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed by server')
+    status = int(status_line.split()[1])
+
+    length, chunked, close = 0, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value:
+            chunked = True
+        elif name == 'connection' and value == 'close':
+            close = True
+
+    if chunked:
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+
+    return status, close
+
+
+async def _client(host, port, path, deadline, latencies, errors):
+    reader = writer = None
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await _open(host, port)
+            started = time.monotonic()
+            status, close = await _get(reader, writer, host, path)
+            if status == 200:
+                latencies.append(time.monotonic() - started)
+            else:
+                errors.append(status)
+            if close:
+                writer.close()
+                writer = None
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+            errors.append('connection')
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.01)
+    if writer is not None:
+        writer.close()
+
+
+async def run_scenario(url, path, concurrency, duration):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+
+    await asyncio.gather(*[
+        _client(host, port, path, deadline, latencies, errors) for _ in range(concurrency)
+    ])
+
+    result = {'path': path, 'concurrency': concurrency, 'requests': len(latencies),
+              'errors': len(errors), 'throughput_rps': round(len(latencies) / duration, 1)}
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100)
+        result.update({
+            'p50_ms': round(cuts[49] * 1000, 1),
+            'p95_ms': round(cuts[94] * 1000, 1),
+            'p99_ms': round(cuts[98] * 1000, 1),
+        })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--path', action='append', dest='paths', help='repeatable; defaults to a read-heavy mix')
+    parser.add_argument('--concurrency', type=int, default=256)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = [asyncio.run(run_scenario(args.url, path, args.concurrency, args.duration))
+               for path in args.paths or DEFAULT_PATHS]
+
+    if args.json:
+        print(json.dumps({'url': args.url, 'results': results}, indent=2))
+        return
+
+    print(f"{'path':32} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for result in results:
+        print(f"{result['path']:32} {result['throughput_rps']:8} {result.get('p50_ms', '-'):>8} "
+              f"{result.get('p95_ms', '-'):>8} {result.get('p99_ms', '-'):>8} {result['errors']:7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Deterministic benchmark dataset for the layered schema.
+
+Named sizes for the repository's synthetic data generator (synthetic_data.py at
+the repository root), which writes the rows. The same --size and --seed always
+produce the same books, users and loans. Dates are relative to midnight UTC of
+the day the data is generated, so the share of active and overdue loans is
+stable too.
+
+    python performance_tests/dataset.py --size small --database-url sqlite:////tmp/library-bench.db
+    python performance_tests/dataset.py --size medium --database-url postgresql://.../library_bench
+
+The benchmark (service_benchmark.py) calls load() itself, so running this
+script is only needed to prepare a database in advance.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from flask import Flask
+from sqlalchemy import func, select
+from config import config, build_engine_options
+from models import db, User, Book, Borrowing
+from synthetic_data import CATEGORIES, TITLE_WORDS, DatasetSpec, LayeredTarget, generate
+
+SIZES = {
+    'tiny': {'books': 1_000, 'users': 1_000, 'borrowings': 10_000},
+    'small': {'books': 10_000, 'users': 10_000, 'borrowings': 100_000},
+    'medium': {'books': 100_000, 'users': 100_000, 'borrowings': 1_000_000},
+    'large': {'books': 1_000_000, 'users': 100_000, 'borrowings': 3_000_000},
+}
+
+
+def build_app(database_url: str) -> Flask:
+    """Bare Flask app bound to the benchmark database: no routes, metrics or request hooks"""
+    app = Flask(__name__)
+    app.config.from_object(config['production'])
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config)
+    db.init_app(app)
+    return app
+
+
+def counts():
+    return {
+        'books': db.session.scalar(select(func.count()).select_from(Book)),
+        'users': db.session.scalar(select(func.count()).select_from(User)),
+        'borrowings': db.session.scalar(select(func.count()).select_from(Borrowing)),
+    }
+
+
+def load(books: int, users: int, borrowings: int, seed: int = 42, regenerate: bool = False) -> dict:
+    """Create the schema and fill it, unless it already holds a dataset of this size
+
+    Must run inside an application context. Returns the row counts and whether
+    the data was generated ('generated') or found in place ('reused').
+    """
+    db.create_all()
+    existing = counts()
+    db.session.remove()
+    if (not regenerate and existing['books'] == books and existing['users'] == users
+            and existing['borrowings'] >= borrowings):
+        return {**existing, 'seed': seed, 'status': 'reused'}
+
+    generate(DatasetSpec(books=books, users=users, borrowings=borrowings, seed=seed),
+             LayeredTarget(db.engine), replace=True)
+    return {**counts(), 'seed': seed, 'status': 'generated'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', choices=SIZES, default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--regenerate', action='store_true', help='replace existing data of the same size')
+    args = parser.parse_args()
+
+    app = build_app(args.database_url)
+    started = time.perf_counter()
+    with app.app_context():
+        result = load(**SIZES[args.size], seed=args.seed, regenerate=args.regenerate)
+    print(f"{result['status']} {result['books']} books, {result['users']} users, "
+          f"{result['borrowings']} borrowings in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
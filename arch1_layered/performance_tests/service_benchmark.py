@@ -0,0 +1,230 @@
+"""
+Service-layer benchmark for the layered backend at realistic data sizes.
+
+Times the service methods directly, without HTTP, against a deterministic dataset
+(see dataset.py). Each method runs with the Redis cache off, then on:
+
+    python performance_tests/service_benchmark.py --size small --output bench/base.json
+    python performance_tests/service_benchmark.py --size small --output bench/new.json --compare bench/base.json
+
+The default database is a SQLite file in the temp directory. It is reused between
+runs of the same --size/--seed. Pass --database-url to benchmark PostgreSQL.
+--compare exits with status 1 when any p50 is more than --threshold percent (and
+--min-delta-ms) slower than the baseline. That makes it usable as a CI gate.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from dataset import SIZES, CATEGORIES, TITLE_WORDS, build_app, load
+from sqlalchemy import select
+from models import db, Book, Borrowing, User
+from services import CacheService, UserService, BookService, BorrowingService, StatisticsService
+
+CACHE_PATTERNS = ('books:*', 'search:*', 'system:*', 'user:*')
+
+
+class Services:
+    def __init__(self, app, cache_enabled: bool):
+        self.cache = CacheService(app.config)
+        if not cache_enabled:
+            self.cache.cache_enabled = False
+        self.users = UserService(self.cache)
+        self.books = BookService(self.cache)
+        self.borrowings = BorrowingService(self.cache, self.users, self.books)
+        self.statistics = StatisticsService(self.cache)
+
+    def clear_cache(self):
+        for pattern in CACHE_PATTERNS:
+            self.cache.clear_pattern(pattern)
+
+
+def _borrow_candidates(rng, sample=500):
+    """Users without active loans and books with a free copy, so borrow_book succeeds"""
+    busy = select(Borrowing.user_id).where(Borrowing.returned == False)
+    users = db.session.scalars(select(User.id).where(User.id.not_in(busy)).limit(sample * 4)).all()
+    books = db.session.scalars(select(Book.id).where(Book.available_copies > 0).limit(sample * 4)).all()
+    db.session.remove()
+    return rng.sample(users, min(sample, len(users))), rng.sample(books, min(sample, len(books)))
+
+
+def _scenarios(services, rng, pages):
+    """(name, iteration weight, call) for each benchmarked method; call() returns True on success"""
+    queries = [word.lower() for word in TITLE_WORDS[:10]]
+    users, books = _borrow_candidates(rng)
+    loans = []
+
+    def borrow():
+        success, _, borrowing = services.borrowings.borrow_book(rng.choice(users), rng.choice(books))
+        if success:
+            loans.append(borrowing.id)
+        return success
+
+    def return_book():
+        if not loans:
+            return False
+        success, _, _ = services.borrowings.return_book(loans.pop())
+        return success
+
+    return [
+        # Early pages are requested far more often than late ones
+        ('BookService.get_books', 1.0, lambda: 'error' not in services.books.get_books(
+            page=1 + int(pages * rng.random() ** 3), per_page=20, category=rng.choice(CATEGORIES + [None]))),
+        ('BookService.search_books', 1.0, lambda: 'error' not in services.books.search_books(rng.choice(queries))),
+        ('BookService.get_popular_books', 0.2, lambda: bool(services.books.get_popular_books(limit=10))),
+        ('BorrowingService.borrow_book', 1.0, borrow),
+        ('BorrowingService.return_book', 1.0, return_book),
+        ('BorrowingService.get_overdue_books', 0.1, lambda: isinstance(services.borrowings.get_overdue_books(), list)),
+        ('StatisticsService.get_system_statistics', 1.0,
+         lambda: 'error' not in services.statistics.get_system_statistics()),
+    ]
+
+
+def _summary(name, cache, latencies, errors):
+    ordered = sorted(latencies)
+    cuts = statistics.quantiles(ordered, n=100) if len(ordered) > 1 else ordered * 99
+    return {
+        'name': name,
+        'cache': cache,
+        'iterations': len(ordered),
+        'errors': errors,
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+        'min_ms': round(ordered[0] * 1000, 3),
+        'p50_ms': round(cuts[49] * 1000, 3),
+        'p95_ms': round(cuts[94] * 1000, 3),
+        'p99_ms': round(cuts[98] * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+        'ops_per_sec': round(len(ordered) / sum(ordered), 1),
+    }
+
+
+def run(app, cache_enabled: bool, iterations: int, max_seconds: float, seed: int, pages: int):
+    services = Services(app, cache_enabled)
+    if cache_enabled and not services.cache.cache_enabled:
+        return [], 'Redis not available'
+    services.clear_cache()
+
+    rng = random.Random(seed)
+    results = []
+    for name, weight, call in _scenarios(services, rng, pages):
+        latencies, errors = [], 0
+        target = max(3, int(iterations * weight))
+        deadline = time.monotonic() + max_seconds
+        while len(latencies) < target and (len(latencies) < 3 or time.monotonic() < deadline):
+            started = time.perf_counter()
+            ok = call()
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+            db.session.remove()  # one session per call, as in a request
+        results.append(_summary(name, 'on' if cache_enabled else 'off', latencies, errors))
+    return results, None
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float = 0.5) -> bool:
+    """Print p50 changes against a baseline run; True when nothing regressed
+
+    A regression is a p50 more than `threshold` percent and `min_delta_ms` slower,
+    so sub-millisecond jitter on cached paths is not reported.
+    """
+    previous = {(result['name'], result['cache']): result for result in baseline['results']}
+    ok = True
+    print(f"\nvs {baseline.get('commit') or 'baseline'} ({baseline['dataset']['books']} books)")
+    print(f"{'method':44} {'cache':>5} {'p50 before':>11} {'p50 now':>9} {'change':>8}")
+    for result in current['results']:
+        before = previous.get((result['name'], result['cache']))
+        if before is None:
+            continue
+        change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+        flag = ''
+        if change > threshold and result['p50_ms'] - before['p50_ms'] > min_delta_ms:
+            flag, ok = '  REGRESSION', False
+        print(f"{result['name']:44} {result['cache']:>5} {before['p50_ms']:11.3f} {result['p50_ms']:9.3f} "
+              f"{change:+7.1f}%{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', choices=SIZES, default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', help='defaults to a SQLite file in the temp directory')
+    parser.add_argument('--regenerate', action='store_true', help='rebuild the dataset even if present')
+    parser.add_argument('--cache', choices=['off', 'on', 'both'], default='both')
+    parser.add_argument('--iterations', type=int, default=200, help='calls per method (fewer for heavy ones)')
+    parser.add_argument('--max-seconds', type=float, default=20, help='time budget per method')
+    parser.add_argument('--output', help='write the JSON results to this file')
+    parser.add_argument('--json', action='store_true', help='print the JSON results instead of a table')
+    parser.add_argument('--compare', help='baseline JSON file from an earlier run')
+    parser.add_argument('--threshold', type=float, default=25, help='allowed p50 slowdown in percent')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5, help='ignore p50 slowdowns smaller than this')
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(
+        tempfile.gettempdir(), f'library-bench-{args.size}-{args.seed}.db')
+    app = build_app(database_url)
+
+    with app.app_context():
+        started = time.perf_counter()
+        dataset = load(**SIZES[args.size], seed=args.seed, regenerate=args.regenerate)
+        dataset.update(size=args.size, load_seconds=round(time.perf_counter() - started, 1))
+        pages = max(1, min(500, dataset['books'] // 20))
+
+        report = {
+            'benchmark': 'service_layer',
+            'commit': _commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'database': db.engine.dialect.name,
+            'dataset': dataset,
+            'results': [],
+            'skipped': {},
+        }
+        for cache_enabled in {'off': [False], 'on': [True], 'both': [False, True]}[args.cache]:
+            results, skipped = run(app, cache_enabled, args.iterations, args.max_seconds, args.seed, pages)
+            report['results'].extend(results)
+            if skipped:
+                report['skipped']['cache_on'] = skipped
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['database']} {dataset['books']} books / {dataset['users']} users / "
+              f"{dataset['borrowings']} borrowings ({dataset['status']} in {dataset['load_seconds']}s)")
+        print(f"{'method':44} {'cache':>5} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'err':>4}")
+        for result in report['results']:
+            print(f"{result['name']:44} {result['cache']:>5} {result['iterations']:5} {result['p50_ms']:9.3f} "
+                  f"{result['p95_ms']:9.3f} {result['p99_ms']:9.3f} {result['ops_per_sec']:9.1f} {result['errors']:4}")
+        for key, reason in report['skipped'].items():
+            print(f"skipped {key}: {reason}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            if not compare(report, json.load(handle), args.threshold, args.min_delta_ms):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import redis
+from flask import jsonify, request
+from metrics import registry, labels
+
+registry.describe('http_requests_rejected_total', 'counter',
+                  'Requests refused before reaching a route, by reason (rate_limited, shed) and route class')
+
+# Route classes by cost. Anything not listed is 'read'; health and /metrics are never limited.
+ENDPOINT_CLASSES = {
+    'api.search_books': 'search',
+    'api.get_statistics': 'admin',
+    'api.get_statistics_timeseries': 'admin',
+    'api.get_overdue_books': 'admin',
+    'api.import_users': 'admin',
+    'api.get_slow_queries': 'admin',
+    'api.reset_slow_queries': 'admin',
+    'api.get_pool_metrics': 'admin',
+    'api.borrow_book': 'write',
+    'api.return_book': 'write',
+    'api.create_reservation': 'write',
+    'api.register_user': 'write',
+    'api.login_user': 'write',
+}
+EXEMPT_ENDPOINTS = {'api.health_check', 'prometheus_metrics', 'static'}
+
+# Fraction of LOAD_SHED_MAX_IN_FLIGHT at which each class starts being shed:
+# expensive queries go first, ordinary reads and writes only at the limit itself
+SHED_AT = {'search': 0.5, 'admin': 0.5, 'read': 1.0, 'write': 1.0}
+
+# KEYS[1] = bucket; ARGV = refill rate (tokens/s), burst, cost.
+# Uses the Redis clock so every backend process agrees on elapsed time.
+# Returns {allowed (0/1), retry_after_ms, tokens left (floored)}.
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_ms = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  retry_ms = math.ceil((cost - tokens) / rate * 1000)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, retry_ms, math.floor(tokens)}
+"""
+
+
+def parse_limits(spec: str) -> Dict[str, Tuple[float, int]]:
+    """'read=20:60,search=2:20' -> {'read': (20.0, 60), 'search': (2.0, 20)} (requests/second : burst)"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        route_class, _, value = item.partition('=')
+        rate, _, burst = value.partition(':')
+        limits[route_class.strip()] = (float(rate), int(burst or math.ceil(float(rate))))
+    return limits
+
+
+def route_class(endpoint: Optional[str]) -> Optional[str]:
+    """Cost class for an endpoint, or None when it is never limited"""
+    if endpoint is None or endpoint in EXEMPT_ENDPOINTS:
+        return None
+    return ENDPOINT_CLASSES.get(endpoint, 'read')
+
+
+class RateLimiter:
+    """Token bucket per (route class, client) in Redis: one EVALSHA per request
+
+    Fails open: if Redis errors, limiting is skipped for `retry_seconds`
+    rather than adding a timeout to every request.
+    """
+
+    def __init__(self, redis_client, limits: Dict[str, Tuple[float, int]],
+                 key_prefix: str = 'ratelimit', retry_seconds: float = 5):
+        self.limits = limits
+        self.key_prefix = key_prefix
+        self.retry_seconds = retry_seconds
+        self._script = redis_client.register_script(TOKEN_BUCKET_LUA)
+        self._skip_until = 0.0
+
+    def allow(self, route_class: str, client: str, cost: int = 1) -> Tuple[bool, float]:
+        """(allowed, seconds until a retry can succeed)"""
+        bucket = self._bucket(route_class, client, cost)
+        if bucket is None:
+            return True, 0.0
+
+        try:
+            allowed, retry_ms, _ = self._script(**bucket)
+        except redis.RedisError:
+            return self._fail_open()
+        return bool(allowed), retry_ms / 1000
+
+    def _bucket(self, route_class: str, client: str, cost: int) -> Optional[Dict]:
+        """Script arguments for this request, or None when it is not limited"""
+        limit = self.limits.get(route_class)
+        if limit is None or time.monotonic() < self._skip_until:
+            return None
+        rate, burst = limit
+        return {'keys': [f'{self.key_prefix}:{route_class}:{client}'], 'args': [rate, burst, cost]}
+
+    def _fail_open(self) -> Tuple[bool, float]:
+        self._skip_until = time.monotonic() + self.retry_seconds
+        return True, 0.0
+
+
+class AsyncRateLimiter(RateLimiter):
+    """RateLimiter on a redis.asyncio client, for asgi_app.py"""
+
+    async def allow(self, route_class: str, client: str, cost: int = 1) -> Tuple[bool, float]:
+        bucket = self._bucket(route_class, client, cost)
+        if bucket is None:
+            return True, 0.0
+
+        try:
+            allowed, retry_ms, _ = await self._script(**bucket)
+        except redis.RedisError:
+            return self._fail_open()
+        return bool(allowed), retry_ms / 1000
+
+
+class LoadShedder:
+    """Per-process in-flight request count; sheds route classes in SHED_AT order"""
+
+    def __init__(self, max_in_flight: int, shed_at: Optional[Dict[str, float]] = None):
+        self.max_in_flight = max_in_flight
+        self.shed_at = shed_at or SHED_AT
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def enter(self) -> int:
+        with self._lock:
+            self.in_flight += 1
+            return self.in_flight
+
+    def exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def should_shed(self, route_class: str, in_flight: int) -> bool:
+        return in_flight > self.max_in_flight * self.shed_at.get(route_class, 1.0)
+
+
+def client_id(header: Optional[str]) -> str:
+    """Client address, taken from the proxy's header (e.g. nginx X-Real-IP) when configured"""
+    return client_address(request.headers.get(header) if header else None, request.remote_addr)
+
+
+def client_address(header_value: Optional[str], remote_addr: Optional[str]) -> str:
+    if header_value:
+        return header_value.split(',')[-1].strip()
+    return remote_addr or 'unknown'
+
+
+def record_rejection(reason: str, cost_class: str, retry_after: float) -> str:
+    """Count a refused request; returns its Retry-After header value"""
+    registry.inc('http_requests_rejected_total', labels(reason=reason, route_class=cost_class))
+    return str(max(1, math.ceil(retry_after)))
+
+
+def _rejected(reason: str, status: int, retry_after: float, message: str):
+    response = jsonify({'error': message})
+    response.status_code = status
+    response.headers['Retry-After'] = record_rejection(reason, request.environ['library.route_class'], retry_after)
+    return response
+
+
+def rate_limit_settings(config) -> Tuple[Dict[str, Tuple[float, int]], int]:
+    """(per-class limits, in-flight limit) from RATE_LIMIT_ENABLED, RATE_LIMITS and LOAD_SHED_MAX_IN_FLIGHT"""
+    limits = parse_limits(config.get('RATE_LIMITS', '')) if config.get('RATE_LIMIT_ENABLED') else {}
+    return limits, int(config.get('LOAD_SHED_MAX_IN_FLIGHT', 0))
+
+
+def limiter_redis_options(config) -> Dict:
+    """Redis client settings for a limiter: short timeouts, since it sits in front of every request"""
+    timeout = config.get('RATE_LIMIT_REDIS_TIMEOUT_MS', 50) / 1000
+    return {
+        'host': config.get('REDIS_HOST', 'localhost'),
+        'port': config.get('REDIS_PORT', 6379),
+        'db': config.get('REDIS_DB', 0),
+        'socket_timeout': timeout,
+        'socket_connect_timeout': timeout
+    }
+
+
+def init_rate_limiting(app) -> None:
+    """Reject over-limit clients with 429 and shed expensive routes under load with 503"""
+    limits, max_in_flight = rate_limit_settings(app.config)
+    if not limits and max_in_flight <= 0:
+        return
+
+    limiter = None
+    if limits:
+        limiter = RateLimiter(redis.Redis(**limiter_redis_options(app.config)), limits)
+        app.extensions['rate_limiter'] = limiter
+    shedder = LoadShedder(max_in_flight) if max_in_flight > 0 else None
+    if shedder:
+        app.extensions['load_shedder'] = shedder
+    client_header = app.config.get('RATE_LIMIT_CLIENT_HEADER')
+
+    @app.before_request
+    def limit_request():
+        cost_class = route_class(request.endpoint)
+        if cost_class is None or request.method == 'OPTIONS':
+            return None
+        request.environ['library.route_class'] = cost_class
+
+        if shedder:
+            request.environ['library.in_flight'] = True
+            if shedder.should_shed(cost_class, shedder.enter()):
+                return _rejected('shed', 503, 1, 'Server busy, please retry')
+
+        if limiter:
+            allowed, retry_after = limiter.allow(cost_class, client_id(client_header))
+            if not allowed:
+                return _rejected('rate_limited', 429, retry_after, 'Too many requests')
+        return None
+
+    @app.teardown_request
+    def leave_request(exc):
+        if shedder and request.environ.pop('library.in_flight', False):
+            shedder.exit()
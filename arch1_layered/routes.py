@@ -1,6 +1,8 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime, timezone
+from flask import Blueprint, current_app, request, jsonify
+from datetime import date, datetime, timedelta, timezone
 from services import UserService, BookService, BorrowingService, ReservationService, StatisticsService
+from models import db
+from metrics import pool_metrics
 
 def create_routes(user_service: UserService, book_service: BookService, 
                  borrowing_service: BorrowingService, reservation_service: ReservationService,
@@ -19,6 +21,31 @@ def create_routes(user_service: UserService, book_service: BookService,
             'version': '1.0.0'
         })
     
+    @api.route('/admin/metrics/pool', methods=['GET'])
+    def get_pool_metrics():
+        """Database connection pool usage and checkout wait times for this process"""
+        return jsonify(pool_metrics.snapshot(db.engine))
+    
+    @api.route('/admin/slow-queries', methods=['GET'])
+    def get_slow_queries():
+        """Slowest statement fingerprints seen by this process (?limit=N)"""
+        slow_query_log = current_app.extensions.get('slow_query_log')
+        if slow_query_log is None:
+            return jsonify({'error': 'Slow-query log is disabled (SLOW_QUERY_THRESHOLD_MS=0)'}), 404
+        return jsonify({
+            'threshold_ms': slow_query_log.threshold_seconds * 1000,
+            'queries': slow_query_log.top(request.args.get('limit', type=int))
+        })
+    
+    @api.route('/admin/slow-queries', methods=['DELETE'])
+    def reset_slow_queries():
+        """Forget the slow statements collected so far"""
+        slow_query_log = current_app.extensions.get('slow_query_log')
+        if slow_query_log is None:
+            return jsonify({'error': 'Slow-query log is disabled (SLOW_QUERY_THRESHOLD_MS=0)'}), 404
+        slow_query_log.reset()
+        return jsonify({'message': 'Slow-query log cleared'})
+    
     # User Management Routes
     @api.route('/users/register', methods=['POST'])
     def register_user():
@@ -46,6 +73,31 @@ def create_routes(user_service: UserService, book_service: BookService,
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
+    @api.route('/users/import', methods=['POST'])
+    def import_users():
+        """Bulk import users from a streamed CSV (with header) or NDJSON body"""
+        try:
+            content_type = request.mimetype or ''
+            if content_type in ('application/x-ndjson', 'application/jsonl'):
+                fmt = 'ndjson'
+            elif content_type in ('text/csv', 'text/plain'):
+                fmt = 'csv'
+            else:
+                return jsonify({'error': 'Content-Type must be text/csv or application/x-ndjson'}), 415
+            
+            batch_size = request.args.get('batch_size', 1000, type=int)
+            lines = (line.decode('utf-8') for line in request.stream)
+            report = user_service.bulk_import_users(
+                user_service.parse_import_rows(lines, fmt),
+                batch_size=max(1, min(batch_size, 10000))
+            )
+            return jsonify(report)
+            
+        except UnicodeDecodeError:
+            return jsonify({'error': 'Request body must be UTF-8 encoded'}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
     @api.route('/users/<int:user_id>', methods=['GET'])
     def get_user(user_id):
         """Get user by ID"""
@@ -200,4 +252,21 @@ def create_routes(user_service: UserService, book_service: BookService,
         stats = statistics_service.get_system_statistics()
         return jsonify(stats)
     
+    @api.route('/admin/stats/timeseries', methods=['GET'])
+    def get_statistics_timeseries():
+        """Get daily rollups over a date range (?from=YYYY-MM-DD&to=YYYY-MM-DD&granularity=day|week|month)"""
+        try:
+            end = date.fromisoformat(request.args['to']) if request.args.get('to') else datetime.now(timezone.utc).date()
+            start = date.fromisoformat(request.args['from']) if request.args.get('from') else end - timedelta(days=30)
+        except ValueError:
+            return jsonify({'error': "'from' and 'to' must be dates in YYYY-MM-DD format"}), 400
+        
+        granularity = request.args.get('granularity', 'day')
+        try:
+            return jsonify(statistics_service.get_timeseries(start, end, granularity))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
     return api
\ No newline at end of file
@@ -0,0 +1,116 @@
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List, Optional
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+
+# True while a @read_only service method is running
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+class ReplicaRouter:
+    """Round-robin selection of read replicas with temporary ejection of failing ones"""
+
+    def __init__(self, bind_keys: List[str], eject_seconds: int = 30):
+        self.bind_keys = list(bind_keys)
+        self.eject_seconds = eject_seconds
+        self._cycle = itertools.cycle(self.bind_keys)
+        self._ejected_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def choose(self) -> Optional[str]:
+        """Next healthy replica bind key, or None to fall back to the primary"""
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.bind_keys)):
+                key = next(self._cycle)
+                if self._ejected_until.get(key, 0) <= now:
+                    return key
+        return None
+
+    def eject(self, bind_key: str) -> None:
+        with self._lock:
+            self._ejected_until[bind_key] = time.monotonic() + self.eject_seconds
+
+    def status(self) -> Dict[str, str]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: 'ejected' if self._ejected_until.get(key, 0) > now else 'healthy'
+                for key in self.bind_keys
+            }
+
+
+def init_replicas(app, db) -> Optional[ReplicaRouter]:
+    """Attach a ReplicaRouter for the replica binds configured on the app"""
+    bind_keys = sorted(key for key in (app.config.get('SQLALCHEMY_BINDS') or {})
+                       if str(key).startswith('replica_'))
+    if not bind_keys:
+        return None
+
+    router = ReplicaRouter(bind_keys, app.config.get('DB_REPLICA_EJECT_SECONDS', 30))
+    app.extensions['replica_router'] = router
+
+    with app.app_context():
+        for key in bind_keys:
+            _watch_replica(db.engines[key], router, key)
+
+    return router
+
+
+def _watch_replica(engine, router: ReplicaRouter, bind_key: str) -> None:
+    @event.listens_for(engine, 'handle_error')
+    def eject_on_connection_error(context):
+        # Lost or refused connections take the replica out of rotation;
+        # ordinary SQL errors do not
+        if context.is_disconnect or context.connection is None:
+            router.eject(bind_key)
+
+
+def read_only(method):
+    """Mark a service method as safe to serve from a read replica"""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        token = _replica_reads.set(True)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+            if 'replica_router' in current_app.extensions:
+                # Objects loaded from a lagging replica must not feed later writes
+                current_app.extensions['sqlalchemy'].session.expire_all()
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Session that sends reads issued inside @read_only methods to a replica.
+
+    Flushes, DML and anything after this session has written in the current
+    request stay on the primary so callers always read their own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and _replica_reads.get() and not self._flushing
+                and not self.info.get('wrote') and (clause is None or isinstance(clause, Select))):
+            router = current_app.extensions.get('replica_router')
+            bind_key = router.choose() if router else None
+            if bind_key is not None:
+                return self._db.engines[bind_key]
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _stick_to_primary(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _stick_to_primary_on_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['wrote'] = True
@@ -1,10 +1,17 @@
 from collections import UserList
 import redis
 import json
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional, Tuple
-from models import db, User, Book, Borrowing, Reservation
+import csv
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Dict, Optional, Tuple
+from models import db, User, Book, Borrowing, Reservation, LibraryCounter, DailyStat
 from config import Config
+from routing import read_only
+from timing import timed_cache_call
+from metrics import registry, labels
+
+registry.describe('cache_requests_total', 'counter', 'CacheService lookups by result (hit, miss, error)')
+CACHE_HIT, CACHE_MISS, CACHE_ERROR = labels(result='hit'), labels(result='miss'), labels(result='error')
 
 class CacheService:
 
@@ -25,14 +32,19 @@ class CacheService:
             self.cache_enabled=False
             print(f"Redis cache not available: {e}")
 
+    @timed_cache_call
     def get(self, key: str) -> Optional[str]:
         if not self.cache_enabled:
             return None
         try:
-            return self.redis_client.get(key)
+            value = self.redis_client.get(key)
         except Exception:
+            registry.inc('cache_requests_total', CACHE_ERROR)
             return None
+        registry.inc('cache_requests_total', CACHE_HIT if value is not None else CACHE_MISS)
+        return value
     
+    @timed_cache_call
     def set(self, key: str, value: str, expiry: int = 300) -> bool:
         if not self.cache_enabled:
             return False
@@ -41,6 +53,7 @@ class CacheService:
         except Exception:
             return False
 
+    @timed_cache_call
     def delete(self, key: str) -> bool:
         if not self.cache_enabled:
             return False
@@ -49,6 +62,7 @@ class CacheService:
         except Exception:
             return False
 
+    @timed_cache_call
     def clear_pattern(self, pattern: str) -> int:
         if not self.cache_enabled:
             return 0
@@ -61,21 +75,104 @@ class CacheService:
             return 0
 
 
+class CounterService:
+    """Incrementally maintained statistics counters stored in library_counters"""
+
+    COUNTER_NAMES = (
+        'books_total', 'books_available', 'books_borrowed',
+        'users_total', 'users_students', 'users_librarians',
+        'borrowings_total', 'borrowings_active',
+        'reservations_active'
+    )
+
+    def __init__(self, config: Config):
+        self.enabled = bool(config.get('STATS_COUNTERS_ENABLED', False))
+
+    def increment(self, **deltas: int) -> None:
+        """Apply counter deltas inside the caller's transaction (no commit)"""
+        for statement in self.statements(**deltas):
+            db.session.execute(statement)
+
+    def statements(self, **deltas: int) -> List:
+        """UPDATE statements applying the given counter deltas (empty when disabled)
+
+        All deltas go into a single UPDATE ... CASE so a write costs one extra
+        statement however many counters it touches.
+        """
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not self.enabled or not deltas:
+            return []
+        return [
+            db.update(LibraryCounter)
+              .where(LibraryCounter.name.in_(deltas))
+              .values(value=LibraryCounter.value + db.case(deltas, value=LibraryCounter.name))
+              .execution_options(synchronize_session=False)
+        ]
+
+    def snapshot(self) -> Optional[Dict[str, int]]:
+        """Read all counters, or None if they have not been initialized yet"""
+        rows = db.session.query(LibraryCounter.name, LibraryCounter.value).all()
+        values = {name: value for name, value in rows}
+        if any(name not in values for name in self.COUNTER_NAMES):
+            return None
+        return values
+
+    def lock(self) -> None:
+        """Hold off counter writes and other rebuilds until the caller's transaction ends"""
+        for statement in self.lock_statements(db.engine.dialect.name):
+            db.session.execute(statement)
+
+    def rebuild(self, values: Dict[str, int]) -> None:
+        """Overwrite every counter with freshly computed values and commit"""
+        try:
+            db.session.execute(self.rebuild_statement(values, db.engine.dialect.name))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def lock_statements(dialect_name: str) -> List:
+        """LOCK TABLE to run before counting the base tables for a rebuild
+
+        A writer's counter UPDATE then either commits before the count or waits
+        for the rebuild to commit, so no delta is lost, and two rebuilds queue
+        instead of racing. PostgreSQL only (empty elsewhere).
+        """
+        if dialect_name != 'postgresql':
+            return []
+        return [db.text(f'LOCK TABLE {LibraryCounter.__tablename__} IN EXCLUSIVE MODE')]
+
+    @classmethod
+    def rebuild_statement(cls, values: Dict[str, int], dialect_name: str):
+        """INSERT ... ON CONFLICT (name) DO UPDATE setting every counter to its value"""
+        if dialect_name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        statement = insert(LibraryCounter).values([
+            {'name': name, 'value': int(values.get(name, 0))} for name in cls.COUNTER_NAMES
+        ])
+        return statement.on_conflict_do_update(
+            index_elements=[LibraryCounter.name],
+            set_={'value': statement.excluded.value}
+        )
+
+
 class UserService:
-    def __init__(self, cache_service: CacheService):
+    def __init__(self, cache_service: CacheService, counter_service: Optional[CounterService] = None):
         self.cache = cache_service
+        self.counters = counter_service or CounterService({})
 
     def create_user(self, student_id: str, name: str, email: str, role: str = 'student') -> Tuple[bool, str, Optional[User]]:
         try:
-            if not all([student_id, name, email]):
-                return False, "All fields (student_id, name, email) are required", None
-            
-            existing_user = User.query.filter(
-                (User.student_id == student_id) | (User.email == email)
-            ).first()
-
-            if existing_user:
-                return False, "User with this student ID or email already exists", None
+            error = self.new_user_error(student_id, name, email)
+            if not error:
+                existing_user = db.session.scalar(self.existing_user_statement(student_id, email))
+                error = self.new_user_error(student_id, name, email, existing_user)
+            if error:
+                return False, error, None
             
             user = User(student_id=student_id,
                         name=name,
@@ -83,6 +180,7 @@ class UserService:
                         role=role)
             
             db.session.add(user)
+            self.counters.increment(**self.user_counter_deltas(role))
             db.session.commit()
 
             return True, "User created successfully", user
@@ -91,6 +189,135 @@ class UserService:
             db.session.rollback()
             return False, f"Error creating user: {str(e)}", None
 
+    # Rules and statement builders shared with the async services (async_services.py)
+
+    @staticmethod
+    def new_user_error(student_id: str, name: str, email: str, existing_user: Optional[User] = None) -> Optional[str]:
+        """Why a user cannot be created with these fields, or None"""
+        if not all([student_id, name, email]):
+            return "All fields (student_id, name, email) are required"
+        if existing_user:
+            return "User with this student ID or email already exists"
+        return None
+
+    @staticmethod
+    def existing_user_statement(student_id: str, email: str):
+        return db.select(User).where(
+            (User.student_id == student_id) | (User.email == email)
+        ).limit(1)
+
+    @staticmethod
+    def user_counter_deltas(role: str) -> Dict[str, int]:
+        return {
+            'users_total': 1,
+            'users_students': int(role == 'student'),
+            'users_librarians': int(role == 'librarian')
+        }
+
+    USER_ROLES = ('student', 'librarian')
+    MAX_IMPORT_ERROR_DETAILS = 100
+
+    def bulk_import_users(self, rows: Iterable[Dict], batch_size: int = 1000) -> Dict:
+        """Validate, deduplicate and insert users in batches, skipping existing ones"""
+        seen_student_ids = set()
+        seen_emails = set()
+        report = {'created': 0, 'skipped': 0, 'errors': 0, 'error_details': []}
+        batch = []
+
+        for line_number, row in enumerate(rows, start=1):
+            error = self._validate_import_row(row)
+            if error:
+                report['errors'] += 1
+                if len(report['error_details']) < self.MAX_IMPORT_ERROR_DETAILS:
+                    report['error_details'].append({'line': line_number, 'error': error})
+                continue
+
+            student_id = str(row['student_id']).strip()
+            email = str(row['email']).strip()
+            if student_id in seen_student_ids or email.lower() in seen_emails:
+                report['skipped'] += 1
+                continue
+            seen_student_ids.add(student_id)
+            seen_emails.add(email.lower())
+
+            now = datetime.now(timezone.utc)
+            batch.append({
+                'student_id': student_id,
+                'name': str(row['name']).strip(),
+                'email': email,
+                'role': self._import_role(row),
+                'created_at': now,
+                'updated_at': now
+            })
+            if len(batch) >= batch_size:
+                self._insert_user_batch(batch, report)
+                batch = []
+
+        if batch:
+            self._insert_user_batch(batch, report)
+
+        return report
+
+    @staticmethod
+    def parse_import_rows(lines: Iterable[str], fmt: str = 'csv') -> Iterable[Dict]:
+        """Lazily turn CSV (with header) or NDJSON lines into row dicts"""
+        if fmt == 'ndjson':
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield row if isinstance(row, dict) else {}
+        else:
+            yield from csv.DictReader(lines)
+
+    @staticmethod
+    def _import_role(row: Dict) -> Optional[str]:
+        """Normalized role of an import row, 'student' when absent; None when it is not a string"""
+        role = row.get('role') or 'student'
+        return role.strip().lower() if isinstance(role, str) else None
+
+    def _validate_import_row(self, row: Dict) -> Optional[str]:
+        missing = [field for field in ('student_id', 'name', 'email') if not str(row.get(field) or '').strip()]
+        if missing:
+            return f"Missing required field(s): {', '.join(missing)}"
+        if len(str(row['student_id']).strip()) > 20:
+            return "student_id must be at most 20 characters"
+        if len(str(row['name']).strip()) > 80:
+            return "name must be at most 80 characters"
+        email = str(row['email']).strip()
+        if len(email) > 100 or '@' not in email:
+            return "Invalid email address"
+        if self._import_role(row) not in self.USER_ROLES:
+            return f"role must be one of {', '.join(self.USER_ROLES)}"
+        return None
+
+    def _insert_user_batch(self, batch: List[Dict], report: Dict) -> None:
+        """INSERT ... ON CONFLICT DO NOTHING one batch and commit it"""
+        if db.engine.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        try:
+            statement = insert(User).values(batch).on_conflict_do_nothing().returning(User.role)
+            created_roles = [role for (role,) in db.session.execute(statement)]
+            self.counters.increment(
+                users_total=len(created_roles),
+                users_students=created_roles.count('student'),
+                users_librarians=created_roles.count('librarian')
+            )
+            db.session.commit()
+            report['created'] += len(created_roles)
+            report['skipped'] += len(batch) - len(created_roles)
+        except Exception as e:
+            db.session.rollback()
+            report['errors'] += len(batch)
+            if len(report['error_details']) < self.MAX_IMPORT_ERROR_DETAILS:
+                report['error_details'].append({'line': None, 'error': f"Batch insert failed: {str(e)}"})
+
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         return User.query.get(user_id)
 
@@ -108,6 +335,7 @@ class BookService:
     def __init__(self, cache_service: CacheService):
         self.cache = cache_service
 
+    @read_only
     def get_books(self, page: int=1, per_page: int=10, category: str=None) -> Dict:
         try:
             cache_key = f"books:page:{page}:per_page:{per_page}:category:{category or 'all'}"
@@ -116,12 +344,8 @@ class BookService:
             if cached_result:
                 return {**json.loads(cached_result), 'source': 'cache'}
             
-            query = Book.query.filter(Book.available_copies > 0)
-
-            if category:
-                query = query.filter(Book.category == category)
-            
-            paginated_books = query.paginate(
+            paginated_books = db.paginate(
+                self.available_books_statement(category),
                 page=page, per_page=per_page, error_out=False
             )
 
@@ -147,6 +371,7 @@ class BookService:
         except Exception as e:
             return {'error': str(e), 'books': [], 'pagination': {}}
 
+    @read_only
     def search_books(self, query: str) -> Dict:
         try:
             if not query.strip():
@@ -158,10 +383,7 @@ class BookService:
             if cached_result:
                 return {**json.loads(cached_result), 'source': 'cache'}
 
-            search_term = f"%{query}%"
-            books = Book.query.filter(
-                (Book.title.ilike(search_term)) | (Book.author.ilike(search_term))
-            ).filter(Book.available_copies > 0).all()
+            books = db.session.scalars(self.search_statement(query)).all()
 
             result = {
                 'books': [book.to_dict() for book in books],
@@ -184,11 +406,10 @@ class BookService:
     def get_book_by_id(self, book_id: int) -> Optional[Book]:
         return db.session.get(Book, book_id)
 
+    @read_only
     def get_popular_books(self, limit: int=10) -> List[Dict]:
         try:
-            popular_books = db.session.query(Book, db.func.count(Borrowing.id).label('borrow_count')).join(
-                Borrowing, Book.id == Borrowing.book_id
-            ).group_by(Book.id).order_by(db.desc('borrow_count')).limit(limit).all()
+            popular_books = db.session.execute(self.popular_statement(limit)).all()
 
             return [{
                 **book.to_dict(),
@@ -199,54 +420,60 @@ class BookService:
         except Exception as e:
             return []
 
+    # Statement builders shared with the async services (async_services.py)
+
+    @staticmethod
+    def available_books_statement(category: Optional[str] = None):
+        statement = db.select(Book).where(Book.available_copies > 0)
+        if category:
+            statement = statement.where(Book.category == category)
+        return statement
+
+    @staticmethod
+    def search_statement(query: str):
+        search_term = f"%{query}%"
+        return db.select(Book).where(
+            (Book.title.ilike(search_term)) | (Book.author.ilike(search_term)),
+            Book.available_copies > 0
+        )
+
+    @staticmethod
+    def popular_statement(limit: int):
+        return db.select(Book, db.func.count(Borrowing.id).label('borrow_count')).join(
+            Borrowing, Book.id == Borrowing.book_id
+        ).group_by(Book.id).order_by(db.desc('borrow_count')).limit(limit)
+
 
 class BorrowingService:
-    def __init__(self, cache_service: CacheService, user_service: UserService, book_service: BookService):
+    def __init__(self, cache_service: CacheService, user_service: UserService, book_service: BookService,
+                 counter_service: Optional[CounterService] = None):
         self.cache = cache_service
         self.user_service = user_service
         self.book_service = book_service
+        self.counters = counter_service or CounterService({})
 
     def borrow_book(self, user_id: int, book_id: int, loan_days: int = 14) -> Tuple[bool, str, Optional[Borrowing]]:
         """Process book borrowing"""
         try:
             # Get user and book
             user = self.user_service.get_user_by_id(user_id)
-            if not user:
-                return False, "User not found", None
-            
             book = self.book_service.get_book_by_id(book_id)
-            if not book:
-                return False, "Book not found", None
-            
-            # Check if book is available
-            if not book.is_available():
-                return False, "Book is not available", None
-            
-            # Check user's borrowing limit
-            if not user.can_borrow_book():
-                return False, f"Borrowing limit reached (maximum {Config.MAX_BORROWING_LIMIT} books)", None
-            
-            # Check if user already has this book
-            existing_borrowing = Borrowing.query.filter_by(
-                user_id=user_id, book_id=book_id, returned=False
-            ).first()
-            
-            if existing_borrowing:
-                return False, "You already have this book borrowed", None
-            
-            # Create borrowing record
-            due_date = datetime.now(timezone.utc) + timedelta(days=loan_days)
-            borrowing = Borrowing(
-                user_id=user_id,
-                book_id=book_id,
-                due_date=due_date
-            )
+
+            # Check availability, the user's borrowing limit and whether they already have this book
+            error = self.borrow_error(user, book)
+            if not error:
+                active_count = db.session.scalar(self.active_count_statement(user_id))
+                existing_borrowing = db.session.scalar(self.active_loan_statement(user_id, book_id))
+                error = self.borrow_error(user, book, active_count, existing_borrowing)
+            if error:
+                return False, error, None
             
-            # Update book availability
-            book.borrow_copy()
+            # Create borrowing record and update book availability
+            borrowing, deltas = self.lend(user_id, book, loan_days)
             
             # Save to database
             db.session.add(borrowing)
+            self.counters.increment(**deltas)
             db.session.commit()
             
             # Clear relevant cache
@@ -262,26 +489,14 @@ class BorrowingService:
     def return_book(self, borrowing_id: int) -> Tuple[bool, str, Optional[Borrowing]]:
         """Process book return"""
         try:
-            borrowing = Borrowing.query.get(borrowing_id)
-            if not borrowing:
-                return False, "Borrowing record not found", None
-            
-            if borrowing.returned:
-                return False, "Book already returned", None
+            borrowing = db.session.get(Borrowing, borrowing_id)
+            error = self.return_error(borrowing)
+            if error:
+                return False, error, None
 
-            # Calculate fine if overdue (BEFORE marking as returned)
-            if borrowing.is_overdue():
-                days_overdue = borrowing.days_overdue()
-                borrowing.fine_amount = days_overdue * 1.0  # $1 per day
-
-            # Mark as returned
-            borrowing.returned = True
-            borrowing.returned_date = datetime.now(timezone.utc)
-            
-            # Update book availability
+            # Mark as returned, fine it if overdue and update book availability
             book = db.session.get(Book, borrowing.book_id)
-            book.return_copy()
-            
+            self.counters.increment(**self.take_back(borrowing, book))
             db.session.commit()
             
             # Clear relevant cache
@@ -305,27 +520,9 @@ class BorrowingService:
                 return {**json.loads(cached_result), 'source': 'cache'}
             
             # Query database
-            borrowings = db.session.query(Borrowing, Book).join(
-                Book, Borrowing.book_id == Book.id
-            ).filter(
-                Borrowing.user_id == user_id,
-                Borrowing.returned == False
-            ).all()
+            borrowings = db.session.execute(self.borrowed_statement(user_id)).all()
             
-            borrowed_books = []
-            for borrowing, book in borrowings:
-                # Handle both naive and aware datetimes for days_remaining
-                due = borrowing.due_date
-                now = datetime.now(timezone.utc)
-                if due.tzinfo is None:
-                    now = datetime.utcnow()
-
-                borrowed_book_data = {
-                    'borrowing': borrowing.to_dict(),
-                    'book': book.to_dict(),
-                    'days_remaining': (due - now).days
-                }
-                borrowed_books.append(borrowed_book_data)
+            borrowed_books = [self.borrowed_book_dict(borrowing, book) for borrowing, book in borrowings]
             
             result = {
                 'borrowed_books': borrowed_books,
@@ -346,17 +543,11 @@ class BorrowingService:
         except Exception as e:
             return {'error': str(e), 'borrowed_books': [], 'count': 0, 'user_id': user_id}
     
+    @read_only
     def get_overdue_books(self) -> List[Dict]:
         """Get all overdue books"""
         try:
-            overdue_borrowings = db.session.query(Borrowing, Book, User).join(
-                Book, Borrowing.book_id == Book.id
-            ).join(
-                User, Borrowing.user_id == User.id
-            ).filter(
-                Borrowing.returned == False,
-                Borrowing.due_date < datetime.now(timezone.utc)
-            ).all()
+            overdue_borrowings = db.session.execute(self.overdue_statement()).all()
             
             overdue_books = []
             for borrowing, book, user in overdue_borrowings:
@@ -371,33 +562,135 @@ class BorrowingService:
         except Exception as e:
             return []
 
+    # Rules and statement builders shared with the async services (async_services.py)
+
+    FINE_PER_DAY = 1.0
+
+    @staticmethod
+    def borrow_error(user: Optional[User], book: Optional[Book], active_count: int = 0,
+                     existing_borrowing: Optional[Borrowing] = None) -> Optional[str]:
+        """Why user cannot borrow book, or None; the loan counts are checked once they are passed in"""
+        if not user:
+            return "User not found"
+        if not book:
+            return "Book not found"
+        if not book.is_available():
+            return "Book is not available"
+        if active_count >= Config.MAX_BORROWING_LIMIT:
+            return f"Borrowing limit reached (maximum {Config.MAX_BORROWING_LIMIT} books)"
+        if existing_borrowing:
+            return "You already have this book borrowed"
+        return None
+
+    @staticmethod
+    def lend(user_id: int, book: Book, loan_days: int) -> Tuple[Borrowing, Dict[str, int]]:
+        """New loan of book, taking one copy; returns it with the counter deltas"""
+        borrowing = Borrowing(
+            user_id=user_id,
+            book_id=book.id,
+            due_date=datetime.now(timezone.utc) + timedelta(days=loan_days)
+        )
+        was_fully_available = book.available_copies == book.total_copies
+        book.borrow_copy()
+        return borrowing, {
+            'borrowings_total': 1,
+            'borrowings_active': 1,
+            'books_available': -int(book.available_copies == 0),
+            'books_borrowed': int(was_fully_available)
+        }
+
+    @staticmethod
+    def return_error(borrowing: Optional[Borrowing]) -> Optional[str]:
+        if not borrowing:
+            return "Borrowing record not found"
+        if borrowing.returned:
+            return "Book already returned"
+        return None
+
+    @classmethod
+    def take_back(cls, borrowing: Borrowing, book: Book) -> Dict[str, int]:
+        """Mark borrowing returned, fining overdue days, and put the copy back; returns the counter deltas"""
+        # The fine is computed BEFORE marking as returned, which stops the overdue clock
+        if borrowing.is_overdue():
+            borrowing.fine_amount = borrowing.days_overdue() * cls.FINE_PER_DAY
+        borrowing.returned = True
+        borrowing.returned_date = datetime.now(timezone.utc)
+
+        was_unavailable = book.available_copies == 0
+        book.return_copy()
+        return {
+            'borrowings_active': -1,
+            'books_available': int(was_unavailable and book.available_copies > 0),
+            'books_borrowed': -int(book.available_copies == book.total_copies)
+        }
+
+    @staticmethod
+    def active_count_statement(user_id: int):
+        return db.select(db.func.count(Borrowing.id)).where(
+            Borrowing.user_id == user_id,
+            Borrowing.returned == False
+        )
+
+    @staticmethod
+    def active_loan_statement(user_id: int, book_id: int):
+        return db.select(Borrowing).filter_by(
+            user_id=user_id, book_id=book_id, returned=False
+        ).limit(1)
+
+    @staticmethod
+    def borrowed_statement(user_id: int):
+        return db.select(Borrowing, Book).join(
+            Book, Borrowing.book_id == Book.id
+        ).where(
+            Borrowing.user_id == user_id,
+            Borrowing.returned == False
+        )
+
+    @staticmethod
+    def overdue_statement():
+        return db.select(Borrowing, Book, User).join(
+            Book, Borrowing.book_id == Book.id
+        ).join(
+            User, Borrowing.user_id == User.id
+        ).where(
+            Borrowing.returned == False,
+            Borrowing.due_date < datetime.now(timezone.utc)
+        )
+
+    @staticmethod
+    def borrowed_book_dict(borrowing: Borrowing, book: Book) -> Dict:
+        # Handle both naive and aware datetimes for days_remaining
+        due = borrowing.due_date
+        now = datetime.now(timezone.utc)
+        if due.tzinfo is None:
+            now = datetime.utcnow()
+
+        return {
+            'borrowing': borrowing.to_dict(),
+            'book': book.to_dict(),
+            'days_remaining': (due - now).days
+        }
+
 class ReservationService:
     
-    def __init__(self, cache_service: CacheService):
+    def __init__(self, cache_service: CacheService, counter_service: Optional[CounterService] = None):
         self.cache = cache_service
+        self.counters = counter_service or CounterService({})
     
     def create_reservation(self, user_id: int, book_id: int) -> Tuple[bool, str, Optional[Reservation]]:
         try:
             # Check if user already has this book reserved
-            existing_reservation = Reservation.query.filter_by(
-                user_id=user_id, book_id=book_id, status='active'
-            ).first()
+            existing_reservation = db.session.scalar(self.active_reservation_statement(user_id, book_id))
+            error = self.reservation_error(existing_reservation)
+            if error:
+                return False, error, None
             
-            if existing_reservation:
-                return False, "You already have a reservation for this book", None
-            
-            # Get next priority number
-            max_priority = db.session.query(db.func.max(Reservation.priority)).filter_by(
-                book_id=book_id, status='active'
-            ).scalar() or 0
-            
-            reservation = Reservation(
-                user_id=user_id,
-                book_id=book_id,
-                priority=max_priority + 1
-            )
+            # Queue behind the book's other active reservations
+            max_priority = db.session.scalar(self.max_priority_statement(book_id))
+            reservation = self.queue_reservation(user_id, book_id, max_priority)
             
             db.session.add(reservation)
+            self.counters.increment(reservations_active=1)
             db.session.commit()
             
             return True, "Reservation created successfully", reservation
@@ -406,48 +699,273 @@ class ReservationService:
             db.session.rollback()
             return False, f"Error creating reservation: {str(e)}", None
 
+    # Rules and statement builders shared with the async services (async_services.py)
+
+    @staticmethod
+    def reservation_error(existing_reservation: Optional[Reservation]) -> Optional[str]:
+        if existing_reservation:
+            return "You already have a reservation for this book"
+        return None
+
+    @staticmethod
+    def queue_reservation(user_id: int, book_id: int, max_priority: Optional[int]) -> Reservation:
+        return Reservation(user_id=user_id, book_id=book_id, priority=(max_priority or 0) + 1)
+
+    @staticmethod
+    def active_reservation_statement(user_id: int, book_id: int):
+        return db.select(Reservation).filter_by(
+            user_id=user_id, book_id=book_id, status='active'
+        ).limit(1)
+
+    @staticmethod
+    def max_priority_statement(book_id: int):
+        return db.select(db.func.max(Reservation.priority)).filter_by(
+            book_id=book_id, status='active'
+        )
+
 class StatisticsService:
     
-    def __init__(self, cache_service: CacheService):
+    def __init__(self, cache_service: CacheService, counter_service: Optional[CounterService] = None):
         self.cache = cache_service
+        self.counters = counter_service or CounterService({})
     
     def get_system_statistics(self) -> Dict:
         try:
-            # Check cache
-            cache_key = "system:statistics"
-            cached_result = self.cache.get(cache_key)
-            
-            if cached_result:
-                return {**json.loads(cached_result), 'source': 'cache'}
-            
-            stats = {
-                'books': {
-                    'total': Book.query.count(),
-                    'available': Book.query.filter(Book.available_copies > 0).count(),
-                    'borrowed': Book.query.filter(Book.available_copies < Book.total_copies).count()
-                },
-                'users': {
-                    'total': User.query.count(),
-                    'students': User.query.filter_by(role='student').count(),
-                    'librarians': User.query.filter_by(role='librarian').count()
-                },
-                'borrowings': {
-                    'total': Borrowing.query.count(),
-                    'active': Borrowing.query.filter_by(returned=False).count(),
-                    'overdue': Borrowing.query.filter(
-                        Borrowing.returned == False,
-                        Borrowing.due_date < datetime.now(timezone.utc)
-                    ).count()
-                },
-                'reservations': {
-                    'active': Reservation.query.filter_by(status='active').count()
-                },
-                'generated_at': datetime.now(timezone.utc).isoformat()
+            if self.counters.enabled:
+                # Not @read_only: a lagging replica could lack the counters or feed
+                # stale totals into a rebuild on the primary, which deltas never correct
+                return self._get_counter_statistics()
+            return self._get_aggregate_statistics()
+        except Exception as e:
+            return {'error': str(e)}
+
+    # Shared with AsyncStatisticsService, so both apps use the same cache entry
+    CACHE_KEY = "system:statistics"
+    CACHE_EXPIRY = 180  # 3 minutes
+
+    @read_only
+    def _get_aggregate_statistics(self) -> Dict:
+        # Check cache
+        cached_result = self.cache.get(self.CACHE_KEY)
+
+        if cached_result:
+            return {**json.loads(cached_result), 'source': 'cache'}
+
+        stats = self._build_statistics(self._count_all())
+
+        self.cache.set(self.CACHE_KEY, json.dumps(stats), self.CACHE_EXPIRY)
+
+        return {**stats, 'source': 'database'}
+
+    GRANULARITIES = ('day', 'week', 'month')
+
+    def rollup_daily_stats(self, since: Optional[date] = None, through: Optional[date] = None) -> Dict:
+        """Incrementally (re)build daily_stats rows; safe to run repeatedly"""
+        try:
+            through = through or (datetime.now(timezone.utc).date() - timedelta(days=1))
+
+            if since is None:
+                last_day = db.session.query(db.func.max(DailyStat.day)).scalar()
+                since = last_day + timedelta(days=1) if last_day else self._first_activity_day()
+            if since is None or since > through:
+                return {'days': 0, 'since': None, 'through': through.isoformat()}
+
+            start = datetime.combine(since, datetime.min.time())
+            end = datetime.combine(through + timedelta(days=1), datetime.min.time())
+
+            borrows = self._count_by_day(Borrowing.borrowed_date, start, end, db.func.count(Borrowing.id))
+            returns = self._count_by_day(Borrowing.returned_date, start, end, db.func.count(Borrowing.id))
+            fines = self._count_by_day(Borrowing.returned_date, start, end, db.func.sum(Borrowing.fine_amount))
+            new_users = self._count_by_day(User.created_at, start, end, db.func.count(User.id))
+
+            day = since
+            while day <= through:
+                day_end = datetime.combine(day + timedelta(days=1), datetime.min.time())
+                # Loans that were open and past due at the end of this day
+                overdue = Borrowing.query.filter(
+                    Borrowing.borrowed_date < day_end,
+                    Borrowing.due_date < day_end,
+                    (Borrowing.returned == False) | (Borrowing.returned_date >= day_end)
+                ).count()
+
+                db.session.merge(DailyStat(
+                    day=day,
+                    borrows=borrows.get(day, 0),
+                    returns=returns.get(day, 0),
+                    new_users=new_users.get(day, 0),
+                    overdue=overdue,
+                    fines=float(fines.get(day) or 0.0)
+                ))
+                day += timedelta(days=1)
+
+            db.session.commit()
+            self.cache.clear_pattern('stats:timeseries:*')
+
+            return {
+                'days': (through - since).days + 1,
+                'since': since.isoformat(),
+                'through': through.isoformat()
             }
 
-            self.cache.set(cache_key, json.dumps(stats), 180)  # 3 minutes
-            
-            return {**stats, 'source': 'database'}
-            
         except Exception as e:
-            return {'error': str(e)}
\ No newline at end of file
+            db.session.rollback()
+            return {'error': str(e), 'days': 0}
+
+    @read_only
+    def get_timeseries(self, start: date, end: date, granularity: str = 'day') -> Dict:
+        """Read daily rollups for a date range, bucketed by day, week or month
+
+        Raises ValueError for an unknown granularity or a reversed range; database
+        and cache errors propagate to the caller.
+        """
+        if granularity not in self.GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(self.GRANULARITIES)}")
+        if start > end:
+            raise ValueError("'from' must not be after 'to'")
+
+        cache_key = f"stats:timeseries:{start.isoformat()}:{end.isoformat()}:{granularity}"
+        cached_result = self.cache.get(cache_key)
+
+        if cached_result:
+            return {**json.loads(cached_result), 'source': 'cache'}
+
+        rows = DailyStat.query.filter(
+            DailyStat.day >= start,
+            DailyStat.day <= end
+        ).order_by(DailyStat.day).all()
+
+        buckets = {}
+        for row in rows:
+            key = self._bucket_start(row.day, granularity)
+            bucket = buckets.setdefault(key, {
+                'period': key.isoformat(),
+                'borrows': 0, 'returns': 0, 'new_users': 0, 'overdue': 0, 'fines': 0.0
+            })
+            bucket['borrows'] += row.borrows
+            bucket['returns'] += row.returns
+            bucket['new_users'] += row.new_users
+            bucket['fines'] += row.fines
+            # Overdue is a point-in-time gauge: keep the value at the end of the bucket
+            bucket['overdue'] = row.overdue
+
+        result = {
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'granularity': granularity,
+            'series': list(buckets.values())
+        }
+
+        self.cache.set(cache_key, json.dumps(result), 300)
+
+        return {**result, 'source': 'database'}
+
+    def _first_activity_day(self) -> Optional[date]:
+        first = [
+            db.session.query(db.func.min(Borrowing.borrowed_date)).scalar(),
+            db.session.query(db.func.min(User.created_at)).scalar()
+        ]
+        first = [value for value in first if value is not None]
+        return min(first).date() if first else None
+
+    def _count_by_day(self, column, start: datetime, end: datetime, aggregate) -> Dict[date, float]:
+        """Group an aggregate by the calendar day of a timestamp column"""
+        day = db.func.date(column)
+        rows = db.session.query(day, aggregate).filter(
+            column >= start, column < end
+        ).group_by(day).all()
+        # SQLite returns 'YYYY-MM-DD' strings, PostgreSQL returns date objects
+        return {date.fromisoformat(str(key)[:10]): value for key, value in rows if key is not None}
+
+    def _bucket_start(self, day: date, granularity: str) -> date:
+        if granularity == 'week':
+            return day - timedelta(days=day.weekday())
+        if granularity == 'month':
+            return day.replace(day=1)
+        return day
+
+    def rebuild_counters(self) -> Dict[str, int]:
+        """Recompute the counters table from the base tables; never call it from a @read_only method"""
+        # Lock in the same transaction as the count, so deltas committed meanwhile are not lost
+        self.counters.lock()
+        counts = self._count_all()
+        self.counters.rebuild(counts)
+        return counts
+
+    def _get_counter_statistics(self) -> Dict:
+        """Serve statistics from the counters table (initializing it on first use)"""
+        counts = self.counters.snapshot()
+        if counts is None:
+            counts = self.rebuild_counters()
+        else:
+            # Overdue depends on the clock, so it cannot be maintained incrementally
+            counts['borrowings_overdue'] = db.session.scalar(self.overdue_count_statement())
+
+        return {**self._build_statistics(counts), 'source': 'counters'}
+
+    def _count_all(self) -> Dict[str, int]:
+        """Compute every statistic in one round-trip using aggregate FILTER clauses"""
+        row = db.session.execute(self.count_all_statement()).one()
+        return {key: int(value or 0) for key, value in row._mapping.items()}
+
+    @staticmethod
+    def overdue_count_statement():
+        return db.select(db.func.count(Borrowing.id)).where(
+            Borrowing.returned == False,
+            Borrowing.due_date < datetime.now(timezone.utc)
+        )
+
+    @staticmethod
+    def count_all_statement():
+        count = db.func.count
+        books = db.select(
+            count().label('books_total'),
+            count().filter(Book.available_copies > 0).label('books_available'),
+            count().filter(Book.available_copies < Book.total_copies).label('books_borrowed')
+        ).select_from(Book).subquery()
+        users = db.select(
+            count().label('users_total'),
+            count().filter(User.role == 'student').label('users_students'),
+            count().filter(User.role == 'librarian').label('users_librarians')
+        ).select_from(User).subquery()
+        borrowings = db.select(
+            count().label('borrowings_total'),
+            count().filter(Borrowing.returned == False).label('borrowings_active'),
+            count().filter(
+                Borrowing.returned == False,
+                Borrowing.due_date < datetime.now(timezone.utc)
+            ).label('borrowings_overdue')
+        ).select_from(Borrowing).subquery()
+        reservations = db.select(
+            count().filter(Reservation.status == 'active').label('reservations_active')
+        ).select_from(Reservation).subquery()
+
+        # Each subquery yields exactly one row, so joining them on TRUE keeps one row
+        return db.select(books, users, borrowings, reservations).select_from(
+            books.join(users, db.true())
+                 .join(borrowings, db.true())
+                 .join(reservations, db.true())
+        )
+
+    @staticmethod
+    def _build_statistics(counts: Dict[str, int]) -> Dict:
+        return {
+            'books': {
+                'total': counts['books_total'],
+                'available': counts['books_available'],
+                'borrowed': counts['books_borrowed']
+            },
+            'users': {
+                'total': counts['users_total'],
+                'students': counts['users_students'],
+                'librarians': counts['users_librarians']
+            },
+            'borrowings': {
+                'total': counts['borrowings_total'],
+                'active': counts['borrowings_active'],
+                'overdue': counts['borrowings_overdue']
+            },
+            'reservations': {
+                'active': counts['reservations_active']
+            },
+            'generated_at': datetime.now(timezone.utc).isoformat()
+        }
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from timing import configure_json_logger
+
+logger = logging.getLogger('library.slow_query')
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\?, )*\?\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape: literals and bind parameters become ?"""
+    normalized = _STRING.sub('?', statement)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip()
+    return _IN_LIST.sub('IN (...)', normalized)
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def calling_service_method() -> Optional[str]:
+    """Innermost services.py method on the current stack, e.g. 'BookService.search_books'"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_globals.get('__name__') in ('services', 'async_services'):
+            owner = frame.f_locals.get('self')
+            name = frame.f_code.co_name
+            return f'{type(owner).__name__}.{name}' if owner is not None else name
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """Statements slower than a threshold, grouped by fingerprint.
+
+    Keeps the slowest `top_n` fingerprints (plus headroom so a fingerprint can
+    climb into the top N) and optionally captures EXPLAIN (ANALYZE, BUFFERS)
+    for PostgreSQL SELECTs, at most once per fingerprint per explain interval.
+    """
+
+    def __init__(self, threshold_ms: float, top_n: int = 20, explain: bool = False,
+                 explain_interval_seconds: float = 300, max_parameter_length: int = 500):
+        self.threshold_seconds = threshold_ms / 1000
+        self.top_n = top_n
+        self.capacity = top_n * 5
+        self.explain = explain
+        self.explain_interval_seconds = explain_interval_seconds
+        self.max_parameter_length = max_parameter_length
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine) -> None:
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_slow_query_started', None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        if duration >= self.threshold_seconds:
+            self.record(statement, parameters, duration, cursor=cursor, dialect=conn.dialect.name)
+
+    def record(self, statement: str, parameters, duration: float, cursor=None, dialect: str = '') -> Dict:
+        normalized = normalize_statement(statement)
+        key = fingerprint(normalized)
+        service = calling_service_method()
+        parameter_text = repr(parameters)[:self.max_parameter_length]
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    'fingerprint': key, 'statement': normalized, 'service': service,
+                    'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'explain': None, 'explained_at': None, '_explained': 0.0
+                }
+            entry['count'] += 1
+            entry['total_ms'] += duration * 1000
+            entry['max_ms'] = max(entry['max_ms'], duration * 1000)
+            entry['last_ms'] = duration * 1000
+            entry['last_parameters'] = parameter_text
+            entry['last_seen'] = datetime.now(timezone.utc).isoformat()
+            entry['service'] = service or entry['service']
+            should_explain = (self.explain and cursor is not None and dialect == 'postgresql'
+                              and normalized.upper().startswith(('SELECT', 'WITH'))
+                              and now - entry['_explained'] >= self.explain_interval_seconds)
+            if should_explain:
+                entry['_explained'] = now
+            self._evict()
+
+        logger.warning(json.dumps({
+            'event': 'slow_query',
+            'fingerprint': key,
+            'duration_ms': round(duration * 1000, 3),
+            'service': service,
+            'statement': normalized,
+            'parameters': parameter_text
+        }))
+
+        if should_explain:
+            plan = self._explain(cursor, statement, parameters)
+            with self._lock:
+                entry['explain'] = plan
+                entry['explained_at'] = datetime.now(timezone.utc).isoformat()
+            if plan:
+                logger.warning(json.dumps({'event': 'slow_query_plan', 'fingerprint': key, 'plan': plan}))
+        return entry
+
+    def _explain(self, cursor, statement: str, parameters) -> Optional[str]:
+        """EXPLAIN (ANALYZE, BUFFERS) the statement in a savepoint on the same DBAPI connection.
+
+        ANALYZE re-runs the query, which is why this is restricted to SELECTs and
+        rate-limited; the savepoint keeps a failed EXPLAIN (e.g. statement_timeout)
+        from aborting the caller's transaction.
+        """
+        explain_cursor = cursor.connection.cursor()
+        try:
+            explain_cursor.execute('SAVEPOINT slow_query_explain')
+            try:
+                explain_cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {statement}', parameters)
+                plan = '\n'.join(row[0] for row in explain_cursor.fetchall())
+                explain_cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+                return plan
+            except Exception as e:
+                explain_cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+                return f'EXPLAIN failed: {e}'
+        except Exception:
+            return None
+        finally:
+            explain_cursor.close()
+
+    def _evict(self) -> None:
+        if len(self._entries) <= self.capacity:
+            return
+        fastest = sorted(self._entries.values(), key=lambda entry: entry['max_ms'])
+        for entry in fastest[:len(self._entries) - self.capacity]:
+            del self._entries[entry['fingerprint']]
+
+    def top(self, limit: Optional[int] = None) -> List[Dict]:
+        """Slowest fingerprints first, by maximum duration"""
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda entry: entry['max_ms'], reverse=True)
+            entries = entries[:min(limit or self.top_n, self.top_n)]
+            return [{
+                **{key: value for key, value in entry.items() if not key.startswith('_')},
+                'total_ms': round(entry['total_ms'], 3),
+                'max_ms': round(entry['max_ms'], 3),
+                'last_ms': round(entry['last_ms'], 3),
+                'avg_ms': round(entry['total_ms'] / entry['count'], 3)
+            } for entry in entries]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def init_slow_query_log(app, db) -> Optional[SlowQueryLog]:
+    """Watch every configured engine (primary and replicas) for slow statements"""
+    threshold_ms = float(app.config.get('SLOW_QUERY_THRESHOLD_MS', 0))
+    if threshold_ms <= 0:
+        return None
+
+    slow_query_log = SlowQueryLog(
+        threshold_ms,
+        top_n=app.config.get('SLOW_QUERY_TOP_N', 20),
+        explain=app.config.get('SLOW_QUERY_EXPLAIN', False),
+        explain_interval_seconds=app.config.get('SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS', 300)
+    )
+    with app.app_context():
+        for engine in db.engines.values():
+            slow_query_log.attach(engine)
+
+    configure_json_logger(logger)
+    app.extensions['slow_query_log'] = slow_query_log
+    return slow_query_log
@@ -2,8 +2,12 @@ import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import pytest
 import os
+from collections import Counter
+from contextlib import contextmanager
+from sqlalchemy import event
 from app import create_app
 from models import db, User, Book, Borrowing, Reservation
+from slow_queries import normalize_statement
 from datetime import datetime, timedelta, timezone
 
 @pytest.fixture(scope='session')
@@ -185,3 +189,62 @@ def sample_reservation(app_context, sample_users, sample_books):
     db.session.commit()
 
     return reservation
+
+class QueryCounter:
+    """SQL statements executed on an engine while the block runs"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def repeated(self, max_repeats=1):
+        """Statement shapes run more than max_repeats times with different parameters (N+1)"""
+        shapes = Counter()
+        seen = set()
+        for statement, parameters in self.statements:
+            if (statement, repr(parameters)) in seen:
+                continue
+            seen.add((statement, repr(parameters)))
+            shapes[normalize_statement(statement)] += 1
+        return {shape: count for shape, count in shapes.items() if count > max_repeats}
+
+    def report(self):
+        return '\n'.join(f'  {index}. {normalize_statement(statement)[:200]}'
+                         for index, (statement, _) in enumerate(self.statements, 1))
+
+@pytest.fixture
+def query_budget(app_context):
+    """Fail when a block runs more than `max_queries` statements or repeats one per row
+
+    The session is expired first so the block starts as cold as a real request:
+        with query_budget(2):
+            client.get('/api/books')
+    """
+    @contextmanager
+    def budget(max_queries, max_repeats=1):
+        db.session.expire_all()
+        with QueryCounter(db.engine) as counter:
+            yield counter
+
+        if counter.count > max_queries:
+            pytest.fail(f'{counter.count} queries, budget is {max_queries}:\n{counter.report()}')
+        repeated = counter.repeated(max_repeats)
+        if repeated:
+            details = '\n'.join(f'  {count}x {shape[:200]}' for shape, count in repeated.items())
+            pytest.fail(f'Possible N+1, statements repeated with different parameters:\n{details}')
+
+    return budget
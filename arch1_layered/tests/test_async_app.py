@@ -0,0 +1,253 @@
+import pytest
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from starlette.testclient import TestClient
+from asgi_app import create_asgi_app
+from async_services import async_database_url
+from models import db, User, Book, Borrowing, LibraryCounter
+from tests.test_metrics import _sample
+from tests.test_rate_limit import requires_redis
+
+@pytest.fixture
+def async_db(tmp_path):
+    """File-backed SQLite database shared by a sync seeding engine and the async app"""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url)
+    db.metadata.create_all(engine)
+    yield url, engine
+    engine.dispose()
+
+@pytest.fixture
+def seeded(async_db):
+    """Two users and three books (one of them unavailable)"""
+    _, engine = async_db
+    with Session(engine, expire_on_commit=False) as session:
+        users = [
+            User(student_id="STU001", name="John Student", email="john@university.edu", role="student"),
+            User(student_id="LIB001", name="Library Admin", email="admin@library.edu", role="librarian")
+        ]
+        books = [
+            Book(title="Python Programming", author="John Doe", isbn="978-0123456789",
+                 category="Programming", total_copies=3, available_copies=3),
+            Book(title="Web Development with Flask", author="Bob Johnson", isbn="978-0456789123",
+                 category="Web Development", total_copies=1, available_copies=1),
+            Book(title="Database Systems", author="Alice Brown", isbn="978-0789123456",
+                 category="Database", total_copies=1, available_copies=0)
+        ]
+        session.add_all(users + books)
+        session.commit()
+        return users, books
+
+def _client(async_db, **overrides):
+    url, _ = async_db
+    return TestClient(create_asgi_app('development', {'SQLALCHEMY_DATABASE_URI': url, **overrides}))
+
+@pytest.fixture
+def async_client(async_db):
+    with _client(async_db) as client:
+        yield client
+
+
+class TestAsyncConfiguration:
+    """Test database URL translation for the async engine"""
+
+    def test_async_database_url(self):
+        """Sync drivers are swapped for asyncpg / aiosqlite"""
+        assert async_database_url('postgresql://u:p@db:5432/library') == 'postgresql+asyncpg://u:p@db:5432/library'
+        assert async_database_url('postgresql+psycopg2://u@db/library') == 'postgresql+asyncpg://u@db/library'
+        assert async_database_url('postgres://u@db/library') == 'postgresql+asyncpg://u@db/library'
+        assert async_database_url('sqlite:///:memory:') == 'sqlite+aiosqlite:///:memory:'
+
+
+class TestAsyncRoutes:
+    """Test that the ASGI app serves the same contract as the Flask app"""
+
+    def test_health_check(self, async_client):
+        """Test health endpoint"""
+        response = async_client.get('/api/health')
+
+        assert response.status_code == 200
+        assert response.json()['status'] == 'healthy'
+
+    def test_register_and_login(self, async_client):
+        """Test registering, fetching and logging in a user"""
+        response = async_client.post('/api/users/register', json={
+            'student_id': 'STU100', 'name': 'New Student', 'email': 'new@university.edu'
+        })
+        assert response.status_code == 201
+        user = response.json()['user']
+        assert user['role'] == 'student'
+
+        duplicate = async_client.post('/api/users/register', json={
+            'student_id': 'STU100', 'name': 'Again', 'email': 'again@university.edu'
+        })
+        assert duplicate.status_code == 400
+
+        assert async_client.get(f"/api/users/{user['id']}").json()['user']['student_id'] == 'STU100'
+        assert async_client.post('/api/users/login', json={'student_id': 'STU100'}).status_code == 200
+        assert async_client.post('/api/users/login', json={'student_id': 'NOPE'}).status_code == 401
+        assert async_client.post('/api/users/login', content=b'not json').status_code == 400
+        assert async_client.get('/api/users/9999').status_code == 404
+
+    def test_books_pagination_and_search(self, async_client, seeded):
+        """Test listing, paging, searching and fetching books"""
+        data = async_client.get('/api/books?limit=1').json()
+        assert len(data['books']) == 1
+        assert data['pagination'] == {'page': 1, 'pages': 2, 'total': 2, 'has_next': True, 'has_prev': False}
+
+        data = async_client.get('/api/books?category=Programming').json()
+        assert [book['title'] for book in data['books']] == ['Python Programming']
+
+        data = async_client.get('/api/books/search?q=flask').json()
+        assert data['count'] == 1
+        assert async_client.get('/api/books/search').status_code == 400
+
+        _, books = seeded
+        assert async_client.get(f'/api/books/{books[0].id}').json()['book']['isbn'] == '978-0123456789'
+        assert async_client.get('/api/books/9999').status_code == 404
+
+    def test_borrow_and_return(self, async_client, seeded):
+        """Test the borrow/return flow and its availability updates"""
+        users, books = seeded
+
+        response = async_client.post('/api/borrow', json={'user_id': users[0].id, 'book_id': books[1].id})
+        assert response.status_code == 200
+        borrowing = response.json()['borrowing']
+        assert borrowing['returned'] is False
+
+        again = async_client.post('/api/borrow', json={'user_id': users[1].id, 'book_id': books[1].id})
+        assert again.json()['error'] == 'Book is not available'
+
+        borrowed = async_client.get(f'/api/users/{users[0].id}/borrowed').json()
+        assert borrowed['count'] == 1
+        assert borrowed['borrowed_books'][0]['days_remaining'] >= 13
+
+        popular = async_client.get('/api/books/popular').json()['popular_books']
+        assert popular[0]['id'] == books[1].id
+        assert popular[0]['borrow_count'] == 1
+
+        response = async_client.post(f"/api/return/{borrowing['id']}")
+        assert response.status_code == 200
+        assert response.json()['borrowing']['returned'] is True
+        assert async_client.post(f"/api/return/{borrowing['id']}").status_code == 400
+        assert async_client.get(f'/api/books/{books[1].id}').json()['book']['available_copies'] == 1
+
+    def test_borrowing_limit(self, async_db, seeded):
+        """Test the borrowing limit is enforced"""
+        users, books = seeded
+        _, engine = async_db
+        with Session(engine) as session:
+            for book in (books[1], books[2], books[2]):
+                session.add(Borrowing(user_id=users[0].id, book_id=book.id,
+                                      due_date=datetime.now(timezone.utc) + timedelta(days=14)))
+            session.commit()
+
+        with _client(async_db) as client:
+            response = client.post('/api/borrow', json={'user_id': users[0].id, 'book_id': books[0].id})
+
+        assert response.status_code == 400
+        assert response.json()['error'].startswith('Borrowing limit reached')
+
+    def test_overdue_and_reserve(self, async_db, seeded, async_client):
+        """Test overdue listing and reservations"""
+        users, books = seeded
+        _, engine = async_db
+        with Session(engine) as session:
+            session.add(Borrowing(user_id=users[0].id, book_id=books[0].id,
+                                  borrowed_date=datetime.now(timezone.utc) - timedelta(days=20),
+                                  due_date=datetime.now(timezone.utc) - timedelta(days=6)))
+            session.commit()
+
+        overdue = async_client.get('/api/overdue').json()
+        assert overdue['count'] == 1
+        assert overdue['overdue_books'][0]['user']['student_id'] == 'STU001'
+
+        response = async_client.post('/api/reserve', json={'user_id': users[0].id, 'book_id': books[2].id})
+        assert response.status_code == 201
+        assert response.json()['reservation']['priority'] == 1
+        assert async_client.post('/api/reserve', json={'user_id': users[0].id, 'book_id': books[2].id}).status_code == 400
+        assert async_client.post('/api/reserve', json={}).status_code == 400
+
+    def test_statistics(self, async_client, seeded):
+        """Test system statistics"""
+        stats = async_client.get('/api/admin/stats').json()
+
+        assert stats['source'] == 'database'
+        assert stats['books'] == {'total': 3, 'available': 2, 'borrowed': 1}
+        assert stats['users'] == {'total': 2, 'students': 1, 'librarians': 1}
+
+    def test_statistics_counters(self, async_db, seeded):
+        """Test counters are initialized on first read and maintained by writes"""
+        users, books = seeded
+        with _client(async_db, STATS_COUNTERS_ENABLED=True) as client:
+            assert client.get('/api/admin/stats').json()['books']['borrowed'] == 1
+            client.post('/api/borrow', json={'user_id': users[0].id, 'book_id': books[0].id})
+            stats = client.get('/api/admin/stats').json()
+
+        assert stats['source'] == 'counters'
+        assert stats['books']['borrowed'] == 2
+        assert stats['borrowings'] == {'total': 1, 'active': 1, 'overdue': 0}
+
+        _, engine = async_db
+        with Session(engine) as session:
+            assert session.get(LibraryCounter, 'borrowings_active').value == 1
+
+
+class TestAsyncInstrumentation:
+    """Test the ASGI app reports metrics, timing and rejections like the Flask app"""
+
+    def test_route_metrics(self, async_client, seeded):
+        """Test requests are counted under the same route labels as app.py"""
+        _, books = seeded
+        route = 'method="GET",route="/api/books/<int:book_id>",status="200"'
+        before = _sample(async_client.get('/metrics').text, 'http_requests_total', route) or 0
+
+        async_client.get(f'/api/books/{books[0].id}')
+        async_client.get('/api/books/999999')
+        text = async_client.get('/metrics').text
+
+        assert _sample(text, 'http_requests_total', route) == before + 1
+        assert _sample(text, 'http_request_errors_total', 'route="/api/books/<int:book_id>",status="404"') >= 1
+
+    def test_server_timing(self, async_db, seeded, caplog):
+        """Test sampled requests get a Server-Timing header and a log line with their SQL count"""
+        logger = logging.getLogger('library.timing')
+        logger.addHandler(caplog.handler)
+        try:
+            with _client(async_db, REQUEST_TIMING_SAMPLE_RATE=1.0) as client:
+                response = client.get('/api/books')
+        finally:
+            logger.removeHandler(caplog.handler)
+
+        assert 'db;dur=' in response.headers['Server-Timing']
+        assert '2 queries' in response.headers['Server-Timing']  # count + page
+        entry = json.loads(caplog.records[-1].getMessage())
+        assert (entry['endpoint'], entry['status'], entry['sql_count']) == ('api.get_books', 200, 2)
+
+    def test_busy_worker_sheds_search_only(self, async_db, seeded):
+        """Test search is shed at half of LOAD_SHED_MAX_IN_FLIGHT while reads still pass"""
+        with _client(async_db, LOAD_SHED_MAX_IN_FLIGHT=1) as client:
+            search = client.get('/api/books/search?q=python')
+            listing = client.get('/api/books')
+            health = client.get('/api/health')
+
+        assert search.status_code == 503
+        assert search.json() == {'error': 'Server busy, please retry'}
+        assert search.headers['Retry-After'] == '1'
+        assert listing.status_code == 200
+        assert health.status_code == 200
+
+    @requires_redis
+    def test_burst_then_429(self, async_db, seeded):
+        """Test the search bucket is shared with the Flask app's settings and headers"""
+        headers = {'X-Real-IP': '203.0.113.21'}
+        with _client(async_db, RATE_LIMIT_ENABLED=True, RATE_LIMITS='search=1:2',
+                     RATE_LIMIT_CLIENT_HEADER='X-Real-IP') as client:
+            statuses = [client.get('/api/books/search?q=x', headers=headers).status_code for _ in range(3)]
+            other_client = client.get('/api/books/search?q=x', headers={'X-Real-IP': '203.0.113.22'})
+
+        assert statuses == [200, 200, 429]
+        assert other_client.status_code == 200
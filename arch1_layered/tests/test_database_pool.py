@@ -0,0 +1,85 @@
+import pytest
+import json
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from config import Config, build_engine_options
+from metrics import InstrumentedQueuePool, PoolMetrics, pool_metrics
+
+class TestDatabasePool:
+    """Test suite for connection pool configuration and metrics"""
+
+    def _config(self, uri, **overrides):
+        settings = {key: getattr(Config, key) for key in dir(Config) if key.startswith('DB_')}
+        settings.update(overrides, SQLALCHEMY_DATABASE_URI=uri)
+        return settings
+
+    def test_postgres_engine_options(self):
+        """Test pool settings and statement timeout are passed to the engine"""
+        options = build_engine_options(self._config(
+            'postgresql://admin:secret@db:5432/library',
+            DB_POOL_SIZE=20, DB_MAX_OVERFLOW=5, DB_POOL_TIMEOUT=3,
+            DB_POOL_RECYCLE=600, DB_POOL_PRE_PING=True, DB_STATEMENT_TIMEOUT_MS=5000
+        ))
+
+        assert options['poolclass'] is InstrumentedQueuePool
+        assert options['pool_size'] == 20
+        assert options['max_overflow'] == 5
+        assert options['pool_timeout'] == 3
+        assert options['pool_recycle'] == 600
+        assert options['pool_pre_ping'] is True
+        assert options['connect_args'] == {'options': '-c statement_timeout=5000'}
+
+    def test_statement_timeout_can_be_disabled(self):
+        """Test a zero statement timeout adds no connect arguments"""
+        options = build_engine_options(self._config(
+            'postgresql://admin:secret@db:5432/library', DB_STATEMENT_TIMEOUT_MS=0
+        ))
+
+        assert 'connect_args' not in options
+
+    def test_sqlite_keeps_default_pool(self):
+        """Test SQLite URLs are left to SQLAlchemy's SQLite pools"""
+        assert build_engine_options(self._config('sqlite:///:memory:')) == {}
+
+    def test_instrumented_pool_records_waits_and_timeouts(self, tmp_path):
+        """Test checkouts and pool timeouts are counted"""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+            pool_size=1, max_overflow=0, pool_timeout=0.05
+        )
+        before = pool_metrics.snapshot(engine)['checkout']
+
+        held = engine.connect()
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+        snapshot = pool_metrics.snapshot(engine)
+        assert snapshot['in_use'] == 1
+        assert snapshot['size'] == 1
+        assert snapshot['checkout']['checkouts'] == before['checkouts'] + 1
+        assert snapshot['checkout']['timeouts'] == before['timeouts'] + 1
+        assert snapshot['checkout']['wait_ms_max'] >= 50
+
+        held.close()
+        engine.dispose()
+
+    def test_pool_metrics_average(self):
+        """Test average wait is computed from successful checkouts"""
+        metrics = PoolMetrics()
+        metrics.record_wait(0.002)
+        metrics.record_wait(0.004)
+
+        engine = create_engine('sqlite:///:memory:')
+        snapshot = metrics.snapshot(engine)['checkout']
+
+        assert snapshot['checkouts'] == 2
+        assert snapshot['wait_ms_avg'] == pytest.approx(3.0)
+
+    def test_pool_metrics_endpoint(self, client, app_context):
+        """Test the admin endpoint reports pool state"""
+        response = client.get('/api/admin/metrics/pool')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert 'pool_class' in data
+        assert 'wait_ms_avg' in data['checkout']
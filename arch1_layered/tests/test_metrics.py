@@ -0,0 +1,128 @@
+import pytest
+import re
+import threading
+from metrics import MetricsRegistry, labels, hit_ratio, mark_process_dead, _write_snapshot
+
+def _sample(text, name, label_set=''):
+    """Value of one sample in Prometheus text output, or None"""
+    pattern = '^' + re.escape(f'{name}{{{label_set}}}' if label_set else name) + r' (\S+)$'
+    match = re.search(pattern, text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+class TestMetricsRegistry:
+    """Test suite for the lock-free metrics registry"""
+
+    def test_counters_and_gauges(self):
+        """Test counters accumulate and gauges go up and down"""
+        metrics = MetricsRegistry()
+        metrics.describe('jobs_total', 'counter', 'Jobs')
+        metrics.inc('jobs_total', labels(kind='a'))
+        metrics.inc('jobs_total', labels(kind='a'), 2)
+        metrics.gauge_add('busy', '', 3)
+        metrics.gauge_add('busy', '', -1)
+
+        text = metrics.render()
+        assert '# TYPE jobs_total counter' in text
+        assert _sample(text, 'jobs_total', 'kind="a"') == 3
+        assert _sample(text, 'busy') == 2
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram output follows the exposition format"""
+        metrics = MetricsRegistry(buckets=(0.1, 1.0))
+        metrics.describe('latency_seconds', 'histogram', 'Latency')
+        for value in (0.05, 0.5, 0.5, 3.0):
+            metrics.observe('latency_seconds', labels(route='/x'), value)
+
+        text = metrics.render()
+        assert _sample(text, 'latency_seconds_bucket', 'route="/x",le="0.1"') == 1
+        assert _sample(text, 'latency_seconds_bucket', 'route="/x",le="1"') == 3
+        assert _sample(text, 'latency_seconds_bucket', 'route="/x",le="+Inf"') == 4
+        assert _sample(text, 'latency_seconds_count', 'route="/x"') == 4
+        assert _sample(text, 'latency_seconds_sum', 'route="/x"') == pytest.approx(4.05)
+
+    def test_concurrent_increments_are_not_lost(self):
+        """Test per-thread shards add up exactly"""
+        metrics = MetricsRegistry()
+
+        def work():
+            for _ in range(10000):
+                metrics.inc('hits_total')
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert metrics.snapshot()['counters'][('hits_total', '')] == 80000
+
+    def test_label_values_are_escaped(self):
+        """Test quotes and backslashes in label values"""
+        assert labels(path='a"b\\c') == 'path="a\\"b\\\\c"'
+
+    def test_collectors_and_hit_ratio(self):
+        """Test collected samples and the derived cache hit ratio"""
+        metrics = MetricsRegistry()
+        metrics.add_collector('pool', lambda: [('gauge', 'pool_size', '', 5)])
+        metrics.add_derived('ratio', hit_ratio('cache_requests_total', 'cache_hit_ratio'))
+        for result in ('hit', 'hit', 'hit', 'miss'):
+            metrics.inc('cache_requests_total', labels(result=result))
+
+        text = metrics.render()
+        assert _sample(text, 'pool_size') == 5
+        assert _sample(text, 'cache_hit_ratio') == 0.75
+
+    def test_processes_share_a_directory(self, tmp_path):
+        """Test totals include other workers and survive their exit"""
+        metrics = MetricsRegistry(directory=str(tmp_path))
+        metrics.inc('requests_total', '', 2)
+        _write_snapshot(str(tmp_path / '99999.json'), {
+            'counters': {('requests_total', ''): 5},
+            'gauges': {('in_flight', ''): 1},
+            'histograms': {}
+        })
+
+        text = metrics.render()
+        assert _sample(text, 'requests_total') == 7
+        assert _sample(text, 'in_flight') == 1
+
+        mark_process_dead(str(tmp_path), 99999)
+        text = metrics.render()
+        assert _sample(text, 'requests_total') == 7
+        assert _sample(text, 'in_flight') is None
+        assert not (tmp_path / '99999.json').exists()
+
+class TestMetricsEndpoint:
+    """Test suite for GET /metrics on the Flask app"""
+
+    def test_route_metrics(self, client, sample_books):
+        """Test requests are counted by route template and status"""
+        route = 'method="GET",route="/api/books/<int:book_id>",status="200"'
+        before = _sample(client.get('/metrics').get_data(as_text=True), 'http_requests_total', route) or 0
+
+        client.get(f'/api/books/{sample_books[0].id}')
+        client.get(f'/api/books/{sample_books[1].id}')
+        text = client.get('/metrics').get_data(as_text=True)
+
+        assert _sample(text, 'http_requests_total', route) == before + 2
+        assert _sample(text, 'http_request_duration_seconds_count',
+                       'method="GET",route="/api/books/<int:book_id>"') >= 2
+        assert _sample(text, 'http_requests_in_flight') == 1  # the scrape itself
+
+    def test_errors_by_status(self, client):
+        """Test 4xx responses are counted as errors"""
+        before = _sample(client.get('/metrics').get_data(as_text=True), 'http_request_errors_total',
+                         'route="/api/books/<int:book_id>",status="404"') or 0
+
+        client.get('/api/books/999999')
+        text = client.get('/metrics').get_data(as_text=True)
+
+        assert _sample(text, 'http_request_errors_total', 'route="/api/books/<int:book_id>",status="404"') == before + 1
+
+    def test_pool_metrics_are_exported(self, client):
+        """Test connection pool counters are included"""
+        response = client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        assert 'db_pool_checkouts_total' in response.get_data(as_text=True)
@@ -0,0 +1,115 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+import migrations
+from models import db
+from services import CacheService, UserService, BookService, BorrowingService, ReservationService
+
+NEW_INDEXES = ('idx_borrowings_active_user_book', 'idx_borrowings_active_due_date',
+               'idx_reservations_book_status_priority')
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """Database with the schema as it was before migration 0001"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for name in NEW_INDEXES:
+            connection.execute(text(f'DROP INDEX {name}'))
+        connection.execute(text('CREATE INDEX ix_borrowings_returned ON borrowings (returned)'))
+    yield engine
+    engine.dispose()
+
+def _index_names(engine, table):
+    return {index['name'] for index in inspect(engine).get_indexes(table)}
+
+def _plan(statement, parameters):
+    """Query plan text for a captured statement"""
+    rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    return ' '.join(str(row[-1]) for row in rows)
+
+class TestMigrationRunner:
+    """Test suite for versioned schema migrations"""
+
+    def test_migrations_are_ordered(self):
+        """Test migration modules are discovered by version"""
+        versions = [migration.version for migration in migrations.discover()]
+
+        assert versions[0] == '0001'
+        assert versions == sorted(versions)
+
+    def test_upgrade_creates_indexes(self, legacy_engine):
+        """Test 0001 adds the composite/partial indexes and drops the boolean one"""
+        applied = migrations.migrate(legacy_engine)
+
+        assert [migration.version for migration in applied] == ['0001']
+        assert {'idx_borrowings_active_user_book', 'idx_borrowings_active_due_date'} <= _index_names(legacy_engine, 'borrowings')
+        assert 'ix_borrowings_returned' not in _index_names(legacy_engine, 'borrowings')
+        assert 'idx_reservations_book_status_priority' in _index_names(legacy_engine, 'reservations')
+        assert '0001' in migrations.applied_versions(legacy_engine)
+
+    def test_upgrade_is_recorded_once(self, legacy_engine):
+        """Test applied versions are skipped on the next run"""
+        migrations.migrate(legacy_engine)
+
+        assert migrations.migrate(legacy_engine) == []
+        assert migrations.pending(legacy_engine) == []
+
+    def test_rerun_after_partial_failure(self, legacy_engine):
+        """Test a non-transactional migration can be repeated over half-built indexes"""
+        with legacy_engine.begin() as connection:
+            connection.execute(text(
+                'CREATE INDEX idx_borrowings_active_user_book ON borrowings (user_id, book_id) WHERE returned = 0'
+            ))
+
+        migrations.migrate(legacy_engine)
+
+        assert set(NEW_INDEXES[:2]) <= _index_names(legacy_engine, 'borrowings')
+
+    def test_cli_status_and_migrate(self, test_app, legacy_engine, monkeypatch):
+        """Test `flask migrate --status` and `flask migrate`"""
+        monkeypatch.setitem(test_app.config, 'SQLALCHEMY_DATABASE_URI', str(legacy_engine.url))
+        runner = test_app.test_cli_runner()
+
+        assert '0001 hot_query_indexes: pending' in runner.invoke(args=['migrate', '--status']).output
+        assert 'Applied 0001 hot_query_indexes' in runner.invoke(args=['migrate']).output
+        assert 'pending' not in runner.invoke(args=['migrate', '--status']).output
+
+class TestHotQueryPlans:
+    """Test suite checking the hot queries are served by the new indexes"""
+
+    def test_borrowing_queries_use_partial_indexes(self, app_context, query_budget, sample_users, sample_books,
+                                                   overdue_borrowing):
+        """Test limit check, duplicate check, borrowed list and overdue list"""
+        cache = CacheService(app_context.config)
+        user_service = UserService(cache)
+        borrowing_service = BorrowingService(cache, user_service, BookService(cache))
+        user_id, book_id = sample_users[0].id, sample_books[0].id
+
+        with query_budget(10) as counter:
+            borrowing_service.borrow_book(user_id, book_id)
+            borrowing_service.get_user_borrowed_books(user_id)
+            borrowing_service.get_overdue_books()
+
+        plans = [_plan(statement, parameters) for statement, parameters in counter.statements
+                 if statement.startswith('SELECT') and 'borrowings.returned = 0' in statement]
+        limit_count, duplicate_check, borrowed_list, overdue_list = plans
+        assert 'idx_borrowings_active_user_book (user_id=? AND book_id=?)' in duplicate_check
+        assert 'idx_borrowings_active_due_date' in overdue_list
+        # SQLite may pick the plain user_id index for these on tiny tables; PostgreSQL
+        # picks the partial one. Either way neither may scan the table.
+        for plan in (limit_count, borrowed_list):
+            assert 'SEARCH borrowings USING' in plan and 'SCAN borrowings' not in plan, plan
+
+    def test_reservation_queue_uses_composite_index(self, app_context, query_budget, sample_users, sample_books):
+        """Test the duplicate check and MAX(priority) of the active queue"""
+        reservation_service = ReservationService(CacheService(app_context.config))
+        user_id, book_id = sample_users[0].id, sample_books[3].id
+
+        with query_budget(5) as counter:
+            reservation_service.create_reservation(user_id, book_id)
+
+        duplicate_check, next_priority = [(statement, parameters) for statement, parameters in counter.statements
+                                          if statement.startswith('SELECT') and 'reservations.status' in statement]
+        assert 'idx_reservations_book_status_priority' in _plan(*next_priority)
+        # The planner may prefer the user_id index here; a user has few reservations
+        assert 'SEARCH reservations USING' in _plan(*duplicate_check)
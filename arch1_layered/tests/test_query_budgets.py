@@ -0,0 +1,109 @@
+import pytest
+from models import db, User
+from services import CacheService, CounterService, UserService, BookService, BorrowingService
+
+class TestQueryBudgetFixture:
+    """Test suite for the query_budget fixture itself"""
+
+    def test_budget_exceeded(self, query_budget, sample_books):
+        """Test a block running more statements than its budget fails"""
+        with pytest.raises(pytest.fail.Exception, match='2 queries, budget is 1'):
+            with query_budget(1):
+                db.session.execute(db.select(User)).all()
+                db.session.execute(db.select(User).where(User.role == 'student')).all()
+
+    def test_per_row_queries_are_flagged(self, query_budget, sample_users, sample_borrowing):
+        """Test a lazy relationship queried once per row is reported as N+1"""
+        with pytest.raises(pytest.fail.Exception, match='Possible N\\+1'):
+            with query_budget(10):
+                for user in User.query.all():
+                    user.get_active_borrowings_count()
+
+    def test_identical_statements_are_not_n_plus_one(self, query_budget, sample_users):
+        """Test re-running the same statement with the same parameters is only counted"""
+        with query_budget(2) as counter:
+            for _ in range(2):
+                db.session.execute(db.select(User).where(User.role == 'student')).all()
+
+        assert counter.count == 2
+
+class TestRouteQueryBudgets:
+    """Test suite pinning the number of SQL statements per route"""
+
+    def test_borrow(self, client, query_budget, sample_users, sample_books):
+        """Test borrowing: user, book, limit, duplicate check, update, insert, reload"""
+        user_id, book_id = sample_users[0].id, sample_books[0].id
+
+        with query_budget(7):
+            response = client.post('/api/borrow', json={'user_id': user_id, 'book_id': book_id})
+
+        assert response.status_code == 200
+
+    def test_borrow_with_counters(self, app_context, query_budget, sample_users, sample_books):
+        """Test all counter deltas of a borrow go out as one UPDATE"""
+        cache = CacheService(app_context.config)
+        counters = CounterService({'STATS_COUNTERS_ENABLED': True})
+        borrowing_service = BorrowingService(cache, UserService(cache, counters), BookService(cache), counters)
+        user_id, book_id = sample_users[0].id, sample_books[0].id
+
+        with query_budget(7) as counter:
+            success, _, _ = borrowing_service.borrow_book(user_id, book_id)
+
+        assert success
+        assert sum('library_counters' in statement for statement, _ in counter.statements) == 1
+
+    def test_return(self, client, query_budget, overdue_borrowing):
+        """Test returning an overdue loan"""
+        borrowing_id = overdue_borrowing.id
+
+        with query_budget(5):
+            response = client.post(f'/api/return/{borrowing_id}')
+
+        assert response.status_code == 200
+        assert response.get_json()['borrowing']['fine_amount'] > 0
+
+    @pytest.mark.parametrize('query_string, count', [('', 4), ('?page=2&limit=2', 2), ('?category=Programming', 1)])
+    def test_book_listing(self, client, query_budget, sample_books, query_string, count):
+        """Test a page of books costs one page query and one count"""
+        with query_budget(2):
+            response = client.get(f'/api/books{query_string}')
+
+        assert response.status_code == 200
+        assert len(response.get_json()['books']) == count
+
+    def test_search(self, client, query_budget, sample_books):
+        """Test search is a single statement"""
+        with query_budget(1):
+            response = client.get('/api/books/search?q=python')
+
+        assert response.get_json()['count'] == 1
+
+    def test_popular(self, client, query_budget, sample_borrowing, overdue_borrowing):
+        """Test popular books is a single statement"""
+        with query_budget(1):
+            response = client.get('/api/books/popular?limit=3')
+
+        assert len(response.get_json()['popular_books']) == 2
+
+    def test_user_borrowed_books(self, client, query_budget, sample_borrowing, overdue_borrowing):
+        """Test borrowed books are joined to their books, not loaded per loan"""
+        user_id = sample_borrowing.user_id
+
+        with query_budget(1):
+            response = client.get(f'/api/users/{user_id}/borrowed')
+
+        assert response.get_json()['count'] == 1
+
+    def test_overdue(self, client, query_budget, overdue_borrowing):
+        """Test overdue loans are joined to their books and users"""
+        with query_budget(1):
+            response = client.get('/api/overdue')
+
+        assert response.get_json()['count'] == 1
+
+    def test_statistics(self, client, query_budget, sample_users, sample_books, overdue_borrowing):
+        """Test statistics come from a single aggregate query"""
+        with query_budget(1):
+            response = client.get('/api/admin/stats')
+
+        assert response.get_json()['borrowings']['overdue'] == 1
@@ -0,0 +1,125 @@
+import pytest
+import time
+import redis
+from app import create_app
+from config import DevelopmentConfig
+from models import db
+from rate_limit import LoadShedder, RateLimiter, parse_limits, route_class
+
+def _redis_available():
+    try:
+        return redis.Redis(host='localhost', port=6379, socket_connect_timeout=0.2).ping()
+    except redis.RedisError:
+        return False
+
+requires_redis = pytest.mark.skipif(not _redis_available(), reason='Redis is not running on localhost:6379')
+
+@pytest.fixture
+def limited_app(tmp_path, monkeypatch):
+    """Application with a small search bucket and load shedding at 2 in-flight requests"""
+    monkeypatch.setattr(DevelopmentConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'limited.db'}")
+    monkeypatch.setattr(DevelopmentConfig, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setattr(DevelopmentConfig, 'RATE_LIMITS', 'search=1:2,read=100:100')
+    monkeypatch.setattr(DevelopmentConfig, 'LOAD_SHED_MAX_IN_FLIGHT', 2)
+
+    app = create_app('development')
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+class TestRateLimitConfig:
+    """Test suite for limit parsing and route classification"""
+
+    def test_parse_limits(self):
+        """Test rate:burst pairs per route class"""
+        assert parse_limits('read=20:60, search=2.5:10,write=5') == {
+            'read': (20.0, 60), 'search': (2.5, 10), 'write': (5.0, 5)
+        }
+        assert parse_limits('') == {}
+
+    def test_route_classes(self):
+        """Test expensive, write and exempt endpoints"""
+        assert route_class('api.search_books') == 'search'
+        assert route_class('api.borrow_book') == 'write'
+        assert route_class('api.get_pool_metrics') == 'admin'
+        assert route_class('api.reset_slow_queries') == 'admin'
+        assert route_class('api.get_books') == 'read'
+        assert route_class('api.health_check') is None
+        assert route_class('prometheus_metrics') is None
+        assert route_class(None) is None  # 404s
+
+class TestLoadShedding:
+    """Test suite for in-flight load shedding"""
+
+    def test_expensive_classes_are_shed_first(self):
+        """Test search/admin go at half the limit, reads and writes at the limit"""
+        shedder = LoadShedder(max_in_flight=10)
+
+        assert not shedder.should_shed('search', 5)
+        assert shedder.should_shed('search', 6)
+        assert shedder.should_shed('admin', 6)
+        assert not shedder.should_shed('read', 10)
+        assert shedder.should_shed('read', 11)
+
+    def test_busy_worker_sheds_search_only(self, limited_app):
+        """Test a 503 with Retry-After for search while cheap reads still pass"""
+        shedder = limited_app.extensions['load_shedder']
+        client = limited_app.test_client()
+        shedder.in_flight = 1  # another request is running
+
+        search = client.get('/api/books/search?q=python')
+        listing = client.get('/api/books')
+
+        assert search.status_code == 503
+        assert search.headers['Retry-After'] == '1'
+        assert listing.status_code == 200
+        assert shedder.in_flight == 1  # both requests left again
+
+class TestTokenBucket:
+    """Test suite for the Redis token bucket"""
+
+    @requires_redis
+    def test_burst_then_429(self, limited_app):
+        """Test a client gets its burst, then 429 with Retry-After, per client address"""
+        client = limited_app.test_client()
+        headers = {'X-Real-IP': '203.0.113.7'}
+
+        statuses = [client.get('/api/books/search?q=x', headers=headers).status_code for _ in range(3)]
+        limited = client.get('/api/books/search?q=x', headers=headers)
+        other_client = client.get('/api/books/search?q=x', headers={'X-Real-IP': '203.0.113.8'})
+
+        assert statuses == [200, 200, 429]
+        assert limited.status_code == 429
+        assert limited.get_json() == {'error': 'Too many requests'}
+        assert limited.headers['Retry-After'] == '1'
+        assert other_client.status_code == 200
+
+    @requires_redis
+    def test_route_classes_have_separate_buckets(self, limited_app):
+        """Test exhausting search does not block cheap reads"""
+        client = limited_app.test_client()
+        for _ in range(3):
+            client.get('/api/books/search?q=x')
+
+        assert client.get('/api/books').status_code == 200
+
+    @requires_redis
+    def test_tokens_refill(self):
+        """Test the bucket refills at its rate"""
+        limiter = RateLimiter(redis.Redis(), {'search': (1000.0, 1)}, key_prefix='test-refill')
+        limiter.allow('search', 'client')
+        allowed, retry_after = limiter.allow('search', 'client')
+
+        assert not allowed and 0 < retry_after <= 0.001
+        time.sleep(0.01)
+        assert limiter.allow('search', 'client') == (True, 0.0)
+
+    def test_fails_open_without_redis(self):
+        """Test requests are allowed when Redis cannot be reached"""
+        limiter = RateLimiter(redis.Redis(port=1, socket_connect_timeout=0.05), {'search': (1.0, 1)})
+
+        assert limiter.allow('search', 'client') == (True, 0.0)
+        assert limiter.allow('search', 'client') == (True, 0.0)  # skipped without retrying Redis
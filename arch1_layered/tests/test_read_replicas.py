@@ -0,0 +1,136 @@
+import pytest
+import json
+from datetime import datetime, timezone
+from sqlalchemy import insert, select, func
+from app import create_app
+from config import DevelopmentConfig
+from models import db, User, Book, LibraryCounter
+from routing import ReplicaRouter
+from services import CounterService
+
+@pytest.fixture(autouse=True)
+def forget_replica_metadata():
+    """init_app registers an (empty) metadata per bind on the shared db object;
+    drop it again so the session-wide test app does not look for replica engines"""
+    yield
+    db.metadatas.pop('replica_0', None)
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    """Application with a SQLite 'primary' and a separate SQLite 'replica'"""
+    primary_url = f"sqlite:///{tmp_path / 'primary.db'}"
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    monkeypatch.setattr(DevelopmentConfig, 'SQLALCHEMY_DATABASE_URI', primary_url)
+    monkeypatch.setattr(DevelopmentConfig, 'DATABASE_REPLICA_URLS', [replica_url])
+
+    app = create_app('development')
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all(bind_key=None)
+        db.metadata.create_all(db.engines['replica_0'])
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+@pytest.fixture
+def counters_enabled(monkeypatch):
+    monkeypatch.setattr(DevelopmentConfig, 'STATS_COUNTERS_ENABLED', True)
+
+def _insert_book(engine, isbn):
+    now = datetime.now(timezone.utc)
+    with engine.begin() as connection:
+        connection.execute(insert(Book.__table__).values(
+            title=f'Book {isbn}', author='Author', isbn=isbn, category='Test',
+            total_copies=1, available_copies=1, created_at=now, updated_at=now
+        ))
+
+class TestReadReplicas:
+    """Test suite for read-replica routing"""
+
+    def test_read_only_methods_use_replica(self, replica_app):
+        """Test catalog reads are served by the replica"""
+        _insert_book(db.engines['replica_0'], 'replica-only')
+
+        response = replica_app.test_client().get('/api/books')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [book['isbn'] for book in data['books']] == ['replica-only']
+
+    def test_writes_and_their_reads_use_primary(self, replica_app):
+        """Test borrowing reads and writes the primary even though the replica is empty"""
+        user = User(student_id='STU900', name='Primary User', email='primary@university.edu')
+        db.session.add(user)
+        db.session.commit()
+        _insert_book(db.engines[None], 'primary-only')
+        book_id = db.session.execute(select(Book.id)).scalar()
+
+        response = replica_app.test_client().post('/api/borrow', json={'user_id': user.id, 'book_id': book_id})
+
+        assert response.status_code == 200
+        borrowed = replica_app.test_client().get(f'/api/users/{user.id}/borrowed')
+        assert json.loads(borrowed.data)['count'] == 1
+        with db.engines['replica_0'].connect() as connection:
+            assert connection.execute(select(func.count()).select_from(Book.__table__)).scalar() == 0
+
+    @pytest.mark.usefixtures('counters_enabled')
+    def test_counters_are_rebuilt_from_primary(self, replica_app):
+        """Test a counters rebuild reads the primary, not a lagging replica, and writes only the primary"""
+        _insert_book(db.engine, 'primary-1')
+        for n in range(3):
+            _insert_book(db.engines['replica_0'], f'replica-{n}')
+
+        data = json.loads(replica_app.test_client().get('/api/admin/stats').data)
+
+        assert (data['source'], data['books']['total']) == ('counters', 1)
+        with db.engine.connect() as connection:
+            assert connection.scalar(select(LibraryCounter.value).where(LibraryCounter.name == 'books_total')) == 1
+        with db.engines['replica_0'].connect() as connection:
+            assert connection.scalar(select(func.count()).select_from(LibraryCounter)) == 0
+
+    @pytest.mark.usefixtures('counters_enabled')
+    def test_counters_missing_on_replica_are_not_rebuilt(self, replica_app):
+        """Test existing primary counters are served even when the replica has none yet"""
+        CounterService({'STATS_COUNTERS_ENABLED': True}).rebuild({'books_total': 7})
+        # A session that has written sticks to the primary; the request must start afresh
+        db.session.remove()
+
+        data = json.loads(replica_app.test_client().get('/api/admin/stats').data)
+
+        assert data['books']['total'] == 7
+        with db.engine.connect() as connection:
+            assert connection.scalar(select(LibraryCounter.value).where(LibraryCounter.name == 'books_total')) == 7
+
+    def test_unreachable_replica_is_ejected(self, tmp_path, monkeypatch):
+        """Test a replica that refuses connections falls out of rotation"""
+        monkeypatch.setattr(DevelopmentConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'primary.db'}")
+        monkeypatch.setattr(DevelopmentConfig, 'DATABASE_REPLICA_URLS', [f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+        app = create_app('development')
+        with app.app_context():
+            db.create_all(bind_key=None)
+            client = app.test_client()
+
+            client.get('/api/books/popular')
+            assert app.extensions['replica_router'].status() == {'replica_0': 'ejected'}
+
+            response = client.get('/api/books')
+            assert response.status_code == 200
+            assert 'error' not in json.loads(response.data)
+            db.session.remove()
+
+    def test_router_round_robin_skips_ejected(self):
+        """Test the router cycles through healthy replicas only"""
+        router = ReplicaRouter(['replica_0', 'replica_1'])
+
+        assert [router.choose() for _ in range(4)] == ['replica_0', 'replica_1', 'replica_0', 'replica_1']
+
+        router.eject('replica_0')
+        assert [router.choose() for _ in range(2)] == ['replica_1', 'replica_1']
+
+        router.eject('replica_1')
+        assert router.choose() is None
+
+    def test_no_router_without_replicas(self, test_app):
+        """Test the default configuration keeps every query on the primary"""
+        assert 'replica_router' not in test_app.extensions
@@ -0,0 +1,86 @@
+import pytest
+import json
+import logging
+from app import create_app
+from config import DevelopmentConfig
+from models import db, Book
+from timing import RequestTimer
+
+@pytest.fixture
+def timed_app(tmp_path, monkeypatch):
+    """Application that samples every request"""
+    monkeypatch.setattr(DevelopmentConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'timing.db'}")
+    monkeypatch.setattr(DevelopmentConfig, 'REQUEST_TIMING_SAMPLE_RATE', 1.0)
+
+    app = create_app('development')
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        db.session.add(Book(title='Timed Book', author='Author', isbn='978-1', category='Test',
+                            total_copies=1, available_copies=1))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+def _timing(header):
+    """Parse a Server-Timing header into {metric: (duration, description)}"""
+    metrics = {}
+    for entry in header.split(', '):
+        name, *params = entry.split(';')
+        values = dict(param.split('=', 1) for param in params)
+        metrics[name] = (float(values['dur']), values.get('desc', '').strip('"'))
+    return metrics
+
+class TestRequestTiming:
+    """Test suite for per-request Server-Timing instrumentation"""
+
+    def test_server_timing_header(self, timed_app):
+        """Test SQL statements and cache calls are counted for a request"""
+        response = timed_app.test_client().get('/api/books')
+        metrics = _timing(response.headers['Server-Timing'])
+
+        assert set(metrics) == {'db', 'cache', 'app', 'total'}
+        assert metrics['db'][1] == '2 queries'  # count + page
+        assert metrics['cache'][1] == '2 calls'  # get + set
+        assert metrics['total'][0] >= metrics['db'][0]
+
+    def test_structured_log_line(self, timed_app, caplog):
+        """Test a JSON log line is written for sampled requests"""
+        logger = logging.getLogger('library.timing')
+        logger.addHandler(caplog.handler)
+        try:
+            timed_app.test_client().get('/api/health')
+        finally:
+            logger.removeHandler(caplog.handler)
+
+        entry = json.loads(caplog.records[-1].getMessage())
+        assert entry['event'] == 'request_timing'
+        assert entry['path'] == '/api/health'
+        assert entry['status'] == 200
+        assert entry['sql_count'] == 0
+        assert entry['cache_calls'] == 0
+
+    def test_requests_are_timed_independently(self, timed_app):
+        """Test counters start from zero on every request"""
+        client = timed_app.test_client()
+        client.get('/api/books')
+        metrics = _timing(client.get('/api/health').headers['Server-Timing'])
+
+        assert metrics['db'][1] == '0 queries'
+
+    def test_unsampled_requests_have_no_header(self, client):
+        """Test the default app only times a sample of requests"""
+        headers = [client.get('/api/health').headers.get('Server-Timing') for _ in range(50)]
+
+        assert None in headers
+
+    def test_server_timing_format(self):
+        """Test app time is what remains after SQL and cache time"""
+        timer = RequestTimer()
+        timer.sql_count, timer.sql_seconds = 3, 0.010
+        timer.cache_calls, timer.cache_seconds = 1, 0.002
+
+        assert timer.server_timing(0.020) == (
+            'db;dur=10.00;desc="3 queries", cache;dur=2.00;desc="1 calls", app;dur=8.00, total;dur=20.00'
+        )
@@ -1,10 +1,10 @@
 import pytest
 from datetime import datetime, timedelta, timezone
 from services import (
-    CacheService, UserService, BookService,
+    CacheService, CounterService, UserService, BookService,
     BorrowingService, ReservationService, StatisticsService
 )
-from models import User, Book, Borrowing, Reservation, db
+from models import User, Book, Borrowing, Reservation, LibraryCounter, db
 from config import Config
 
 class TestCacheService:
@@ -304,6 +304,38 @@ class TestBorrowingService:
         assert success == True
         assert borrowing.fine_amount > 0
 
+    def test_borrow_error_rules(self, app_context):
+        """Test the borrow checks shared with the async app, in the order they are reported"""
+        user = User(student_id='S1', name='Reader', email='reader@example.com')
+        book = Book(title='Dune', author='Herbert', isbn='9780441013593', total_copies=1, available_copies=1)
+        limit = Config.MAX_BORROWING_LIMIT
+
+        assert BorrowingService.borrow_error(None, book) == "User not found"
+        assert BorrowingService.borrow_error(user, None) == "Book not found"
+        assert BorrowingService.borrow_error(user, book, limit, existing_borrowing=Borrowing()).startswith("Borrowing limit")
+        assert BorrowingService.borrow_error(user, book, limit - 1, Borrowing()) == "You already have this book borrowed"
+        assert BorrowingService.borrow_error(user, book, limit - 1) is None
+
+        book.available_copies = 0
+        assert BorrowingService.borrow_error(user, book, limit) == "Book is not available"
+
+    def test_lend_and_take_back_counter_deltas(self, app_context):
+        """Test lending the last copy and returning it overdue, without touching the database"""
+        book = Book(id=1, title='Dune', author='Herbert', isbn='9780441013593', total_copies=1, available_copies=1)
+
+        borrowing, deltas = BorrowingService.lend(7, book, loan_days=14)
+        assert book.available_copies == 0
+        assert (borrowing.user_id, borrowing.book_id) == (7, 1)
+        assert deltas == {'borrowings_total': 1, 'borrowings_active': 1, 'books_available': -1, 'books_borrowed': 1}
+
+        borrowing.returned = False
+        borrowing.due_date = datetime.now(timezone.utc) - timedelta(days=3, hours=1)
+        deltas = BorrowingService.take_back(borrowing, book)
+        assert borrowing.returned and borrowing.returned_date is not None
+        assert borrowing.fine_amount == 3 * BorrowingService.FINE_PER_DAY
+        assert book.available_copies == 1
+        assert deltas == {'borrowings_active': -1, 'books_available': 1, 'books_borrowed': -1}
+
     def test_get_user_borrowed_books(self, app_context, sample_borrowing, sample_users):
         """Test getting user's borrowed books"""
         cache = CacheService(app_context.config)
@@ -436,3 +468,96 @@ class TestStatisticsService:
         stats = stats_service.get_system_statistics()
 
         assert stats['borrowings']['overdue'] >= 1
+
+
+class TestStatisticsCounters:
+    """Test suite for incrementally maintained statistics counters"""
+
+    def _services(self, app_context):
+        cache = CacheService(app_context.config)
+        counters = CounterService({'STATS_COUNTERS_ENABLED': True})
+        user_service = UserService(cache, counters)
+        book_service = BookService(cache)
+        borrowing_service = BorrowingService(cache, user_service, book_service, counters)
+        reservation_service = ReservationService(cache, counters)
+        stats_service = StatisticsService(cache, counters)
+        return user_service, borrowing_service, reservation_service, stats_service
+
+    def test_counters_initialized_from_tables(self, app_context, sample_users, sample_books):
+        """Test counters are built from the base tables on first read"""
+        _, _, _, stats_service = self._services(app_context)
+
+        stats = stats_service.get_system_statistics()
+
+        assert stats['source'] == 'counters'
+        assert stats['books']['total'] == 5
+        assert stats['books']['available'] == 4
+        assert stats['users']['students'] == 3
+        assert db.session.query(LibraryCounter).count() == len(CounterService.COUNTER_NAMES)
+
+    def test_counters_follow_transactions(self, app_context, sample_users, sample_books):
+        """Test register/borrow/return/reserve keep counters equal to live counts"""
+        user_service, borrowing_service, reservation_service, stats_service = self._services(app_context)
+        stats_service.rebuild_counters()
+
+        user_service.create_user("STU010", "New Student", "new@university.edu")
+        # Single-copy book goes unavailable on borrow and available again on return
+        single = Book(title="Single Copy", author="A. Writer", isbn="978-1111111111",
+                      total_copies=1, available_copies=1)
+        db.session.add(single)
+        db.session.commit()
+        stats_service.rebuild_counters()
+
+        _, _, borrowing = borrowing_service.borrow_book(sample_users[0].id, single.id)
+        borrowing_service.borrow_book(sample_users[1].id, sample_books[0].id)
+        reservation_service.create_reservation(sample_users[2].id, sample_books[3].id)
+
+        stats = stats_service.get_system_statistics()
+        assert stats['users']['total'] == 5
+        assert stats['borrowings']['active'] == 2
+        assert stats['books']['available'] == 4
+        assert stats['books']['borrowed'] == 3
+        assert stats['reservations']['active'] == 1
+
+        borrowing_service.return_book(borrowing.id)
+
+        stats = stats_service.get_system_statistics()
+        live = stats_service._count_all()
+        assert stats['borrowings']['active'] == live['borrowings_active'] == 1
+        assert stats['books']['available'] == live['books_available'] == 5
+        assert stats['books']['borrowed'] == live['books_borrowed'] == 2
+
+    def test_counters_rebuild_overwrites_existing_rows(self, app_context, sample_users, sample_books):
+        """Test a rebuild over existing (or stale) counters upserts instead of failing"""
+        _, _, _, stats_service = self._services(app_context)
+        stats_service.counters.rebuild({'books_total': 99, 'users_total': 99})
+
+        counts = stats_service.rebuild_counters()
+        stats_service.rebuild_counters()
+
+        stored = dict(db.session.query(LibraryCounter.name, LibraryCounter.value).all())
+        assert stored['books_total'] == counts['books_total'] == 5
+        assert stored['users_total'] == counts['users_total'] == 4
+        assert len(stored) == len(CounterService.COUNTER_NAMES)
+
+    def test_counters_disabled_by_default(self, app_context, sample_users):
+        """Test services do not touch the counters table unless enabled"""
+        cache = CacheService(app_context.config)
+        user_service = UserService(cache)
+
+        user_service.create_user("STU011", "Other Student", "other@university.edu")
+
+        assert db.session.query(LibraryCounter).count() == 0
+
+    def test_single_query_statistics(self, app_context, sample_users, sample_books, overdue_borrowing):
+        """Test the aggregate query matches the individual counts"""
+        cache = CacheService(app_context.config)
+        stats_service = StatisticsService(cache)
+
+        counts = stats_service._count_all()
+
+        assert counts['books_total'] == Book.query.count()
+        assert counts['users_librarians'] == 1
+        assert counts['borrowings_active'] == 1
+        assert counts['borrowings_overdue'] == 1
+        assert counts['reservations_active'] == 0
@@ -0,0 +1,83 @@
+import pytest
+from app import create_app
+from config import DevelopmentConfig
+from models import db, Book
+from slow_queries import SlowQueryLog, normalize_statement, fingerprint
+
+@pytest.fixture
+def slow_app(tmp_path, monkeypatch):
+    """Application that treats every statement as slow"""
+    monkeypatch.setattr(DevelopmentConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'slow.db'}")
+    monkeypatch.setattr(DevelopmentConfig, 'SLOW_QUERY_THRESHOLD_MS', 0.000001)
+    monkeypatch.setattr(DevelopmentConfig, 'SLOW_QUERY_EXPLAIN', True)
+
+    app = create_app('development')
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        db.session.add(Book(title='Slow Book', author='Author', isbn='978-1', category='Test',
+                            total_copies=1, available_copies=1))
+        db.session.commit()
+        app.extensions['slow_query_log'].reset()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+class TestStatementNormalization:
+    """Test suite for slow-query fingerprints"""
+
+    def test_parameters_and_literals_are_replaced(self):
+        """Test statements differing only in values share a shape"""
+        first = normalize_statement("SELECT * FROM books WHERE id = %(id_1)s AND title = 'a' LIMIT 10")
+        second = normalize_statement("SELECT *  FROM books\n WHERE id = %(id_1)s AND title = 'b''c' LIMIT 20")
+
+        assert first == "SELECT * FROM books WHERE id = ? AND title = ? LIMIT ?"
+        assert fingerprint(first) == fingerprint(second)
+
+    def test_identifiers_and_casts_are_kept(self):
+        """Test numbered aliases and PostgreSQL casts survive normalization"""
+        assert normalize_statement("SELECT anon_1.books_total FROM t WHERE x > $1::INTEGER") == \
+            "SELECT anon_1.books_total FROM t WHERE x > ?::INTEGER"
+
+    def test_in_lists_collapse(self):
+        """Test IN lists of any length share a fingerprint"""
+        assert normalize_statement("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == "SELECT ? FROM t WHERE id IN (...)"
+        assert normalize_statement("SELECT 1 FROM t WHERE id IN (?)") == "SELECT ? FROM t WHERE id IN (...)"
+
+class TestSlowQueryLog:
+    """Test suite for slow statement collection"""
+
+    def test_keeps_slowest_fingerprints(self):
+        """Test top-N ordering, aggregation and eviction"""
+        slow_query_log = SlowQueryLog(threshold_ms=1, top_n=2)
+        for index in range(20):
+            slow_query_log.record(f'SELECT * FROM t{index}', (), duration=index / 1000)
+        slow_query_log.record('SELECT * FROM t19', (), duration=0.001)
+
+        top = slow_query_log.top()
+        assert [entry['statement'] for entry in top] == ['SELECT * FROM t19', 'SELECT * FROM t18']
+        assert top[0]['count'] == 2
+        assert top[0]['max_ms'] == 19.0
+        assert top[0]['avg_ms'] == 10.0
+        assert len(slow_query_log._entries) <= slow_query_log.capacity
+
+    def test_service_method_and_endpoint(self, slow_app):
+        """Test statements are attributed to the calling service method"""
+        client = slow_app.test_client()
+        client.get('/api/books/search?q=slow')
+
+        data = client.get('/api/admin/slow-queries').get_json()
+        search = [entry for entry in data['queries'] if entry['service'] == 'BookService.search_books']
+        assert len(search) == 1
+        assert 'lower(books.title) LIKE lower(?)' in search[0]['statement']
+        assert '%slow%' in search[0]['last_parameters']
+        assert search[0]['explain'] is None  # EXPLAIN is PostgreSQL only
+
+        assert client.delete('/api/admin/slow-queries').status_code == 200
+        assert client.get('/api/admin/slow-queries').get_json()['queries'] == []
+
+    def test_endpoint_when_disabled(self, client, monkeypatch):
+        """Test the endpoint reports a disabled log"""
+        monkeypatch.delitem(client.application.extensions, 'slow_query_log', raising=False)
+
+        assert client.get('/api/admin/slow-queries').status_code == 404
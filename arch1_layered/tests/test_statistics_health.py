@@ -1,7 +1,8 @@
 import pytest
 import json
 from datetime import datetime, timedelta, timezone
-from models import Borrowing, Reservation, db
+from models import Borrowing, Reservation, DailyStat, db
+from services import CacheService
 
 class TestStatisticsAndHealth:
     """Test suite for Statistics and Health Check endpoints"""
@@ -280,3 +281,98 @@ class TestStatisticsAndHealth:
         assert data['users']['total'] > 0
         assert data['borrowings']['total'] > 0
         assert data['reservations']['active'] > 0
+
+
+class TestStatisticsTimeseries:
+    """Test suite for daily rollups and the timeseries endpoint"""
+
+    def _add_history(self, sample_users, sample_books):
+        """Two loans borrowed three days ago, one returned late yesterday"""
+        three_days_ago = datetime.now(timezone.utc) - timedelta(days=3)
+        yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+        db.session.add(Borrowing(
+            user_id=sample_users[0].id, book_id=sample_books[0].id,
+            borrowed_date=three_days_ago, due_date=three_days_ago + timedelta(days=14)
+        ))
+        db.session.add(Borrowing(
+            user_id=sample_users[1].id, book_id=sample_books[1].id,
+            borrowed_date=three_days_ago, due_date=three_days_ago + timedelta(hours=1),
+            returned=True, returned_date=yesterday, fine_amount=2.0
+        ))
+        db.session.commit()
+        return three_days_ago.date(), yesterday.date()
+
+    def test_rollup_cli_builds_daily_rows(self, test_app, app_context, sample_users, sample_books):
+        """Test the rollup command writes one row per day through yesterday"""
+        borrowed_day, returned_day = self._add_history(sample_users, sample_books)
+
+        result = test_app.test_cli_runner().invoke(args=['rollup-stats'])
+
+        assert result.exit_code == 0
+        rows = {row.day: row for row in DailyStat.query.all()}
+        assert rows[borrowed_day].borrows == 2
+        assert rows[borrowed_day].overdue == 1
+        assert rows[returned_day].returns == 1
+        assert rows[returned_day].fines == 2.0
+        assert rows[returned_day].overdue == 0
+
+    def test_rollup_is_idempotent(self, test_app, app_context, sample_users, sample_books):
+        """Test re-running the rollup over the same days does not double count"""
+        borrowed_day, _ = self._add_history(sample_users, sample_books)
+        runner = test_app.test_cli_runner()
+
+        runner.invoke(args=['rollup-stats'])
+        count = DailyStat.query.count()
+        result = runner.invoke(args=['rollup-stats', '--since', borrowed_day.isoformat()])
+
+        assert result.exit_code == 0
+        assert DailyStat.query.count() == count
+        assert db.session.get(DailyStat, borrowed_day).borrows == 2
+
+    def test_timeseries_endpoint(self, client, test_app, app_context, sample_users, sample_books):
+        """Test the timeseries endpoint returns rolled-up buckets"""
+        borrowed_day, returned_day = self._add_history(sample_users, sample_books)
+        test_app.test_cli_runner().invoke(args=['rollup-stats'])
+
+        response = client.get(
+            f'/api/admin/stats/timeseries?from={borrowed_day.isoformat()}&to={returned_day.isoformat()}'
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['granularity'] == 'day'
+        assert data['series'][0]['period'] == borrowed_day.isoformat()
+        assert sum(point['borrows'] for point in data['series']) == 2
+        assert sum(point['returns'] for point in data['series']) == 1
+
+    def test_timeseries_month_granularity(self, client, test_app, app_context, sample_users, sample_books):
+        """Test monthly buckets sum the daily rows"""
+        borrowed_day, returned_day = self._add_history(sample_users, sample_books)
+        test_app.test_cli_runner().invoke(args=['rollup-stats'])
+
+        response = client.get(
+            f'/api/admin/stats/timeseries?from={borrowed_day.isoformat()}'
+            f'&to={returned_day.isoformat()}&granularity=month'
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['series'][0]['period'] == borrowed_day.replace(day=1).isoformat()
+        assert sum(point['borrows'] for point in data['series']) == 2
+
+    def test_timeseries_invalid_parameters(self, client, app_context):
+        """Test invalid dates and granularity are rejected"""
+        assert client.get('/api/admin/stats/timeseries?from=yesterday').status_code == 400
+        assert client.get('/api/admin/stats/timeseries?granularity=hour').status_code == 400
+        assert client.get('/api/admin/stats/timeseries?from=2025-02-01&to=2025-01-01').status_code == 400
+
+    def test_timeseries_server_error(self, client, app_context, monkeypatch):
+        """Test a cache or database failure is reported as 500, not as a bad request"""
+        def broken_get(self, key):
+            raise ConnectionError('cache unavailable')
+        monkeypatch.setattr(CacheService, 'get', broken_get)
+
+        response = client.get('/api/admin/stats/timeseries?from=2025-01-01&to=2025-01-31')
+
+        assert response.status_code == 500
+        assert 'cache unavailable' in json.loads(response.data)['error']
@@ -159,3 +159,74 @@ class TestUserManagement:
         data = json.loads(response.data)
         assert 'created_at' in data['user']
         assert data['user']['created_at'] is not None
+
+    def test_import_users_csv(self, client, app_context, sample_users):
+        """Test bulk import creates new users and skips duplicates and existing users"""
+        body = (
+            "student_id,name,email,role\n"
+            "STU100,New One,new1@university.edu,student\n"
+            "STU101,New Two,new2@university.edu,librarian\n"
+            "STU100,Duplicate Row,dup@university.edu,student\n"
+            "STU001,Existing User,existing@university.edu,student\n"
+            "STU102,,missing-name@university.edu,student\n"
+        )
+        response = client.post('/api/users/import?batch_size=2', data=body, content_type='text/csv')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['created'] == 2
+        assert data['skipped'] == 2
+        assert data['errors'] == 1
+        assert data['error_details'][0]['line'] == 5
+        assert User.query.filter_by(student_id='STU101').first().role == 'librarian'
+
+    def test_import_users_ndjson(self, client, app_context):
+        """Test bulk import accepts newline-delimited JSON"""
+        body = (
+            '{"student_id": "STU200", "name": "Json User", "email": "json@university.edu"}\n'
+            'not json\n'
+            '{"student_id": "STU201", "name": "Bad Email", "email": "no-at-sign"}\n'
+        )
+        response = client.post('/api/users/import', data=body, content_type='application/x-ndjson')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['created'] == 1
+        assert data['errors'] == 2
+        assert User.query.filter_by(student_id='STU200').first().role == 'student'
+
+    def test_import_users_non_string_role(self, client, app_context):
+        """Test a non-string role is reported as an invalid row, not a failed import"""
+        body = (
+            '{"student_id": "STU210", "name": "Numeric Role", "email": "num@university.edu", "role": 5}\n'
+            '{"student_id": "STU211", "name": "Bool Role", "email": "bool@university.edu", "role": true}\n'
+            '{"student_id": "STU212", "name": "Fine", "email": "fine@university.edu", "role": "Librarian"}\n'
+        )
+        response = client.post('/api/users/import', data=body, content_type='application/x-ndjson')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['created'] == 1
+        assert data['errors'] == 2
+        assert [detail['line'] for detail in data['error_details']] == [1, 2]
+        assert User.query.filter_by(student_id='STU212').first().role == 'librarian'
+
+    def test_import_users_unsupported_content_type(self, client, app_context):
+        """Test bulk import rejects unsupported bodies"""
+        response = client.post('/api/users/import', json=[{'student_id': 'STU300'}])
+
+        assert response.status_code == 415
+
+    def test_import_users_cli(self, test_app, app_context, tmp_path):
+        """Test the import-users CLI command reports counts"""
+        path = tmp_path / 'users.csv'
+        path.write_text(
+            "student_id,name,email\n"
+            "STU400,Cli User,cli@university.edu\n"
+            "STU400,Cli User,cli@university.edu\n"
+        )
+
+        result = test_app.test_cli_runner().invoke(args=['import-users', str(path)])
+
+        assert result.exit_code == 0
+        assert 'created=1 skipped=1 errors=0' in result.output
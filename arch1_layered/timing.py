@@ -0,0 +1,141 @@
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('library.timing')
+
+# Timer for the current sampled request, None outside sampled requests
+_current_timer: ContextVar[Optional['RequestTimer']] = ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    """SQL and cache time accumulated over one request"""
+
+    __slots__ = ('started', 'sql_count', 'sql_seconds', 'cache_calls', 'cache_seconds')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.cache_calls = 0
+        self.cache_seconds = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        app_seconds = max(total_seconds - self.sql_seconds - self.cache_seconds, 0.0)
+        return ', '.join([
+            f'db;dur={self.sql_seconds * 1000:.2f};desc="{self.sql_count} queries"',
+            f'cache;dur={self.cache_seconds * 1000:.2f};desc="{self.cache_calls} calls"',
+            f'app;dur={app_seconds * 1000:.2f}',
+            f'total;dur={total_seconds * 1000:.2f}'
+        ])
+
+
+def timed_cache_call(method):
+    """Count a CacheService call and its duration against the current request"""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        timer = _current_timer.get()
+        if timer is None:
+            return method(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            timer.cache_calls += 1
+            timer.cache_seconds += time.perf_counter() - start
+    return wrapper
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    if _current_timer.get() is not None:
+        conn.info['timing_started'] = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _end_statement(conn, cursor, statement, parameters, context, executemany):
+    timer = _current_timer.get()
+    started = conn.info.pop('timing_started', None)
+    if timer is not None and started is not None:
+        timer.sql_count += 1
+        timer.sql_seconds += time.perf_counter() - started
+
+
+def timed_async_cache_call(method):
+    """timed_cache_call for the coroutine methods of AsyncCacheService"""
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        timer = _current_timer.get()
+        if timer is None:
+            return await method(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            timer.cache_calls += 1
+            timer.cache_seconds += time.perf_counter() - start
+    return wrapper
+
+
+def log_request_timing(timer: RequestTimer, total_seconds: float, method: str, path: str,
+                       endpoint: Optional[str], status: int) -> None:
+    logger.info(json.dumps({
+        'event': 'request_timing',
+        'method': method,
+        'path': path,
+        'endpoint': endpoint,
+        'status': status,
+        'duration_ms': round(total_seconds * 1000, 3),
+        'sql_count': timer.sql_count,
+        'sql_ms': round(timer.sql_seconds * 1000, 3),
+        'cache_calls': timer.cache_calls,
+        'cache_ms': round(timer.cache_seconds * 1000, 3)
+    }))
+
+
+def configure_json_logger(json_logger: logging.Logger) -> None:
+    """Write a logger's JSON messages one per line to stderr, next to gunicorn's own logs"""
+    if json_logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    json_logger.addHandler(handler)
+    json_logger.setLevel(logging.INFO)
+    json_logger.propagate = False
+
+
+def init_request_timing(app) -> None:
+    """Add Server-Timing headers and a structured log line to a sample of requests"""
+    sample_rate = float(app.config.get('REQUEST_TIMING_SAMPLE_RATE', 0.0))
+    if sample_rate <= 0:
+        return
+
+    configure_json_logger(logger)
+
+    @app.before_request
+    def start_timer():
+        if sample_rate >= 1 or random.random() < sample_rate:
+            _current_timer.set(RequestTimer())
+
+    @app.after_request
+    def emit_timing(response):
+        timer = _current_timer.get()
+        if timer is None:
+            return response
+
+        total_seconds = time.perf_counter() - timer.started
+        response.headers['Server-Timing'] = timer.server_timing(total_seconds)
+        log_request_timing(timer, total_seconds, request.method, request.path, request.endpoint,
+                           response.status_code)
+        return response
+
+    @app.teardown_request
+    def stop_timer(exc):
+        _current_timer.set(None)
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nbook.proto\x12\x04\x62ook\"\xa6\x01\n\x04\x42ook\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x0c\n\x04isbn\x18\x04 \x01(\t\x12\x0e\n\x06status\x18\x05 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x06 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x07 \x01(\t\x12\x14\n\x0ctotal_copies\x18\x08 \x01(\x05\x12\x18\n\x10\x61vailable_copies\x18\t \x01(\x05\"z\n\x0e\x41\x64\x64\x42ookRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\x0c\n\x04isbn\x18\x03 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x04 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\x12\x14\n\x0ctotal_copies\x18\x06 \x01(\x05\"+\n\x0f\x41\x64\x64\x42ookResponse\x12\x18\n\x04\x62ook\x18\x01 \x01(\x0b\x32\n.book.Book\"\x1c\n\x0eGetBookRequest\x12\n\n\x02id\x18\x01 \x01(\t\"+\n\x0fGetBookResponse\x12\x18\n\x04\x62ook\x18\x01 \x01(\x0b\x32\n.book.Book\"\x12\n\x10ListBooksRequest\".\n\x11ListBooksResponse\x12\x19\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\n.book.Book\"5\n\x17UpdateBookStatusRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\"4\n\x18UpdateBookStatusResponse\x12\x18\n\x04\x62ook\x18\x01 \x01(\x0b\x32\n.book.Book\"=\n\x1cUpdateAvailableCopiesRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\tincrement\x18\x02 \x01(\x05\"9\n\x1dUpdateAvailableCopiesResponse\x12\x18\n\x04\x62ook\x18\x01 \x01(\x0b\x32\n.book.Book2\xf0\x02\n\x0b\x42ookService\x12\x36\n\x07\x41\x64\x64\x42ook\x12\x14.book.AddBookRequest\x1a\x15.book.AddBookResponse\x12\x36\n\x07GetBook\x12\x14.book.GetBookRequest\x1a\x15.book.GetBookResponse\x12<\n\tListBooks\x12\x16.book.ListBooksRequest\x1a\x17.book.ListBooksResponse\x12Q\n\x10UpdateBookStatus\x12\x1d.book.UpdateBookStatusRequest\x1a\x1e.book.UpdateBookStatusResponse\x12`\n\x15UpdateAvailableCopies\x12\".book.UpdateAvailableCopiesRequest\x1a#.book.UpdateAvailableCopiesResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nbook.proto\x12\x04\x62ook\"\xa6\x01\n\x04\x42ook\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x0c\n\x04isbn\x18\x04 \x01(\t\x12\x0e\n\x06status\x18\x05 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x06 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x07 \x01(\t\x12\x14\n\x0ctotal_copies\x18\x08 \x01(\x05\x12\x18\n\x10\x61vailable_copies\x18\t \x01(\x05\"z\n\x0e\x41\x64\x64\x42ookRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\x0c\n\x04isbn\x18\x03 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x04 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\x12\x14\n\x0ctotal_copies\x18\x06 \x01(\x05\"+\n\x0f\x41\x64\x64\x42ookResponse\x12\x18\n\x04\x62ook\x18\x01 \x01(\x0b\x32\n.book.Book\"\x1c\n\x0eGetBookRequest\x12\n\n\x02id\x18\x01 \x01(\t\"+\n\x0fGetBookResponse\x12\x18\n\x04\x62ook\x18\x01 \x01(\x0b\x32\n.book.Book\"#\n\x14\x42\x61tchGetBooksRequest\x12\x0b\n\x03ids\x18\x01 \x03(\t\"2\n\x15\x42\x61tchGetBooksResponse\x12\x19\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\n.book.Book\"\x88\x01\n\x10ListBooksRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x12\n\npage_token\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\t\x12\x16\n\x0e\x61vailable_only\x18\x04 \x01(\x08\x12\x0c\n\x04page\x18\x05 \x01(\x05\x12\x15\n\rinclude_total\x18\x06 \x01(\x08\"[\n\x11ListBooksResponse\x12\x19\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\n.book.Book\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\x12\x12\n\ntotal_size\x18\x03 \x01(\x05\"b\n\x12SearchBooksRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\x11\n\tpage_size\x18\x02 \x01(\x05\x12\x12\n\npage_token\x18\x03 \x01(\t\x12\x16\n\x0e\x61vailable_only\x18\x04 \x01(\x08\"I\n\x13SearchBooksResponse\x12\x19\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\n.book.Book\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\"f\n\x12StreamBooksRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x16\n\x0e\x61vailable_only\x18\x02 \x01(\x08\x12\x12\n\npage_token\x18\x03 \x01(\t\x12\x12\n\nchunk_size\x18\x04 \x01(\x05\"?\n\tBookChunk\x12\x19\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\n.book.Book\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\"\x15\n\x13GetBookStatsRequest\"t\n\x14GetBookStatsResponse\x12\x13\n\x0btotal_books\x18\x01 \x01(\x05\x12\x17\n\x0f\x61vailable_books\x18\x02 \x01(\x05\x12\x14\n\x0ctotal_copies\x18\x03 \x01(\x05\x12\x18\n\x10\x61vailable_copies\x18\x04 \x01(\x05\"5\n\x17UpdateBookStatusRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\"4\n\x18UpdateBookStatusResponse\x12\x18\n\x04\x62ook\x18\x01 \x01(\x0b\x32\n.book.Book\"=\n\x1cUpdateAvailableCopiesRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\tincrement\x18\x02 \x01(\x05\"9\n\x1dUpdateAvailableCopiesResponse\x12\x18\n\x04\x62ook\x18\x01 \x01(\x0b\x32\n.book.Book2\x81\x05\n\x0b\x42ookService\x12\x36\n\x07\x41\x64\x64\x42ook\x12\x14.book.AddBookRequest\x1a\x15.book.AddBookResponse\x12\x36\n\x07GetBook\x12\x14.book.GetBookRequest\x1a\x15.book.GetBookResponse\x12H\n\rBatchGetBooks\x12\x1a.book.BatchGetBooksRequest\x1a\x1b.book.BatchGetBooksResponse\x12<\n\tListBooks\x12\x16.book.ListBooksRequest\x1a\x17.book.ListBooksResponse\x12\x42\n\x0bSearchBooks\x12\x18.book.SearchBooksRequest\x1a\x19.book.SearchBooksResponse\x12:\n\x0bStreamBooks\x12\x18.book.StreamBooksRequest\x1a\x0f.book.BookChunk0\x01\x12\x45\n\x0cGetBookStats\x12\x19.book.GetBookStatsRequest\x1a\x1a.book.GetBookStatsResponse\x12Q\n\x10UpdateBookStatus\x12\x1d.book.UpdateBookStatusRequest\x1a\x1e.book.UpdateBookStatusResponse\x12`\n\x15UpdateAvailableCopies\x12\".book.UpdateAvailableCopiesRequest\x1a#.book.UpdateAvailableCopiesResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -41,18 +41,34 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_GETBOOKREQUEST']._serialized_end=386
   _globals['_GETBOOKRESPONSE']._serialized_start=388
   _globals['_GETBOOKRESPONSE']._serialized_end=431
-  _globals['_LISTBOOKSREQUEST']._serialized_start=433
-  _globals['_LISTBOOKSREQUEST']._serialized_end=451
-  _globals['_LISTBOOKSRESPONSE']._serialized_start=453
-  _globals['_LISTBOOKSRESPONSE']._serialized_end=499
-  _globals['_UPDATEBOOKSTATUSREQUEST']._serialized_start=501
-  _globals['_UPDATEBOOKSTATUSREQUEST']._serialized_end=554
-  _globals['_UPDATEBOOKSTATUSRESPONSE']._serialized_start=556
-  _globals['_UPDATEBOOKSTATUSRESPONSE']._serialized_end=608
-  _globals['_UPDATEAVAILABLECOPIESREQUEST']._serialized_start=610
-  _globals['_UPDATEAVAILABLECOPIESREQUEST']._serialized_end=671
-  _globals['_UPDATEAVAILABLECOPIESRESPONSE']._serialized_start=673
-  _globals['_UPDATEAVAILABLECOPIESRESPONSE']._serialized_end=730
-  _globals['_BOOKSERVICE']._serialized_start=733
-  _globals['_BOOKSERVICE']._serialized_end=1101
+  _globals['_BATCHGETBOOKSREQUEST']._serialized_start=433
+  _globals['_BATCHGETBOOKSREQUEST']._serialized_end=468
+  _globals['_BATCHGETBOOKSRESPONSE']._serialized_start=470
+  _globals['_BATCHGETBOOKSRESPONSE']._serialized_end=520
+  _globals['_LISTBOOKSREQUEST']._serialized_start=523
+  _globals['_LISTBOOKSREQUEST']._serialized_end=659
+  _globals['_LISTBOOKSRESPONSE']._serialized_start=661
+  _globals['_LISTBOOKSRESPONSE']._serialized_end=752
+  _globals['_SEARCHBOOKSREQUEST']._serialized_start=754
+  _globals['_SEARCHBOOKSREQUEST']._serialized_end=852
+  _globals['_SEARCHBOOKSRESPONSE']._serialized_start=854
+  _globals['_SEARCHBOOKSRESPONSE']._serialized_end=927
+  _globals['_STREAMBOOKSREQUEST']._serialized_start=929
+  _globals['_STREAMBOOKSREQUEST']._serialized_end=1031
+  _globals['_BOOKCHUNK']._serialized_start=1033
+  _globals['_BOOKCHUNK']._serialized_end=1096
+  _globals['_GETBOOKSTATSREQUEST']._serialized_start=1098
+  _globals['_GETBOOKSTATSREQUEST']._serialized_end=1119
+  _globals['_GETBOOKSTATSRESPONSE']._serialized_start=1121
+  _globals['_GETBOOKSTATSRESPONSE']._serialized_end=1237
+  _globals['_UPDATEBOOKSTATUSREQUEST']._serialized_start=1239
+  _globals['_UPDATEBOOKSTATUSREQUEST']._serialized_end=1292
+  _globals['_UPDATEBOOKSTATUSRESPONSE']._serialized_start=1294
+  _globals['_UPDATEBOOKSTATUSRESPONSE']._serialized_end=1346
+  _globals['_UPDATEAVAILABLECOPIESREQUEST']._serialized_start=1348
+  _globals['_UPDATEAVAILABLECOPIESREQUEST']._serialized_end=1409
+  _globals['_UPDATEAVAILABLECOPIESRESPONSE']._serialized_start=1411
+  _globals['_UPDATEAVAILABLECOPIESRESPONSE']._serialized_end=1468
+  _globals['_BOOKSERVICE']._serialized_start=1471
+  _globals['_BOOKSERVICE']._serialized_end=2112
 # @@protoc_insertion_point(module_scope)
@@ -45,11 +45,31 @@ class BookServiceStub(object):
                 request_serializer=book__pb2.GetBookRequest.SerializeToString,
                 response_deserializer=book__pb2.GetBookResponse.FromString,
                 _registered_method=True)
+        self.BatchGetBooks = channel.unary_unary(
+                '/book.BookService/BatchGetBooks',
+                request_serializer=book__pb2.BatchGetBooksRequest.SerializeToString,
+                response_deserializer=book__pb2.BatchGetBooksResponse.FromString,
+                _registered_method=True)
         self.ListBooks = channel.unary_unary(
                 '/book.BookService/ListBooks',
                 request_serializer=book__pb2.ListBooksRequest.SerializeToString,
                 response_deserializer=book__pb2.ListBooksResponse.FromString,
                 _registered_method=True)
+        self.SearchBooks = channel.unary_unary(
+                '/book.BookService/SearchBooks',
+                request_serializer=book__pb2.SearchBooksRequest.SerializeToString,
+                response_deserializer=book__pb2.SearchBooksResponse.FromString,
+                _registered_method=True)
+        self.StreamBooks = channel.unary_stream(
+                '/book.BookService/StreamBooks',
+                request_serializer=book__pb2.StreamBooksRequest.SerializeToString,
+                response_deserializer=book__pb2.BookChunk.FromString,
+                _registered_method=True)
+        self.GetBookStats = channel.unary_unary(
+                '/book.BookService/GetBookStats',
+                request_serializer=book__pb2.GetBookStatsRequest.SerializeToString,
+                response_deserializer=book__pb2.GetBookStatsResponse.FromString,
+                _registered_method=True)
         self.UpdateBookStatus = channel.unary_unary(
                 '/book.BookService/UpdateBookStatus',
                 request_serializer=book__pb2.UpdateBookStatusRequest.SerializeToString,
@@ -78,12 +98,37 @@ class BookServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchGetBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ListBooks(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SearchBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamBooks(self, request, context):
+        """Every matching book in (title, id) order, in chunks read through a server-side cursor
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetBookStats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def UpdateBookStatus(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -109,11 +154,31 @@ def add_BookServiceServicer_to_server(servicer, server):
                     request_deserializer=book__pb2.GetBookRequest.FromString,
                     response_serializer=book__pb2.GetBookResponse.SerializeToString,
             ),
+            'BatchGetBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetBooks,
+                    request_deserializer=book__pb2.BatchGetBooksRequest.FromString,
+                    response_serializer=book__pb2.BatchGetBooksResponse.SerializeToString,
+            ),
             'ListBooks': grpc.unary_unary_rpc_method_handler(
                     servicer.ListBooks,
                     request_deserializer=book__pb2.ListBooksRequest.FromString,
                     response_serializer=book__pb2.ListBooksResponse.SerializeToString,
             ),
+            'SearchBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchBooks,
+                    request_deserializer=book__pb2.SearchBooksRequest.FromString,
+                    response_serializer=book__pb2.SearchBooksResponse.SerializeToString,
+            ),
+            'StreamBooks': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamBooks,
+                    request_deserializer=book__pb2.StreamBooksRequest.FromString,
+                    response_serializer=book__pb2.BookChunk.SerializeToString,
+            ),
+            'GetBookStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBookStats,
+                    request_deserializer=book__pb2.GetBookStatsRequest.FromString,
+                    response_serializer=book__pb2.GetBookStatsResponse.SerializeToString,
+            ),
             'UpdateBookStatus': grpc.unary_unary_rpc_method_handler(
                     servicer.UpdateBookStatus,
                     request_deserializer=book__pb2.UpdateBookStatusRequest.FromString,
@@ -190,6 +255,33 @@ class BookService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def BatchGetBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/book.BookService/BatchGetBooks',
+            book__pb2.BatchGetBooksRequest.SerializeToString,
+            book__pb2.BatchGetBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def ListBooks(request,
             target,
@@ -217,6 +309,87 @@ class BookService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SearchBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/book.BookService/SearchBooks',
+            book__pb2.SearchBooksRequest.SerializeToString,
+            book__pb2.SearchBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/book.BookService/StreamBooks',
+            book__pb2.StreamBooksRequest.SerializeToString,
+            book__pb2.BookChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetBookStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/book.BookService/GetBookStats',
+            book__pb2.GetBookStatsRequest.SerializeToString,
+            book__pb2.GetBookStatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def UpdateBookStatus(request,
             target,
@@ -1,5 +1,8 @@
 
 
+import base64
+import json
+import uuid
 import grpc
 from concurrent import futures
 import time
@@ -12,6 +15,44 @@ from src import crud
 # Initialize DB tables
 create_db_and_tables()
 
+
+def book_to_proto(book):
+    return book_pb2.Book(
+        id=str(book.id),
+        title=book.title,
+        author=book.author,
+        isbn=book.isbn,
+        status=book.status,
+        category=book.category if book.category else "",
+        description=book.description if book.description else "",
+        total_copies=book.total_copies,
+        available_copies=book.available_copies
+    )
+
+
+def _canonical_id(book_id):
+    try:
+        return str(uuid.UUID(book_id))
+    except ValueError:
+        return book_id
+
+
+def encode_page_token(*key):
+    """Opaque token for the page after a row, holding that row's sort key (ending with its id)."""
+    return base64.urlsafe_b64encode(json.dumps(key, default=str).encode()).decode()
+
+
+def decode_page_token(token, size):
+    """The sort key from encode_page_token; ValueError if the token was not made by it."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token.encode()))
+        if not isinstance(key, list) or len(key) != size:
+            raise ValueError
+        return (*key[:-1], uuid.UUID(key[-1]))
+    except (TypeError, ValueError, AttributeError) as e:
+        raise ValueError("Invalid page_token") from e
+
+
 class BookService(book_pb2_grpc.BookServiceServicer):
     def AddBook(self, request, context):
         with SessionLocal() as db:
@@ -24,19 +65,7 @@ class BookService(book_pb2_grpc.BookServiceServicer):
                 request.description if request.description else None,
                 request.total_copies if request.total_copies > 0 else 1
             )
-            return book_pb2.AddBookResponse(
-                book=book_pb2.Book(
-                    id=str(book.id),
-                    title=book.title,
-                    author=book.author,
-                    isbn=book.isbn,
-                    status=book.status,
-                    category=book.category if book.category else "",
-                    description=book.description if book.description else "",
-                    total_copies=book.total_copies,
-                    available_copies=book.available_copies
-                )
-            )
+            return book_pb2.AddBookResponse(book=book_to_proto(book))
 
     def GetBook(self, request, context):
         with SessionLocal() as db:
@@ -44,38 +73,107 @@ class BookService(book_pb2_grpc.BookServiceServicer):
             if not book:
                 context.abort(grpc.StatusCode.NOT_FOUND, "Book not found")
 
-            return book_pb2.GetBookResponse(
-                book=book_pb2.Book(
-                    id=str(book.id),
-                    title=book.title,
-                    author=book.author,
-                    isbn=book.isbn,
-                    status=book.status,
-                    category=book.category if book.category else "",
-                    description=book.description if book.description else "",
-                    total_copies=book.total_copies,
-                    available_copies=book.available_copies
-                )
-            )
+            return book_pb2.GetBookResponse(book=book_to_proto(book))
+
+    def BatchGetBooks(self, request, context):
+        if len(request.ids) > crud.MAX_BATCH_SIZE:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"At most {crud.MAX_BATCH_SIZE} ids per batch")
+
+        with SessionLocal() as db:
+            books = {str(book.id): book for book in crud.get_books(db, request.ids)}
+            ordered = []
+            for book_id in dict.fromkeys(request.ids):
+                book = books.get(_canonical_id(book_id))
+                if book is not None:
+                    ordered.append(book_to_proto(book))
+            return book_pb2.BatchGetBooksResponse(books=ordered)
 
     def ListBooks(self, request, context):
+        page_size = min(max(request.page_size, 0), crud.MAX_PAGE_SIZE)
+        after = None
+        if request.page_token:
+            try:
+                after = decode_page_token(request.page_token, 2)
+            except ValueError as e:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        offset = (request.page - 1) * page_size if page_size and request.page > 1 and not after else 0
+        filters = dict(category=request.category or None, available_only=request.available_only)
+
         with SessionLocal() as db:
-            books = crud.list_books(db)
+            # One extra row tells us whether another page follows
+            books = crud.list_books(db, limit=page_size + 1 if page_size else None,
+                                    after=after, offset=offset, **filters)
+            next_page_token = ""
+            if page_size and len(books) > page_size:
+                books = books[:page_size]
+                next_page_token = encode_page_token(books[-1].title, books[-1].id)
+            total_size = crud.count_books(db, **filters) if request.include_total else 0
+
             return book_pb2.ListBooksResponse(
-                books=[
-                    book_pb2.Book(
-                        id=str(b.id),
-                        title=b.title,
-                        author=b.author,
-                        isbn=b.isbn,
-                        status=b.status,
-                        category=b.category if b.category else "",
-                        description=b.description if b.description else "",
-                        total_copies=b.total_copies,
-                        available_copies=b.available_copies
-                    )
-                    for b in books
-                ]
+                books=[book_to_proto(b) for b in books],
+                next_page_token=next_page_token,
+                total_size=total_size
+            )
+
+    def SearchBooks(self, request, context):
+        query = request.query.strip()
+        if not query:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "query is required")
+        page_size = min(request.page_size, crud.MAX_SEARCH_PAGE_SIZE) if request.page_size > 0 else 20
+        after = None
+        if request.page_token:
+            try:
+                # The query is part of the token so it cannot continue a different search
+                token_query, *after = decode_page_token(request.page_token, 4)
+            except ValueError as e:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            if token_query != query:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, "page_token belongs to a different query")
+
+        with SessionLocal() as db:
+            rows = crud.search_books(db, query, limit=page_size + 1, after=after,
+                                     available_only=request.available_only)
+            next_page_token = ""
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                book, rank = rows[-1]
+                next_page_token = encode_page_token(query, rank, book.title, book.id)
+
+            return book_pb2.SearchBooksResponse(
+                books=[book_to_proto(book) for book, _ in rows],
+                next_page_token=next_page_token
+            )
+
+    def StreamBooks(self, request, context):
+        chunk_size = min(request.chunk_size, crud.MAX_PAGE_SIZE) if request.chunk_size > 0 else crud.STREAM_CHUNK_SIZE
+        after = None
+        if request.page_token:
+            try:
+                after = decode_page_token(request.page_token, 2)
+            except ValueError as e:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        # Closing this generator (client gone or done) closes the cursor and session too
+        with SessionLocal() as db:
+            chunks = crud.stream_books(db, chunk_size, after=after, category=request.category or None,
+                                       available_only=request.available_only)
+            for books in chunks:
+                if not context.is_active():
+                    return
+                yield book_pb2.BookChunk(
+                    books=[book_to_proto(b) for b in books],
+                    next_page_token=encode_page_token(books[-1].title, books[-1].id)
+                )
+
+    def GetBookStats(self, request, context):
+        with SessionLocal() as db:
+            total_books, available_books, total_copies, available_copies = crud.book_stats(db)
+
+            return book_pb2.GetBookStatsResponse(
+                total_books=total_books,
+                available_books=available_books,
+                total_copies=total_copies,
+                available_copies=available_copies
             )
 
     def UpdateBookStatus(self, request, context):
@@ -84,19 +182,7 @@ class BookService(book_pb2_grpc.BookServiceServicer):
             if not book:
                 context.abort(grpc.StatusCode.NOT_FOUND, "Book not found")
 
-            return book_pb2.UpdateBookStatusResponse(
-                book=book_pb2.Book(
-                    id=str(book.id),
-                    title=book.title,
-                    author=book.author,
-                    isbn=book.isbn,
-                    status=book.status,
-                    category=book.category if book.category else "",
-                    description=book.description if book.description else "",
-                    total_copies=book.total_copies,
-                    available_copies=book.available_copies
-                )
-            )
+            return book_pb2.UpdateBookStatusResponse(book=book_to_proto(book))
 
     def UpdateAvailableCopies(self, request, context):
         with SessionLocal() as db:
@@ -104,19 +190,7 @@ class BookService(book_pb2_grpc.BookServiceServicer):
             if not book:
                 context.abort(grpc.StatusCode.NOT_FOUND, "Book not found")
 
-            return book_pb2.UpdateAvailableCopiesResponse(
-                book=book_pb2.Book(
-                    id=str(book.id),
-                    title=book.title,
-                    author=book.author,
-                    isbn=book.isbn,
-                    status=book.status,
-                    category=book.category if book.category else "",
-                    description=book.description if book.description else "",
-                    total_copies=book.total_copies,
-                    available_copies=book.available_copies
-                )
-            )
+            return book_pb2.UpdateAvailableCopiesResponse(book=book_to_proto(book))
 
 
 def serve():
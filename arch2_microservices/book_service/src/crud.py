@@ -1,8 +1,14 @@
 # crud.py
 import uuid
+from sqlalchemy import and_, case, func, or_, select, tuple_
 from sqlalchemy.orm import Session
 from . import models
 
+MAX_PAGE_SIZE = 1000
+MAX_SEARCH_PAGE_SIZE = 100
+MAX_BATCH_SIZE = 1000
+STREAM_CHUNK_SIZE = 500
+
 def create_book(db: Session, title: str, author: str, isbn: str, category: str = None, description: str = None, total_copies: int = 1):
     """Add a new book to the database."""
     book = models.Book(
@@ -27,9 +33,116 @@ def get_book(db: Session, book_id: str):
     return db.query(models.Book).filter(models.Book.id == book_id).first()
 
 
-def list_books(db: Session):
-    """Retrieve all books."""
-    return db.query(models.Book).all()
+def get_books(db: Session, book_ids):
+    """Fetch several books by ID in one query; unknown or malformed IDs are skipped."""
+    ids = set()
+    for book_id in book_ids:
+        try:
+            ids.add(uuid.UUID(book_id))
+        except (TypeError, ValueError, AttributeError):
+            continue
+    if not ids:
+        return []
+    return db.query(models.Book).filter(models.Book.id.in_(ids)).all()
+
+
+def _filter_books(query, category: str = None, available_only: bool = False):
+    if category:
+        query = query.filter(models.Book.category == category)
+    if available_only:
+        query = query.filter(models.Book.available_copies > 0)
+    return query
+
+
+def list_books(db: Session, limit: int = None, after: tuple = None, offset: int = 0,
+               category: str = None, available_only: bool = False):
+    """Retrieve books ordered by (title, id), optionally one page at a time.
+
+    `after` is the (title, id) of the last book already seen: keyset pagination,
+    which stays fast on deep pages. `offset` skips rows instead, for numbered pages.
+    """
+    query = _filter_books(db.query(models.Book), category, available_only)
+    if after:
+        query = query.filter(tuple_(models.Book.title, models.Book.id) > tuple_(*after))
+    query = query.order_by(models.Book.title, models.Book.id)
+    if offset:
+        query = query.offset(offset)
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
+def stream_books(db: Session, chunk_size: int = STREAM_CHUNK_SIZE, after: tuple = None,
+                 category: str = None, available_only: bool = False):
+    """Yield the books list_books would return as lists of up to chunk_size, in the same order.
+
+    Rows are fetched chunk_size at a time (yield_per; a server-side cursor on
+    PostgreSQL), so memory stays flat however large the catalog is. The query
+    runs in one transaction, which stays open until the generator is exhausted
+    or closed.
+    """
+    statement = _filter_books(select(models.Book), category, available_only)
+    if after:
+        statement = statement.filter(tuple_(models.Book.title, models.Book.id) > tuple_(*after))
+    statement = statement.order_by(models.Book.title, models.Book.id).execution_options(yield_per=chunk_size)
+    yield from db.scalars(statement).partitions()
+
+
+def count_books(db: Session, category: str = None, available_only: bool = False):
+    """Count the books list_books would return without paging."""
+    return _filter_books(db.query(func.count(models.Book.id)), category, available_only).scalar()
+
+
+def book_stats(db: Session):
+    """Catalog totals in one aggregate query: (books, available books, copies, available copies)."""
+    return db.query(
+        func.count(models.Book.id),
+        func.count(case((models.Book.status == "available", 1))),
+        func.coalesce(func.sum(models.Book.total_copies), 0),
+        func.coalesce(func.sum(models.Book.available_copies), 0),
+    ).one()
+
+
+def _like_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def search_rank(query: str):
+    """Match quality of a book for `query`, from 5 (exact title) down to 1 (author substring)."""
+    title, author = models.Book.title, models.Book.author
+    escaped = _like_escape(query)
+    return case(
+        (func.lower(title) == query.lower(), 5),
+        (title.ilike(f'{escaped}%', escape='\\'), 4),
+        (title.ilike(f'%{escaped}%', escape='\\'), 3),
+        (author.ilike(f'{escaped}%', escape='\\'), 2),
+        else_=1
+    )
+
+
+def search_books(db: Session, query: str, limit: int = None, after: tuple = None, available_only: bool = False):
+    """(book, rank) pairs whose title or author contains `query`, best first.
+
+    Ordered by rank descending, then (title, id). `after` is the (rank, title, id)
+    of the last result already seen.
+    """
+    escaped = f'%{_like_escape(query)}%'
+    rank = search_rank(query)
+    statement = db.query(models.Book, rank.label('rank')).filter(or_(
+        models.Book.title.ilike(escaped, escape='\\'),
+        models.Book.author.ilike(escaped, escape='\\')
+    ))
+    statement = _filter_books(statement, available_only=available_only)
+    if after:
+        after_rank, after_title, after_id = after
+        statement = statement.filter(or_(
+            rank < after_rank,
+            and_(rank == after_rank, tuple_(models.Book.title, models.Book.id) > tuple_(after_title, after_id))
+        ))
+    statement = statement.order_by(rank.desc(), models.Book.title, models.Book.id)
+    if limit:
+        statement = statement.limit(limit)
+    return statement.all()
 
 
 def update_book_status(db: Session, book_id: str, new_status: str):
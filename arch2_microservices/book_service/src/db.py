@@ -1,8 +1,11 @@
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
 import os
+import re
+import time
 # from .models import Base
 
 # Adjust according to your actual Postgres setup
@@ -30,4 +33,54 @@ def get_db():
 def create_db_and_tables():
     print("Creating database tables for book service...")
     Base.metadata.create_all(bind=engine)
+    create_missing_indexes()
     print("Book service database setup complete.")
+
+
+# pg_advisory_lock key shared by book service replicas building indexes at startup
+_INDEX_LOCK_ID = 0x626f6f6b
+
+
+def create_missing_indexes(bind=None):
+    """Build the model indexes an existing table lacks; create_all only indexes tables it creates.
+
+    On PostgreSQL each index is built with CREATE INDEX CONCURRENTLY IF NOT EXISTS,
+    so writes to the table carry on, under an advisory lock so replicas starting
+    together take turns. The trigram indexes need pg_trgm, which is enabled here too.
+    Elsewhere each index is checked for first. Either way this is a no-op once they exist.
+    """
+    bind = bind or engine
+    if bind.dialect.name != 'postgresql':
+        with bind.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+        return
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with bind.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        # Poll rather than block in pg_advisory_lock: a waiting statement holds a
+        # snapshot, which the holder's CREATE INDEX CONCURRENTLY would wait on (deadlock)
+        while not conn.execute(text('SELECT pg_try_advisory_lock(:id)'), {'id': _INDEX_LOCK_ID}).scalar():
+            time.sleep(1)
+        try:
+            conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    _create_index_concurrently(conn, index)
+        finally:
+            conn.execute(text('SELECT pg_advisory_unlock(:id)'), {'id': _INDEX_LOCK_ID})
+
+
+def _create_index_concurrently(conn, index):
+    # An interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index behind
+    # that IF NOT EXISTS would silently keep
+    invalid = conn.execute(text(
+        'SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+        'WHERE pg_class.relname = :name AND NOT pg_index.indisvalid'
+    ), {'name': index.name}).first()
+    if invalid:
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {index.name}'))
+
+    ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect))
+    conn.execute(text(re.sub(r'^CREATE (UNIQUE )?INDEX ', r'CREATE \1INDEX CONCURRENTLY ', ddl)))
@@ -1,9 +1,9 @@
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
-from .db import Base, engine
+from .db import Base, engine, create_missing_indexes
 
 class Book(Base):
     __tablename__ = "books"
@@ -22,6 +22,15 @@ class Book(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # Keyset pagination in ListBooks walks (title, id), optionally within a category.
+    # SearchBooks' ILIKE '%query%' is served by trigram indexes on PostgreSQL.
+    __table_args__ = (
+        Index('ix_books_title_id', 'title', 'id'),
+        Index('ix_books_category_title_id', 'category', 'title', 'id'),
+        Index('ix_books_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+        Index('ix_books_author_trgm', 'author', postgresql_using='gin', postgresql_ops={'author': 'gin_trgm_ops'}),
+    )
+
     def is_available(self):
         """Check if book is available for borrowing"""
         return self.available_copies > 0
@@ -45,8 +54,13 @@ class Book(Base):
         return False
 
 
+event.listen(Book.__table__, 'before_create',
+             DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'))
+
+
 def create_db_and_tables():
     """Creates all defined tables in the database if they do not exist."""
     print("Attempting to create book database tables...")
     Base.metadata.create_all(bind=engine)
+    create_missing_indexes()
     print("Book database tables created successfully.")
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import uuid
+import grpc
+import pytest
+from concurrent import futures
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# src.book_server creates its tables on import; without a configured database
+# point it at a throwaway SQLite file instead of the docker-compose host.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'book_service.db')}")
+
+from src import book_pb2_grpc, book_server, models
+
+CATALOG = [
+    # title, author, category, available copies (of 3)
+    ("Algorithms", "Robert Sedgewick", "Computer Science", 1),
+    ("Clean Code", "Robert Martin", "Software Engineering", 0),
+    ("Databases", "C. J. Date", "Computer Science", 2),
+    ("Distributed Systems", "Martin Kleppmann", "Systems", 1),
+    ("Python", "Mark Lutz", "Programming", 3),
+    # Same title again: the id breaks the tie so paging neither skips nor repeats it
+    ("Algorithms", "Jeff Erickson", "Computer Science", 1),
+]
+
+
+def book_id(n):
+    # Leading hex letter: SQLite would store an all-digit UUID column value as a number
+    return uuid.UUID(f"a{n:031x}")
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """SQLite database holding CATALOG, used by the servicer in place of SessionLocal"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'books.db'}")
+    models.Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        for n, (title, author, category, available) in enumerate(CATALOG, start=1):
+            db.add(models.Book(id=book_id(n), title=title, author=author, isbn=f"isbn-{n}",
+                               category=category, total_copies=3, available_copies=available,
+                               status="available" if available else "borrowed"))
+        db.commit()
+    monkeypatch.setattr(book_server, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def stub(session_factory):
+    """BookService stub talking to an in-process server over the CATALOG database"""
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    book_pb2_grpc.add_BookServiceServicer_to_server(book_server.BookService(), server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    with grpc.insecure_channel(f"localhost:{port}") as channel:
+        yield book_pb2_grpc.BookServiceStub(channel)
+    server.stop(0)
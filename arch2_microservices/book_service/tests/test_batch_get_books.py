@@ -0,0 +1,38 @@
+import grpc
+import pytest
+from sqlalchemy import event
+from src import book_pb2, crud
+from .conftest import book_id
+
+
+def batch_get(stub, ids):
+    return stub.BatchGetBooks(book_pb2.BatchGetBooksRequest(ids=[str(i) for i in ids]))
+
+
+def test_books_come_back_in_request_order(stub):
+    response = batch_get(stub, [book_id(5), book_id(1), book_id(3)])
+
+    assert [b.title for b in response.books] == ["Python", "Algorithms", "Databases"]
+
+
+def test_unknown_malformed_and_repeated_ids(stub):
+    response = batch_get(stub, [book_id(2), book_id(99), "not-a-uuid", book_id(2), str(book_id(4)).upper()])
+
+    assert [b.id for b in response.books] == [str(book_id(2)), str(book_id(4))]
+
+
+def test_one_query_for_the_batch(session_factory):
+    statements = []
+    with session_factory() as db:
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+        books = crud.get_books(db, [str(book_id(n)) for n in range(1, 7)] + ["bad"])
+
+    assert len(books) == 6
+    assert len(statements) == 1
+
+
+def test_batch_size_is_limited(stub):
+    with pytest.raises(grpc.RpcError) as error:
+        batch_get(stub, [book_id(1)] * (crud.MAX_BATCH_SIZE + 1))
+
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
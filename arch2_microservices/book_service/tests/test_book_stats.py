@@ -0,0 +1,19 @@
+from src import book_pb2, models
+
+
+def test_stats_are_counted_in_sql(stub):
+    stats = stub.GetBookStats(book_pb2.GetBookStatsRequest())
+
+    # CATALOG: six titles of three copies, one of them with none left
+    assert (stats.total_books, stats.available_books) == (6, 5)
+    assert (stats.total_copies, stats.available_copies) == (18, 8)
+
+
+def test_empty_catalog(stub, session_factory):
+    with session_factory() as db:
+        db.query(models.Book).delete()
+        db.commit()
+
+    stats = stub.GetBookStats(book_pb2.GetBookStatsRequest())
+
+    assert (stats.total_books, stats.total_copies, stats.available_copies) == (0, 0, 0)
@@ -0,0 +1,77 @@
+import grpc
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from src import book_pb2, crud, models
+from src.db import create_missing_indexes
+
+
+def titles(response):
+    return [b.title for b in response.books]
+
+
+def test_keyset_pages_cover_catalog_once(session_factory):
+    with session_factory() as db:
+        first = crud.list_books(db, limit=2)
+        second = crud.list_books(db, limit=2, after=(first[-1].title, first[-1].id))
+        rest = crud.list_books(db, after=(second[-1].title, second[-1].id))
+
+    seen = [b.id for b in first + second + rest]
+    assert len(seen) == len(set(seen)) == 6
+    assert [b.title for b in first] == ["Algorithms", "Algorithms"]
+
+
+def test_filters_apply_in_sql(session_factory):
+    with session_factory() as db:
+        books = crud.list_books(db, category="Computer Science", available_only=True)
+        total = crud.count_books(db, category="Computer Science", available_only=True)
+
+    assert [b.title for b in books] == ["Algorithms", "Algorithms", "Databases"]
+    assert total == 3
+
+
+def test_page_tokens_walk_the_catalog(stub):
+    pages = [stub.ListBooks(book_pb2.ListBooksRequest(page_size=4, include_total=True))]
+    while pages[-1].next_page_token:
+        pages.append(stub.ListBooks(book_pb2.ListBooksRequest(page_size=4, page_token=pages[-1].next_page_token)))
+
+    assert [len(page.books) for page in pages] == [4, 2]
+    assert pages[0].total_size == 6
+    assert titles(pages[1]) == ["Distributed Systems", "Python"]
+
+
+def test_numbered_page_and_filters(stub):
+    response = stub.ListBooks(book_pb2.ListBooksRequest(
+        page_size=1, page=2, category="Computer Science", available_only=True, include_total=True))
+
+    assert titles(response) == ["Algorithms"]
+    assert response.books[0].author == "Jeff Erickson"
+    assert response.total_size == 3
+    assert response.next_page_token
+
+
+def test_no_page_size_lists_everything(stub):
+    response = stub.ListBooks(book_pb2.ListBooksRequest())
+
+    assert len(response.books) == 6
+    assert response.next_page_token == ""
+
+
+def test_invalid_page_token(stub):
+    with pytest.raises(grpc.RpcError) as error:
+        stub.ListBooks(book_pb2.ListBooksRequest(page_size=2, page_token="not-a-token"))
+
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_missing_indexes_are_added_to_an_existing_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    models.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_books_title_id"))
+        conn.execute(text("DROP INDEX ix_books_category_title_id"))
+
+    create_missing_indexes(engine)
+    create_missing_indexes(engine)  # and again, once they exist
+
+    names = {index["name"] for index in inspect(engine).get_indexes("books")}
+    assert {"ix_books_title_id", "ix_books_category_title_id", "ix_books_title_trgm"} <= names
@@ -0,0 +1,60 @@
+import grpc
+import pytest
+from src import book_pb2, crud
+
+
+def search(stub, query, **kwargs):
+    return stub.SearchBooks(book_pb2.SearchBooksRequest(query=query, **kwargs))
+
+
+def test_best_matches_first(session_factory):
+    with session_factory() as db:
+        results = crud.search_books(db, "martin")
+
+    # Author prefix ranks above author substring
+    assert [(book.title, rank) for book, rank in results] == [("Distributed Systems", 2), ("Clean Code", 1)]
+
+
+def test_ranking_and_tie_breaks(stub):
+    # Exact title, then title prefix/substring, then author prefix/substring
+    assert search(stub, "PYTHON").books[0].title == "Python"
+    assert [b.author for b in search(stub, "algo").books] == ["Robert Sedgewick", "Jeff Erickson"]
+    assert [b.title for b in search(stub, "mar").books] == ["Distributed Systems", "Python", "Clean Code"]
+
+
+def test_like_wildcards_are_literal(stub):
+    assert list(search(stub, "%").books) == []
+    assert list(search(stub, "_").books) == []
+
+
+def test_available_only(stub):
+    response = search(stub, "robert", available_only=True)
+
+    assert [b.title for b in response.books] == ["Algorithms"]
+
+
+def test_page_tokens(stub):
+    first = search(stub, "s", page_size=2)
+    pages = [first]
+    while pages[-1].next_page_token:
+        pages.append(search(stub, "s", page_size=2, page_token=pages[-1].next_page_token))
+
+    ids = [b.id for page in pages for b in page.books]
+    assert len(ids) == len(set(ids)) == len(search(stub, "s", page_size=100).books)
+    assert len(pages) > 1
+
+
+def test_token_is_tied_to_its_query(stub):
+    token = search(stub, "s", page_size=1).next_page_token
+
+    with pytest.raises(grpc.RpcError) as error:
+        search(stub, "a", page_size=1, page_token=token)
+
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_empty_query_is_rejected(stub):
+    with pytest.raises(grpc.RpcError) as error:
+        search(stub, "  ")
+
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
@@ -0,0 +1,44 @@
+import grpc
+import pytest
+from src import book_pb2, crud
+
+
+def test_chunks_follow_list_order(session_factory):
+    with session_factory() as db:
+        listed = [b.id for b in crud.list_books(db)]
+        chunks = list(crud.stream_books(db, chunk_size=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+    assert [b.id for chunk in chunks for b in chunk] == listed
+
+
+def test_stream_sends_whole_catalog_in_chunks(stub):
+    chunks = list(stub.StreamBooks(book_pb2.StreamBooksRequest(chunk_size=4)))
+
+    assert [len(chunk.books) for chunk in chunks] == [4, 2]
+    assert [b.title for b in chunks[1].books] == ["Distributed Systems", "Python"]
+    assert all(chunk.next_page_token for chunk in chunks)
+
+
+def test_stream_resumes_after_token(stub):
+    first = next(stub.StreamBooks(book_pb2.StreamBooksRequest(chunk_size=2)))
+    rest = list(stub.StreamBooks(book_pb2.StreamBooksRequest(page_token=first.next_page_token)))
+
+    assert [b.title for b in first.books] == ["Algorithms", "Algorithms"]
+    assert [b.title for chunk in rest for b in chunk.books] == ["Clean Code", "Databases", "Distributed Systems", "Python"]
+
+
+def test_stream_filters(stub):
+    chunks = list(stub.StreamBooks(book_pb2.StreamBooksRequest(category="Computer Science", available_only=True)))
+
+    assert [b.title for chunk in chunks for b in chunk.books] == ["Algorithms", "Algorithms", "Databases"]
+
+
+def test_stream_of_nothing_sends_no_chunks(stub):
+    assert list(stub.StreamBooks(book_pb2.StreamBooksRequest(category="Poetry"))) == []
+
+
+def test_stream_rejects_bad_token(stub):
+    with pytest.raises(grpc.RpcError) as error:
+        list(stub.StreamBooks(book_pb2.StreamBooksRequest(page_token="nope")))
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
@@ -1,8 +1,12 @@
 
 # from . import borrowing_pb2, borrowing_pb2_grpc
 
+import argparse
+import base64
 import grpc
+import json
 from concurrent import futures
+from datetime import datetime
 import time
 import logging
 
@@ -19,6 +23,37 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s"
 )
 
+# --------------------------------------------------
+# Helpers
+# --------------------------------------------------
+def borrow_to_proto(b):
+    """Convert a BorrowedBook row to its protobuf message"""
+    return borrowing_pb2.BorrowedBook(
+        borrow_id=b.borrow_id,
+        book_id=b.book_id,
+        borrowed_date=b.borrowed_date.strftime("%Y-%m-%d"),
+        due_date=b.due_date.strftime("%Y-%m-%d") if b.due_date else "",
+        user_id=b.user_id,
+        returned=b.returned,
+        returned_date=b.returned_date.strftime("%Y-%m-%d") if b.returned_date else "",
+        fine_amount=b.fine_amount,
+        is_overdue=b.is_overdue(),
+        days_overdue=b.days_overdue()
+    )
+
+def encode_cursor(due_date, borrow_id):
+    """Opaque keyset cursor for the overdue stream"""
+    raw = json.dumps([due_date.isoformat(), borrow_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor):
+    """(due_date, borrow_id) from encode_cursor; ValueError when malformed"""
+    try:
+        due_date, borrow_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(due_date), str(borrow_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid page_token") from e
+
 # --------------------------------------------------
 # gRPC Service Implementation
 # --------------------------------------------------
@@ -62,6 +97,14 @@ class BorrowingService(borrowing_pb2_grpc.BorrowingServiceServicer):
                 context.set_details("Could not update book availability.")
                 return borrowing_pb2.BorrowResponse(status="failed")
 
+            # Popularity counters; a failure here must not undo the borrow, and leaves
+            # the counters one short until they are rebuilt (--rebuild-counters)
+            try:
+                crud.record_borrow(db, request.book_id)
+            except Exception as e:
+                db.rollback()
+                logging.error(f"❌ Error updating borrow counters (run --rebuild-counters to resync): {str(e)}")
+
             logging.info(f"✅ Book borrowed successfully (borrow_id={borrow.borrow_id})")
             return borrowing_pb2.BorrowResponse(
                 borrow_id=borrow.borrow_id,
@@ -96,18 +139,7 @@ class BorrowingService(borrowing_pb2_grpc.BorrowingServiceServicer):
                 # This ensures consistency - the user has returned the book
 
             # Build the full borrowing response with fine details
-            borrowed_book = borrowing_pb2.BorrowedBook(
-                borrow_id=borrow.borrow_id,
-                book_id=borrow.book_id,
-                borrowed_date=borrow.borrowed_date.strftime("%Y-%m-%d"),
-                due_date=borrow.due_date.strftime("%Y-%m-%d") if borrow.due_date else "",
-                user_id=borrow.user_id,
-                returned=borrow.returned,
-                returned_date=borrow.returned_date.strftime("%Y-%m-%d") if borrow.returned_date else "",
-                fine_amount=borrow.fine_amount,
-                is_overdue=borrow.is_overdue(),
-                days_overdue=borrow.days_overdue()
-            )
+            borrowed_book = borrow_to_proto(borrow)
 
             logging.info(f"✅ Book returned successfully (borrow_id={request.borrow_id}), fine=${borrow.fine_amount}")
             return borrowing_pb2.ReturnResponse(
@@ -128,21 +160,7 @@ class BorrowingService(borrowing_pb2_grpc.BorrowingServiceServicer):
             logging.info(f"📋 GetBorrowedBooks request: user_id={request.user_id}")
             borrows = crud.get_borrowed_books_by_user(db, request.user_id)
 
-            borrowed_books = [
-                borrowing_pb2.BorrowedBook(
-                    borrow_id=b.borrow_id,
-                    book_id=b.book_id,
-                    borrowed_date=b.borrowed_date.strftime("%Y-%m-%d"),
-                    due_date=b.due_date.strftime("%Y-%m-%d") if b.due_date else "",
-                    user_id=b.user_id,
-                    returned=b.returned,
-                    returned_date=b.returned_date.strftime("%Y-%m-%d") if b.returned_date else "",
-                    fine_amount=b.fine_amount,
-                    is_overdue=b.is_overdue(),
-                    days_overdue=b.days_overdue()
-                )
-                for b in borrows
-            ]
+            borrowed_books = [borrow_to_proto(b) for b in borrows]
             logging.info(f"✅ Found {len(borrowed_books)} borrowed books for user {request.user_id}")
             return borrowing_pb2.BorrowedBooksResponse(borrowed_books=borrowed_books)
         except Exception as e:
@@ -153,12 +171,82 @@ class BorrowingService(borrowing_pb2_grpc.BorrowingServiceServicer):
         finally:
             db.close()
 
+    def GetBorrowingStats(self, request, context):
+        db = SessionLocal()
+        try:
+            total, active, overdue, fines = crud.get_borrowing_stats(db)
+            return borrowing_pb2.BorrowingStatsResponse(
+                total_borrowings=total,
+                active_borrowings=active,
+                overdue_borrowings=overdue,
+                total_fines=fines
+            )
+        except Exception as e:
+            logging.error(f"❌ Error computing borrowing stats: {str(e)}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details("Error computing borrowing statistics.")
+            return borrowing_pb2.BorrowingStatsResponse()
+        finally:
+            db.close()
+
+    def GetTopBooks(self, request, context):
+        if request.limit < 0 or request.window_days < 0:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "limit and window_days must not be negative")
+        limit = min(request.limit, crud.MAX_TOP_BOOKS) if request.limit else 10
+        db = SessionLocal()
+        try:
+            rows = crud.get_top_books(db, limit, request.window_days)
+            return borrowing_pb2.TopBooksResponse(books=[
+                borrowing_pb2.TopBook(book_id=book_id, borrow_count=borrows) for book_id, borrows in rows
+            ])
+        except Exception as e:
+            logging.error(f"❌ Error fetching top books: {str(e)}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details("Error retrieving top books.")
+            return borrowing_pb2.TopBooksResponse()
+        finally:
+            db.close()
+
+    def ListOverdue(self, request, context):
+        if request.limit < 0:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "limit must not be negative")
+        after = None
+        if request.page_token:
+            try:
+                after = decode_cursor(request.page_token)
+            except ValueError as e:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        # One cut-off for the whole stream, so loans do not become overdue halfway through it
+        now = datetime.utcnow()
+        sent = 0
+        while context.is_active():
+            batch_size = crud.OVERDUE_BATCH_SIZE
+            if request.limit:
+                batch_size = min(batch_size, request.limit - sent)
+            # A short session per batch: no transaction stays open while the client reads
+            db = SessionLocal()
+            try:
+                loans = crud.get_overdue_page(db, now, after, batch_size)
+                batch = [(borrow_to_proto(b), encode_cursor(b.due_date, b.borrow_id)) for b in loans]
+            finally:
+                db.close()
+
+            for borrowing, cursor in batch:
+                yield borrowing_pb2.OverdueLoan(borrowing=borrowing, cursor=cursor)
+            sent += len(batch)
+            if len(batch) < batch_size or sent == request.limit:
+                return
+            after = (loans[-1].due_date, loans[-1].borrow_id)
+
 # --------------------------------------------------
 # gRPC Server Setup
 # --------------------------------------------------
 def serve():
     # --- Ensure tables exist on startup ---
     models.create_db_and_tables()
+    with SessionLocal() as db:
+        crud.ensure_borrow_counts(db)
 
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
     borrowing_pb2_grpc.add_BorrowingServiceServicer_to_server(BorrowingService(), server)
@@ -175,5 +263,19 @@ def serve():
         server.stop(0)
 
 
+def rebuild_counters():
+    """Recompute the popularity counters from borrowed_books, e.g. after counter update errors"""
+    with SessionLocal() as db:
+        crud.rebuild_borrow_counts(db)
+        books = db.query(models.BookBorrowTotal).count()
+    logging.info(f"✅ Rebuilt borrow counters for {books} books")
+
+
 if __name__ == "__main__":
-    serve()
+    parser = argparse.ArgumentParser(description="Borrowing gRPC service")
+    parser.add_argument("--rebuild-counters", action="store_true",
+                        help="recompute the popularity counters from the loans, then exit")
+    if parser.parse_args().rebuild_counters:
+        rebuild_counters()
+    else:
+        serve()
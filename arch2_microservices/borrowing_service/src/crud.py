@@ -1,8 +1,14 @@
+from sqlalchemy import and_, case, func, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from . import models
 import uuid
 from datetime import datetime, timedelta
 
+MAX_TOP_BOOKS = 100
+OVERDUE_BATCH_SIZE = 500
+MAX_WINDOW_DAYS = 365
+
 # ------------------------------
 # CRUD Operations
 # ------------------------------
@@ -51,6 +57,98 @@ def get_overdue_books(db: Session):
         models.BorrowedBook.due_date < now
     ).all()
 
+def get_overdue_page(db: Session, now: datetime, after: tuple = None, limit: int = OVERDUE_BATCH_SIZE):
+    """Overdue loans, oldest due date first, after the (due_date, borrow_id) keyset cursor"""
+    loan = models.BorrowedBook
+    query = db.query(loan).filter(loan.returned == False, loan.due_date < now)
+    if after:
+        query = query.filter(tuple_(loan.due_date, loan.borrow_id) > tuple_(*after))
+    return query.order_by(loan.due_date, loan.borrow_id).limit(limit).all()
+
 def get_all_borrowings(db: Session):
     """Get all borrowing records"""
     return db.query(models.BorrowedBook).all()
+
+def get_borrowing_stats(db: Session):
+    """Loan totals in one aggregate query: (total, active, overdue, fines)"""
+    now = datetime.utcnow()
+    active = models.BorrowedBook.returned == False
+    return db.query(
+        func.count(models.BorrowedBook.borrow_id),
+        func.count(case((active, 1))),
+        func.count(case((and_(active, models.BorrowedBook.due_date < now), 1))),
+        func.coalesce(func.sum(models.BorrowedBook.fine_amount), 0.0),
+    ).one()
+
+# ------------------------------
+# Popularity counters
+# ------------------------------
+
+def _upsert(db: Session):
+    """INSERT ... ON CONFLICT for the session's database (PostgreSQL or SQLite)"""
+    return {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[db.get_bind().dialect.name]
+
+# Day this process last pruned book_borrow_daily; the first borrow of each day prunes it
+_pruned_on = None
+
+def record_borrow(db: Session, book_id: str, when: datetime = None):
+    """Count one borrow of a book in the all-time and daily counters"""
+    global _pruned_on
+    upsert = _upsert(db)
+    today = datetime.utcnow().date()
+    day = when.date() if when else today
+    total, daily = models.BookBorrowTotal, models.BookBorrowDaily
+    db.execute(upsert(total).values(book_id=book_id, borrows=1).on_conflict_do_update(
+        index_elements=[total.book_id], set_={"borrows": total.borrows + 1}))
+    db.execute(upsert(daily).values(day=day, book_id=book_id, borrows=1).on_conflict_do_update(
+        index_elements=[daily.day, daily.book_id], set_={"borrows": daily.borrows + 1}))
+    if _pruned_on != today:
+        prune_borrow_daily(db, today)
+    db.commit()
+    _pruned_on = today
+
+def prune_borrow_daily(db: Session, today=None):
+    """Delete daily counters older than the longest GetTopBooks window (MAX_WINDOW_DAYS)"""
+    oldest = (today or datetime.utcnow().date()) - timedelta(days=MAX_WINDOW_DAYS - 1)
+    return db.query(models.BookBorrowDaily).filter(
+        models.BookBorrowDaily.day < oldest).delete(synchronize_session=False)
+
+def get_top_books(db: Session, limit: int = 10, window_days: int = 0):
+    """(book_id, borrows) for the most borrowed books, all time or over the last window_days days"""
+    if window_days:
+        daily = models.BookBorrowDaily
+        since = datetime.utcnow().date() - timedelta(days=min(window_days, MAX_WINDOW_DAYS) - 1)
+        borrows = func.sum(daily.borrows).label("borrows")
+        return db.query(daily.book_id, borrows).filter(daily.day >= since).group_by(
+            daily.book_id).order_by(borrows.desc(), daily.book_id.desc()).limit(limit).all()
+
+    total = models.BookBorrowTotal
+    return db.query(total.book_id, total.borrows).order_by(
+        total.borrows.desc(), total.book_id.desc()).limit(limit).all()
+
+def rebuild_borrow_counts(db: Session):
+    """Recompute the popularity counters from borrowed_books (for loans written around BorrowBook)"""
+    loan, total, daily = models.BorrowedBook, models.BookBorrowTotal, models.BookBorrowDaily
+    day = func.date(loan.borrowed_date)
+    since = datetime.utcnow() - timedelta(days=MAX_WINDOW_DAYS)
+    db.query(total).delete()
+    db.query(daily).delete()
+    db.execute(insert(total).from_select(
+        ["book_id", "borrows"],
+        select(loan.book_id, func.count()).group_by(loan.book_id)))
+    db.execute(insert(daily).from_select(
+        ["day", "book_id", "borrows"],
+        select(day, loan.book_id, func.count()).where(loan.borrowed_date >= since).group_by(day, loan.book_id)))
+    db.commit()
+
+def ensure_borrow_counts(db: Session):
+    """Backfill the counters once, when they are empty but loans already exist; prune old days otherwise
+
+    A borrow whose counter update failed is not counted here again: run
+    `python -m src.borrowing_server --rebuild-counters` to resync the counters.
+    """
+    if db.query(models.BookBorrowTotal.book_id).first() is None and db.query(models.BorrowedBook.borrow_id).first():
+        rebuild_borrow_counts(db)
+    else:
+        prune_borrow_daily(db)
+        db.commit()
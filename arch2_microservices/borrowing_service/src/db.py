@@ -1,6 +1,9 @@
 import os
-from sqlalchemy import create_engine
+import re
+import time
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.schema import CreateIndex
 from contextlib import contextmanager
 
 # Database URL from environment variables (fallback to local SQLite for testing)
@@ -18,6 +21,53 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
+# pg_advisory_lock key shared by borrowing service replicas building indexes at startup
+_INDEX_LOCK_ID = 0x626f72726f77
+
+
+def create_missing_indexes(bind=None):
+    """Build the model indexes an existing table lacks; create_all only indexes tables it creates.
+
+    On PostgreSQL each index is built with CREATE INDEX CONCURRENTLY IF NOT EXISTS,
+    so writes to the table carry on, under an advisory lock so replicas starting
+    together take turns. Elsewhere each index is checked for first. Either way this
+    is a no-op once they exist.
+    """
+    bind = bind or engine
+    if bind.dialect.name != 'postgresql':
+        with bind.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+        return
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with bind.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        # Poll rather than block in pg_advisory_lock: a waiting statement holds a
+        # snapshot, which the holder's CREATE INDEX CONCURRENTLY would wait on (deadlock)
+        while not conn.execute(text('SELECT pg_try_advisory_lock(:id)'), {'id': _INDEX_LOCK_ID}).scalar():
+            time.sleep(1)
+        try:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    _create_index_concurrently(conn, index)
+        finally:
+            conn.execute(text('SELECT pg_advisory_unlock(:id)'), {'id': _INDEX_LOCK_ID})
+
+
+def _create_index_concurrently(conn, index):
+    # An interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index behind
+    # that IF NOT EXISTS would silently keep
+    invalid = conn.execute(text(
+        'SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+        'WHERE pg_class.relname = :name AND NOT pg_index.indisvalid'
+    ), {'name': index.name}).first()
+    if invalid:
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {index.name}'))
+
+    ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect))
+    conn.execute(text(re.sub(r'^CREATE (UNIQUE )?INDEX ', r'CREATE \1INDEX CONCURRENTLY ', ddl)))
+
 @contextmanager
 def get_db():
     """Provide transactional scope around a series of operations."""
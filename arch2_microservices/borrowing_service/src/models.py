@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Float, Integer
+from sqlalchemy import Column, String, Date, DateTime, Boolean, Float, Integer, Index
 from sqlalchemy.sql import func
 from datetime import datetime, timezone
-from .db import Base, engine
+from .db import Base, engine, create_missing_indexes
 
 class BorrowedBook(Base):
     __tablename__ = "borrowed_books"
@@ -17,19 +17,28 @@ class BorrowedBook(Base):
     returned = Column(Boolean, default=False, index=True)
     fine_amount = Column(Float, default=0.0)
 
+    # ListOverdue walks open loans in due-date order
+    __table_args__ = (Index("ix_borrowed_books_returned_due_date", "returned", "due_date", "borrow_id"),)
+
+    def _due_date_utc(self):
+        # SQLite hands back naive datetimes; they are stored in UTC
+        if self.due_date is not None and self.due_date.tzinfo is None:
+            return self.due_date.replace(tzinfo=timezone.utc)
+        return self.due_date
+
     def is_overdue(self):
         """Check if borrowing is overdue"""
         if self.returned:
             return False
         now = datetime.now(timezone.utc)
-        return now > self.due_date if self.due_date else False
+        return now > self._due_date_utc() if self.due_date else False
 
     def days_overdue(self):
         """Calculate days overdue"""
         if not self.is_overdue():
             return 0
         now = datetime.now(timezone.utc)
-        return (now - self.due_date).days if self.due_date else 0
+        return (now - self._due_date_utc()).days if self.due_date else 0
 
 
 class Reservation(Base):
@@ -45,8 +54,29 @@ class Reservation(Base):
     notified = Column(Boolean, default=False)
 
 
+class BookBorrowTotal(Base):
+    """All-time borrow count per book, maintained by BorrowBook"""
+    __tablename__ = "book_borrow_totals"
+
+    book_id = Column(String, primary_key=True)
+    borrows = Column(Integer, nullable=False, default=0)
+
+    # Top-K is a scan of the first K index entries
+    __table_args__ = (Index("ix_book_borrow_totals_borrows_book", "borrows", "book_id"),)
+
+
+class BookBorrowDaily(Base):
+    """Borrows per book per UTC day, maintained by BorrowBook; windowed rankings sum the recent days"""
+    __tablename__ = "book_borrow_daily"
+
+    day = Column(Date, primary_key=True)
+    book_id = Column(String, primary_key=True)
+    borrows = Column(Integer, nullable=False, default=0)
+
+
 def create_db_and_tables():
     """Creates all tables defined on Base if they do not exist."""
     print("Attempting to create borrowing database tables...")
     Base.metadata.create_all(bind=engine)
+    create_missing_indexes()
     print("Borrowing database tables created successfully.")
\ No newline at end of file
@@ -1,11 +1,12 @@
 import grpc
 import pytest
 from concurrent import futures
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from src import borrowing_pb2, borrowing_pb2_grpc
+from src import book_pb2, borrowing_pb2, borrowing_pb2_grpc
 from src.borrowing_server import BorrowingService
-from src.db import SessionLocal, Base, engine
+from sqlalchemy import create_engine, inspect, text
+from src.db import SessionLocal, Base, engine, create_missing_indexes
 from src import crud, models
 
 # -------------------------------
@@ -32,6 +33,8 @@ def db_session_cleanup():
     finally:
         db.rollback()
         db.query(models.BorrowedBook).delete()
+        db.query(models.BookBorrowTotal).delete()
+        db.query(models.BookBorrowDaily).delete()
         db.commit()
         db.close()
 
@@ -113,3 +116,192 @@ def test_return_book(grpc_stub):
     deleted_borrow = db.query(models.BorrowedBook).filter_by(borrow_id=borrow.borrow_id).first()
     db.close()
     assert deleted_borrow is None
+
+
+def test_borrowing_stats(grpc_stub):
+    """
+    Test GetBorrowingStats counts active, overdue and returned loans in SQL.
+    """
+    now = datetime.utcnow()
+    db = SessionLocal()
+    db.add_all([
+        models.BorrowedBook(borrow_id="active", user_id="u1", book_id="b1", due_date=now + timedelta(days=7)),
+        models.BorrowedBook(borrow_id="overdue", user_id="u1", book_id="b2", due_date=now - timedelta(days=3)),
+        models.BorrowedBook(borrow_id="returned", user_id="u2", book_id="b1", due_date=now - timedelta(days=9),
+                            returned=True, returned_date=now, fine_amount=2.5),
+    ])
+    db.commit()
+    db.close()
+
+    stats = grpc_stub.GetBorrowingStats(borrowing_pb2.BorrowingStatsRequest())
+
+    assert (stats.total_borrowings, stats.active_borrowings, stats.overdue_borrowings) == (3, 2, 1)
+    assert stats.total_fines == pytest.approx(2.5)
+
+
+class FakeBookClient:
+    """Book service double: every book has a free copy"""
+
+    def get_book(self, book_id):
+        return book_pb2.GetBookResponse(book=book_pb2.Book(id=book_id, available_copies=1))
+
+    def update_available_copies(self, book_id, increment):
+        return book_pb2.UpdateAvailableCopiesResponse()
+
+
+def test_borrow_book_counts_towards_top_books():
+    """
+    Test BorrowBook maintains the counters that GetTopBooks ranks by.
+    """
+    service = BorrowingService()
+    service.book_client = FakeBookClient()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    borrowing_pb2_grpc.add_BorrowingServiceServicer_to_server(service, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    try:
+        stub = borrowing_pb2_grpc.BorrowingServiceStub(grpc.insecure_channel(f"localhost:{port}"))
+        for user_id, book_id in [("u1", "b1"), ("u2", "b2"), ("u3", "b2"), ("u4", "b3"), ("u5", "b2"), ("u6", "b1")]:
+            assert stub.BorrowBook(borrowing_pb2.BorrowRequest(user_id=user_id, book_id=book_id)).status == "success"
+
+        top = stub.GetTopBooks(borrowing_pb2.TopBooksRequest(limit=2)).books
+    finally:
+        server.stop(None)
+
+    assert [(t.book_id, t.borrow_count) for t in top] == [("b2", 3), ("b1", 2)]
+
+
+def test_top_books_window(grpc_stub):
+    """
+    Test GetTopBooks over a window only counts recent borrows.
+    """
+    now = datetime.utcnow()
+    db = SessionLocal()
+    for days_ago, book_id in [(0, "new"), (1, "new"), (40, "old"), (41, "old"), (42, "old")]:
+        crud.record_borrow(db, book_id, when=now - timedelta(days=days_ago))
+    db.close()
+
+    all_time = grpc_stub.GetTopBooks(borrowing_pb2.TopBooksRequest()).books
+    last_week = grpc_stub.GetTopBooks(borrowing_pb2.TopBooksRequest(window_days=7)).books
+
+    assert [(t.book_id, t.borrow_count) for t in all_time] == [("old", 3), ("new", 2)]
+    assert [(t.book_id, t.borrow_count) for t in last_week] == [("new", 2)]
+
+
+def test_counters_are_rebuilt_from_existing_loans():
+    """
+    Test the one-off backfill for loans that predate the counters.
+    """
+    db = SessionLocal()
+    for n, book_id in enumerate(["b1", "b2", "b2"]):
+        db.add(models.BorrowedBook(borrow_id=f"loan-{n}", user_id="u1", book_id=book_id,
+                                   borrowed_date=datetime.utcnow(), due_date=datetime.utcnow()))
+    db.commit()
+
+    crud.ensure_borrow_counts(db)
+    crud.ensure_borrow_counts(db)  # only when empty: no double counting
+
+    assert crud.get_top_books(db) == [("b2", 2), ("b1", 1)]
+    assert crud.get_top_books(db, window_days=1) == [("b2", 2), ("b1", 1)]
+    db.close()
+
+
+def test_old_daily_counters_are_pruned(monkeypatch):
+    """
+    Test the first borrow of a day drops daily counters outside the longest window.
+    """
+    monkeypatch.setattr(crud, "_pruned_on", None)
+    now = datetime.utcnow()
+    db = SessionLocal()
+    for days_ago in (crud.MAX_WINDOW_DAYS, crud.MAX_WINDOW_DAYS - 1):
+        db.add(models.BookBorrowDaily(day=(now - timedelta(days=days_ago)).date(), book_id="old", borrows=1))
+    db.commit()
+
+    crud.record_borrow(db, "new")
+
+    assert sorted((now.date() - row.day).days for row in db.query(models.BookBorrowDaily)) == [0, crud.MAX_WINDOW_DAYS - 1]
+    assert crud.get_top_books(db, window_days=crud.MAX_WINDOW_DAYS) == [("old", 1), ("new", 1)]
+    db.close()
+
+
+def test_rebuild_counters_repairs_missed_borrows():
+    """
+    Test the --rebuild-counters entry point recounts loans whose counter update failed.
+    """
+    from src import borrowing_server
+    db = SessionLocal()
+    crud.record_borrow(db, "b1")
+    for n in range(3):  # the first borrow was counted, two were not
+        db.add(models.BorrowedBook(borrow_id=f"loan-{n}", user_id="u1", book_id="b1",
+                                   borrowed_date=datetime.utcnow(), due_date=datetime.utcnow()))
+    db.commit()
+    crud.ensure_borrow_counts(db)  # counters are not empty: left as they are
+    assert crud.get_top_books(db) == [("b1", 1)]
+
+    borrowing_server.rebuild_counters()
+
+    assert crud.get_top_books(db) == [("b1", 3)]
+    assert crud.get_top_books(db, window_days=1) == [("b1", 3)]
+    db.close()
+
+
+def _add_loans(*loans):
+    db = SessionLocal()
+    now = datetime.utcnow()
+    for borrow_id, days_overdue, returned in loans:
+        db.add(models.BorrowedBook(borrow_id=borrow_id, user_id="u1", book_id=f"book-{borrow_id}",
+                                   borrowed_date=now - timedelta(days=20), returned=returned,
+                                   due_date=now - timedelta(days=days_overdue)))
+    db.commit()
+    db.close()
+
+
+def test_list_overdue_streams_in_batches(grpc_stub, monkeypatch):
+    """
+    Test ListOverdue streams every overdue loan, most overdue first, across keyset batches.
+    """
+    monkeypatch.setattr(crud, "OVERDUE_BATCH_SIZE", 2)
+    _add_loans(("a", 3, False), ("b", 9, False), ("c", 1, False), ("d", 5, False), ("e", 6, False),
+               ("not-due", -2, False), ("returned", 8, True))
+
+    loans = list(grpc_stub.ListOverdue(borrowing_pb2.ListOverdueRequest()))
+
+    assert [loan.borrowing.borrow_id for loan in loans] == ["b", "e", "d", "a", "c"]
+    assert loans[0].borrowing.is_overdue and loans[0].borrowing.days_overdue == 9
+
+
+def test_list_overdue_resumes_from_a_cursor(grpc_stub, monkeypatch):
+    """
+    Test limit plus the cursor of the last loan received pages through the set.
+    """
+    monkeypatch.setattr(crud, "OVERDUE_BATCH_SIZE", 2)
+    _add_loans(("a", 3, False), ("b", 9, False), ("c", 1, False), ("d", 5, False), ("e", 6, False))
+
+    first = list(grpc_stub.ListOverdue(borrowing_pb2.ListOverdueRequest(limit=3)))
+    rest = list(grpc_stub.ListOverdue(borrowing_pb2.ListOverdueRequest(page_token=first[-1].cursor)))
+
+    assert [loan.borrowing.borrow_id for loan in first] == ["b", "e", "d"]
+    assert [loan.borrowing.borrow_id for loan in rest] == ["a", "c"]
+
+
+def test_list_overdue_rejects_a_bad_cursor(grpc_stub):
+    """
+    Test a malformed page_token is a client error.
+    """
+    with pytest.raises(grpc.RpcError) as error:
+        list(grpc_stub.ListOverdue(borrowing_pb2.ListOverdueRequest(page_token="nope")))
+
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_missing_indexes_are_added_to_an_existing_table(tmp_path):
+    old_engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(old_engine)
+    with old_engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_borrowed_books_returned_due_date"))
+
+    create_missing_indexes(old_engine)
+    create_missing_indexes(old_engine)  # and again, once it exists
+
+    names = {index["name"] for index in inspect(old_engine).get_indexes("borrowed_books")}
+    assert "ix_borrowed_books_returned_due_date" in names
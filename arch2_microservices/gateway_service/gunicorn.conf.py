@@ -0,0 +1,62 @@
+"""
+Gunicorn configuration for the API gateway.
+
+Usage:
+    gunicorn -c gunicorn.conf.py src.gateway_server:app
+
+Every setting can be overridden through the environment. Send SIGHUP to the
+master process for a graceful reload.
+"""
+import glob
+import multiprocessing
+import os
+import tempfile
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+# sync    - one request per worker process
+# gthread - GUNICORN_THREADS requests per worker; gRPC calls release the GIL
+# gevent  - cooperative greenlets (requires `pip install gevent`)
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# gRPC channels are created lazily on the first request in each worker,
+# so preloading the Flask app in the master is fork-safe.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false' if worker_class == 'gevent' else 'true').lower() == 'true'
+
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Workers publish their /metrics totals here so any of them can answer a scrape
+metrics_dir = os.environ.get('METRICS_DIR') or tempfile.mkdtemp(prefix='gateway-metrics-')
+os.environ['METRICS_DIR'] = metrics_dir
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.getenv('GUNICORN_ERROR_LOG', '-')
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Start from empty metrics when reusing a METRICS_DIR from a previous run"""
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+        os.remove(path)
+
+
+def child_exit(server, worker):
+    """Keep an exited worker's request counts in the /metrics totals"""
+    from src.metrics import mark_process_dead
+    mark_process_dead(metrics_dir, worker.pid)
+
+
+def post_worker_init(worker):
+    """Let gRPC cooperate with the gevent loop"""
+    if worker_class == 'gevent':
+        import grpc.experimental.gevent as grpc_gevent
+        grpc_gevent.init_gevent()
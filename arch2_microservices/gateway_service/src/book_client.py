@@ -21,9 +21,45 @@ class BookClient:
         request = book_pb2.GetBookRequest(id=book_id)
         return self.stub.GetBook(request)
 
-    def list_books(self):
-        request = book_pb2.ListBooksRequest()
-        return self.stub.ListBooks(request)
+    def batch_get_books(self, book_ids, timeout: float = None):
+        request = book_pb2.BatchGetBooksRequest(ids=list(book_ids))
+        return self.stub.BatchGetBooks(request, timeout=timeout)
+
+    def list_books(self, page_size: int = 0, page_token: str = "", category: str = "",
+                   available_only: bool = False, page: int = 0, include_total: bool = False,
+                   timeout: float = None):
+        request = book_pb2.ListBooksRequest(
+            page_size=page_size,
+            page_token=page_token,
+            category=category,
+            available_only=available_only,
+            page=page,
+            include_total=include_total
+        )
+        return self.stub.ListBooks(request, timeout=timeout)
+
+    def search_books(self, query: str, page_size: int = 0, page_token: str = "", available_only: bool = False):
+        request = book_pb2.SearchBooksRequest(
+            query=query,
+            page_size=page_size,
+            page_token=page_token,
+            available_only=available_only
+        )
+        return self.stub.SearchBooks(request)
+
+    def stream_books(self, category: str = "", available_only: bool = False, page_token: str = "",
+                     chunk_size: int = 0, timeout: float = None):
+        """Stream the catalog in BookChunks, in title order; the returned iterator can be cancel()ed."""
+        request = book_pb2.StreamBooksRequest(
+            category=category,
+            available_only=available_only,
+            page_token=page_token,
+            chunk_size=chunk_size
+        )
+        return self.stub.StreamBooks(request, timeout=timeout)
+
+    def get_book_stats(self, timeout: float = None):
+        return self.stub.GetBookStats(book_pb2.GetBookStatsRequest(), timeout=timeout)
 
     def update_book_status(self, book_id: str, status: str):
         request = book_pb2.UpdateBookStatusRequest(id=book_id, status=status)
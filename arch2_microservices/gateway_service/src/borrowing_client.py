@@ -16,7 +16,22 @@ class BorrowingClient:
         request = borrowing_pb2.ReturnRequest(borrow_id=borrow_id)
         return self.stub.ReturnBook(request)
 
-    def get_borrowed_books(self, user_id):
+    def get_borrowed_books(self, user_id, timeout=None):
         """Get all borrowed books for a given user."""
         request = borrowing_pb2.UserRequest(user_id=user_id)
-        return self.stub.GetBorrowedBooks(request)
+        return self.stub.GetBorrowedBooks(request, timeout=timeout)
+
+    def get_borrowing_stats(self, timeout=None):
+        """Get loan counts computed by the borrowing service."""
+        request = borrowing_pb2.BorrowingStatsRequest()
+        return self.stub.GetBorrowingStats(request, timeout=timeout)
+
+    def get_top_books(self, limit=10, window_days=0, timeout=None):
+        """Get the most borrowed book ids with their borrow counts."""
+        request = borrowing_pb2.TopBooksRequest(limit=limit, window_days=window_days)
+        return self.stub.GetTopBooks(request, timeout=timeout)
+
+    def list_overdue(self, limit=0, page_token="", timeout=None):
+        """Stream overdue loans, most overdue first; the returned iterator can be cancel()ed."""
+        request = borrowing_pb2.ListOverdueRequest(limit=limit, page_token=page_token)
+        return self.stub.ListOverdue(request, timeout=timeout)
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x62orrowing.proto\x12\tborrowing\"1\n\rBorrowRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\"3\n\x0e\x42orrowResponse\x12\x11\n\tborrow_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\"\"\n\rReturnRequest\x12\x11\n\tborrow_id\x18\x01 \x01(\t\"L\n\x0eReturnResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12*\n\tborrowing\x18\x02 \x01(\x0b\x32\x17.borrowing.BorrowedBook\"\x1e\n\x0bUserRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"H\n\x15\x42orrowedBooksResponse\x12/\n\x0e\x62orrowed_books\x18\x01 \x03(\x0b\x32\x17.borrowing.BorrowedBook\"\xd4\x01\n\x0c\x42orrowedBook\x12\x11\n\tborrow_id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\x12\x15\n\rborrowed_date\x18\x03 \x01(\t\x12\x10\n\x08\x64ue_date\x18\x04 \x01(\t\x12\x0f\n\x07user_id\x18\x05 \x01(\t\x12\x10\n\x08returned\x18\x06 \x01(\x08\x12\x15\n\rreturned_date\x18\x07 \x01(\t\x12\x13\n\x0b\x66ine_amount\x18\x08 \x01(\x02\x12\x12\n\nis_overdue\x18\t \x01(\x08\x12\x14\n\x0c\x64\x61ys_overdue\x18\n \x01(\x05\x32\xe6\x01\n\x10\x42orrowingService\x12\x41\n\nBorrowBook\x12\x18.borrowing.BorrowRequest\x1a\x19.borrowing.BorrowResponse\x12\x41\n\nReturnBook\x12\x18.borrowing.ReturnRequest\x1a\x19.borrowing.ReturnResponse\x12L\n\x10GetBorrowedBooks\x12\x16.borrowing.UserRequest\x1a .borrowing.BorrowedBooksResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x62orrowing.proto\x12\tborrowing\"1\n\rBorrowRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\"3\n\x0e\x42orrowResponse\x12\x11\n\tborrow_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\"\"\n\rReturnRequest\x12\x11\n\tborrow_id\x18\x01 \x01(\t\"L\n\x0eReturnResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12*\n\tborrowing\x18\x02 \x01(\x0b\x32\x17.borrowing.BorrowedBook\"\x1e\n\x0bUserRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"H\n\x15\x42orrowedBooksResponse\x12/\n\x0e\x62orrowed_books\x18\x01 \x03(\x0b\x32\x17.borrowing.BorrowedBook\"\x17\n\x15\x42orrowingStatsRequest\"~\n\x16\x42orrowingStatsResponse\x12\x18\n\x10total_borrowings\x18\x01 \x01(\x05\x12\x19\n\x11\x61\x63tive_borrowings\x18\x02 \x01(\x05\x12\x1a\n\x12overdue_borrowings\x18\x03 \x01(\x05\x12\x13\n\x0btotal_fines\x18\x04 \x01(\x02\"5\n\x0fTopBooksRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\x12\x13\n\x0bwindow_days\x18\x02 \x01(\x05\"5\n\x10TopBooksResponse\x12!\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\x12.borrowing.TopBook\"0\n\x07TopBook\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12\x14\n\x0c\x62orrow_count\x18\x02 \x01(\x05\"7\n\x12ListOverdueRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\x12\x12\n\npage_token\x18\x02 \x01(\t\"I\n\x0bOverdueLoan\x12*\n\tborrowing\x18\x01 \x01(\x0b\x32\x17.borrowing.BorrowedBook\x12\x0e\n\x06\x63ursor\x18\x02 \x01(\t\"\xd4\x01\n\x0c\x42orrowedBook\x12\x11\n\tborrow_id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\x12\x15\n\rborrowed_date\x18\x03 \x01(\t\x12\x10\n\x08\x64ue_date\x18\x04 \x01(\t\x12\x0f\n\x07user_id\x18\x05 \x01(\t\x12\x10\n\x08returned\x18\x06 \x01(\x08\x12\x15\n\rreturned_date\x18\x07 \x01(\t\x12\x13\n\x0b\x66ine_amount\x18\x08 \x01(\x02\x12\x12\n\nis_overdue\x18\t \x01(\x08\x12\x14\n\x0c\x64\x61ys_overdue\x18\n \x01(\x05\x32\xd0\x03\n\x10\x42orrowingService\x12\x41\n\nBorrowBook\x12\x18.borrowing.BorrowRequest\x1a\x19.borrowing.BorrowResponse\x12\x41\n\nReturnBook\x12\x18.borrowing.ReturnRequest\x1a\x19.borrowing.ReturnResponse\x12L\n\x10GetBorrowedBooks\x12\x16.borrowing.UserRequest\x1a .borrowing.BorrowedBooksResponse\x12X\n\x11GetBorrowingStats\x12 .borrowing.BorrowingStatsRequest\x1a!.borrowing.BorrowingStatsResponse\x12\x46\n\x0bGetTopBooks\x12\x1a.borrowing.TopBooksRequest\x1a\x1b.borrowing.TopBooksResponse\x12\x46\n\x0bListOverdue\x12\x1d.borrowing.ListOverdueRequest\x1a\x16.borrowing.OverdueLoan0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -43,8 +43,22 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_USERREQUEST']._serialized_end=278
   _globals['_BORROWEDBOOKSRESPONSE']._serialized_start=280
   _globals['_BORROWEDBOOKSRESPONSE']._serialized_end=352
-  _globals['_BORROWEDBOOK']._serialized_start=355
-  _globals['_BORROWEDBOOK']._serialized_end=567
-  _globals['_BORROWINGSERVICE']._serialized_start=570
-  _globals['_BORROWINGSERVICE']._serialized_end=800
+  _globals['_BORROWINGSTATSREQUEST']._serialized_start=354
+  _globals['_BORROWINGSTATSREQUEST']._serialized_end=377
+  _globals['_BORROWINGSTATSRESPONSE']._serialized_start=379
+  _globals['_BORROWINGSTATSRESPONSE']._serialized_end=505
+  _globals['_TOPBOOKSREQUEST']._serialized_start=507
+  _globals['_TOPBOOKSREQUEST']._serialized_end=560
+  _globals['_TOPBOOKSRESPONSE']._serialized_start=562
+  _globals['_TOPBOOKSRESPONSE']._serialized_end=615
+  _globals['_TOPBOOK']._serialized_start=617
+  _globals['_TOPBOOK']._serialized_end=665
+  _globals['_LISTOVERDUEREQUEST']._serialized_start=667
+  _globals['_LISTOVERDUEREQUEST']._serialized_end=722
+  _globals['_OVERDUELOAN']._serialized_start=724
+  _globals['_OVERDUELOAN']._serialized_end=797
+  _globals['_BORROWEDBOOK']._serialized_start=800
+  _globals['_BORROWEDBOOK']._serialized_end=1012
+  _globals['_BORROWINGSERVICE']._serialized_start=1015
+  _globals['_BORROWINGSERVICE']._serialized_end=1479
 # @@protoc_insertion_point(module_scope)
@@ -50,6 +50,21 @@ class BorrowingServiceStub(object):
                 request_serializer=borrowing__pb2.UserRequest.SerializeToString,
                 response_deserializer=borrowing__pb2.BorrowedBooksResponse.FromString,
                 _registered_method=True)
+        self.GetBorrowingStats = channel.unary_unary(
+                '/borrowing.BorrowingService/GetBorrowingStats',
+                request_serializer=borrowing__pb2.BorrowingStatsRequest.SerializeToString,
+                response_deserializer=borrowing__pb2.BorrowingStatsResponse.FromString,
+                _registered_method=True)
+        self.GetTopBooks = channel.unary_unary(
+                '/borrowing.BorrowingService/GetTopBooks',
+                request_serializer=borrowing__pb2.TopBooksRequest.SerializeToString,
+                response_deserializer=borrowing__pb2.TopBooksResponse.FromString,
+                _registered_method=True)
+        self.ListOverdue = channel.unary_stream(
+                '/borrowing.BorrowingService/ListOverdue',
+                request_serializer=borrowing__pb2.ListOverdueRequest.SerializeToString,
+                response_deserializer=borrowing__pb2.OverdueLoan.FromString,
+                _registered_method=True)
 
 
 class BorrowingServiceServicer(object):
@@ -77,6 +92,27 @@ class BorrowingServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetBorrowingStats(self, request, context):
+        """Loan counts, computed in SQL
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTopBooks(self, request, context):
+        """Most borrowed books, from counters maintained by BorrowBook
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListOverdue(self, request, context):
+        """Overdue loans, most overdue first, streamed in batches read with a keyset cursor
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_BorrowingServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -95,6 +131,21 @@ def add_BorrowingServiceServicer_to_server(servicer, server):
                     request_deserializer=borrowing__pb2.UserRequest.FromString,
                     response_serializer=borrowing__pb2.BorrowedBooksResponse.SerializeToString,
             ),
+            'GetBorrowingStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBorrowingStats,
+                    request_deserializer=borrowing__pb2.BorrowingStatsRequest.FromString,
+                    response_serializer=borrowing__pb2.BorrowingStatsResponse.SerializeToString,
+            ),
+            'GetTopBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTopBooks,
+                    request_deserializer=borrowing__pb2.TopBooksRequest.FromString,
+                    response_serializer=borrowing__pb2.TopBooksResponse.SerializeToString,
+            ),
+            'ListOverdue': grpc.unary_stream_rpc_method_handler(
+                    servicer.ListOverdue,
+                    request_deserializer=borrowing__pb2.ListOverdueRequest.FromString,
+                    response_serializer=borrowing__pb2.OverdueLoan.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'borrowing.BorrowingService', rpc_method_handlers)
@@ -187,3 +238,84 @@ class BorrowingService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetBorrowingStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/borrowing.BorrowingService/GetBorrowingStats',
+            borrowing__pb2.BorrowingStatsRequest.SerializeToString,
+            borrowing__pb2.BorrowingStatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetTopBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/borrowing.BorrowingService/GetTopBooks',
+            borrowing__pb2.TopBooksRequest.SerializeToString,
+            borrowing__pb2.TopBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListOverdue(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/borrowing.BorrowingService/ListOverdue',
+            borrowing__pb2.ListOverdueRequest.SerializeToString,
+            borrowing__pb2.OverdueLoan.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,192 @@
+"""
+Catalog response cache for the gateway.
+
+Book reads (/api/books, /api/books/<id> and /api/books/search) are answered
+from here when possible instead of going to the book service and its database:
+
+    body = catalog_cache.book(book_id, load)             # load() -> JSON text or a JSON-ready value
+    body = catalog_cache.listing("search", params, load)
+
+The gateway caches the encoded response bodies, so a hit is sent as it is.
+
+Entries expire after GATEWAY_CACHE_TTL_SECONDS (default 5), which bounds how
+stale a read can be after writes this gateway does not see (another gateway,
+or a service writing on its own). Writes made through this gateway invalidate
+at once: invalidate(book_id) drops that book's entry and retires every list and
+search result by bumping the generation number that is part of their keys.
+
+Each worker keeps its own LRU of GATEWAY_CACHE_MAX_ENTRIES entries. With
+GATEWAY_CACHE_REDIS_URL set, all workers and gateway instances share one cache
+in Redis instead, and so see each other's invalidations. Without the redis
+package or server, the in-process LRU is used. Errors from load() propagate and
+are never cached.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from src.metrics import hit_ratio, labels, registry
+
+CACHE_HIT, CACHE_MISS, CACHE_ERROR = labels(result='hit'), labels(result='miss'), labels(result='error')
+registry.describe('cache_requests_total', 'counter', 'Catalog cache lookups by result (hit, miss, error)')
+registry.add_derived('cache_hit_ratio', hit_ratio('cache_requests_total', 'cache_hit_ratio'))
+
+
+class LRUBackend:
+    """In-process store: least recently used entries are evicted beyond max_entries"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires at, value)
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class RedisBackend:
+    """Store shared by every gateway process; values are kept as JSON"""
+
+    def __init__(self, client, prefix: str = 'gateway:catalog:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.client.set(self.prefix + key, json.dumps(value), px=max(1, int(ttl * 1000)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def counter(self, key: str) -> int:
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(self.prefix + key)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + '*', count=1000):
+            self.client.delete(key)
+
+
+class CatalogCache:
+    """TTL cache of book and catalog-listing responses with invalidation on writes"""
+
+    def __init__(self, backend, ttl: float = 5.0, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled and ttl > 0
+
+    def book(self, book_id: str, load: Callable[[], Any]) -> Any:
+        """Cached response for one book"""
+        return self._cached(f'book:{book_id}', load)
+
+    def listing(self, kind: str, params: Dict, load: Callable[[], Any]) -> Any:
+        """Cached response for a list or search request, keyed by its parameters"""
+        if not self.enabled:
+            return load()
+        try:
+            generation = self.backend.counter('generation')
+        except Exception as e:
+            return self._backend_failed(e, load)
+        digest = hashlib.blake2b(json.dumps(params, sort_keys=True).encode(), digest_size=12).hexdigest()
+        return self._cached(f'{kind}:{generation}:{digest}', load)
+
+    def invalidate(self, *book_ids: str) -> None:
+        """Forget the given books and every cached list and search result"""
+        if not self.enabled:
+            return
+        try:
+            for book_id in book_ids:
+                if book_id:
+                    self.backend.delete(f'book:{book_id}')
+            self.backend.incr('generation')
+        except Exception as e:
+            logging.warning(f"Catalog cache invalidation failed: {e}")
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def _cached(self, key: str, load: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return load()
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            return self._backend_failed(e, load)
+        if value is not None:
+            registry.inc('cache_requests_total', CACHE_HIT)
+            return value
+
+        registry.inc('cache_requests_total', CACHE_MISS)
+        value = load()
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            logging.warning(f"Catalog cache write failed: {e}")
+        return value
+
+    @staticmethod
+    def _backend_failed(error: Exception, load: Callable[[], Any]) -> Any:
+        # A broken cache must not break reads; go to the book service
+        registry.inc('cache_requests_total', CACHE_ERROR)
+        logging.warning(f"Catalog cache unavailable: {error}")
+        return load()
+
+
+def create_catalog_cache() -> CatalogCache:
+    """CatalogCache configured from the GATEWAY_CACHE_* environment variables"""
+    ttl = float(os.getenv('GATEWAY_CACHE_TTL_SECONDS', 5))
+    enabled = os.getenv('GATEWAY_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    redis_url = os.getenv('GATEWAY_CACHE_REDIS_URL')
+    if redis_url:
+        try:
+            import redis
+            client = redis.Redis.from_url(redis_url, socket_timeout=0.1, socket_connect_timeout=0.2)
+            client.ping()
+            logging.info("✓ Catalog cache using Redis")
+            return CatalogCache(RedisBackend(client), ttl, enabled)
+        except Exception as e:
+            logging.error(f"Redis catalog cache not available, using in-process cache: {e}")
+    return CatalogCache(LRUBackend(int(os.getenv('GATEWAY_CACHE_MAX_ENTRIES', 1000))), ttl, enabled)
@@ -0,0 +1,149 @@
+"""
+Protobuf-to-JSON conversion for gateway responses.
+
+A Converter is declared once per response shape. Each field is an attribute of
+the message, or a (key, expression) pair where the expression reads the
+message as `m`. The fields are compiled into two plain functions, one building
+a dict and one writing the JSON text directly, so converting a row costs
+about the same as writing the dict out by hand:
+
+    BOOK(book)               # {"id": ..., "title": ..., ...}
+    BOOK.json_list(books)    # '[{"id":...},...]', no dicts built at all
+    BOOK.only("id", "title") # field mask: a converter for a subset of the keys
+
+json_response() sends a body whose large parts are already JSON text
+(JSONText) without encoding them again, and without the key sorting jsonify
+does. Benchmark: performance_tests/converter_benchmark.py.
+"""
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Iterable, Tuple, Union
+
+from flask import Response
+
+from src import book_pb2, borrowing_pb2
+
+Field = Union[str, Tuple[str, str]]
+
+_encoder = json.JSONEncoder(separators=(',', ':'))
+
+
+class JSONText(str):
+    """JSON that is already encoded, inserted as it is by dumps()"""
+
+
+class Converter:
+    """Compiled conversion of one protobuf message type to a dict or JSON text"""
+
+    def __init__(self, message_type, fields: Iterable[Field]):
+        self.message_type = message_type
+        self.fields: Dict[str, str] = {}
+        for field in fields:
+            key, expression = (field, f'm.{field}') if isinstance(field, str) else field
+            self.fields[key] = expression
+        self._masks: Dict[Tuple[str, ...], 'Converter'] = {}
+        self.to_dict, self.to_json = self._compile()
+
+    def __call__(self, message) -> Dict:
+        return self.to_dict(message)
+
+    def many(self, messages) -> list:
+        return list(map(self.to_dict, messages))
+
+    def json_list(self, messages) -> JSONText:
+        return JSONText('[' + ','.join(map(self.to_json, messages)) + ']')
+
+    def only(self, *keys: str) -> 'Converter':
+        """Converter for just these keys, in this converter's order; ValueError for unknown keys"""
+        unknown = set(keys) - self.fields.keys()
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        mask = tuple(key for key in self.fields if key in keys)
+        if mask not in self._masks:
+            self._masks[mask] = Converter(self.message_type, [(key, self.fields[key]) for key in mask])
+        return self._masks[mask]
+
+    def mask(self, fields: str) -> 'Converter':
+        """Converter for a comma-separated ?fields= parameter; all fields when it is empty"""
+        keys = [key.strip() for key in fields.split(',') if key.strip()]
+        return self.only(*keys) if keys else self
+
+    def _compile(self):
+        # The JSON writer needs each field's type: strings are escaped, numbers and bools formatted
+        template, values = [], []
+        for key, expression in self.fields.items():
+            kind = self._kind(expression)
+            if kind == 'string':
+                value = f'_str({expression})'
+            elif kind == 'optional string':
+                value = f'(_str({expression}) if {expression} else "null")'
+            elif kind == 'bool':
+                value = f'("true" if {expression} else "false")'
+            else:
+                value = f'repr({expression})'
+            template.append(json.dumps(key).replace('%', '%%') + ':%s')
+            values.append(value)
+
+        dict_items = ', '.join(f'{json.dumps(key)}: {expression}' for key, expression in self.fields.items())
+        template_text = '{' + ','.join(template) + '}'
+        source = (
+            f'def to_dict(m):\n    return {{{dict_items}}}\n'
+            f'def to_json(m):\n    return {template_text!r} % ({", ".join(values)}{"," if values else ""})\n'
+        )
+        namespace = {'_str': encode_basestring_ascii}
+        exec(compile(source, f'<converter {self.message_type.DESCRIPTOR.name}>', 'exec'), namespace)
+        return namespace['to_dict'], namespace['to_json']
+
+    def _kind(self, expression: str) -> str:
+        # Types come from the message descriptor; computed fields say what they produce
+        if expression.endswith(' or None'):
+            return 'optional string'
+        if expression.startswith('m.') and expression[2:].isidentifier():
+            field = self.message_type.DESCRIPTOR.fields_by_name[expression[2:]]
+            if field.type == field.TYPE_STRING:
+                return 'string'
+            if field.type == field.TYPE_BOOL:
+                return 'bool'
+            return 'number'
+        if ' == ' in expression or ' != ' in expression:
+            return 'bool'
+        raise ValueError(f"Cannot tell the JSON type of {expression!r}")
+
+
+def dumps(body) -> str:
+    """Compact JSON for body; JSONText values of dicts, at any depth, are used as they are
+
+    Only dicts are walked here. Anything else is handed to the json encoder
+    whole, so keep large lists as JSONText (json_list) or plain values.
+    """
+    if isinstance(body, JSONText):
+        return body
+    if isinstance(body, dict):
+        return '{' + ','.join(encode_basestring_ascii(str(key)) + ':' + dumps(value)
+                              for key, value in body.items()) + '}'
+    return _encoder.encode(body)
+
+
+def json_response(body, status: int = 200) -> Response:
+    """JSON response written from body by dumps(), or from a str that already holds JSON"""
+    return Response(body if isinstance(body, str) else dumps(body), status=status, mimetype='application/json')
+
+
+BOOK = Converter(book_pb2.Book, [
+    "id", "title", "author", "isbn", "status",
+    ("available", 'm.status == "available"'),
+    "category", "description", "total_copies", "available_copies",
+])
+
+# Single-book responses, which have always left out "available"
+BOOK_DETAIL = BOOK.only("id", "title", "author", "isbn", "status", "category", "description",
+                        "total_copies", "available_copies")
+
+BORROWING = Converter(borrowing_pb2.BorrowedBook, [
+    ("id", "m.borrow_id"), "user_id", "book_id", "borrowed_date", "due_date", "returned",
+    ("returned_date", "m.returned_date or None"),
+    "fine_amount", "is_overdue", "days_overdue",
+])
+
+# Loan lists that name the id borrow_id and leave out the return details
+LOAN = Converter(borrowing_pb2.BorrowedBook, ["borrow_id", "user_id", "book_id", "borrowed_date", "due_date"])
@@ -0,0 +1,124 @@
+"""
+Concurrent downstream calls for the gateway.
+
+A route that needs several independent gRPC responses submits them together,
+so it takes as long as its slowest call instead of the sum of all of them:
+
+    results = fan_out({
+        "books": lambda timeout: book_client.list_books(timeout=timeout),
+        "users": lambda timeout: user_client.list_users(timeout=timeout),
+    })
+    if results["users"].ok:
+        ...
+
+All calls of a request share one Deadline (GATEWAY_DEADLINE_SECONDS). Each call
+gets the time left as its gRPC timeout, so a slow service is cut off rather
+than holding a worker thread. A call that fails or misses the deadline is
+reported in its Result, not raised, so the route can answer with what it has.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+import grpc
+
+DEFAULT_DEADLINE_SECONDS = float(os.getenv('GATEWAY_DEADLINE_SECONDS', 2.0))
+MAX_WORKERS = int(os.getenv('GATEWAY_FANOUT_WORKERS', 32))
+
+
+class Deadline:
+    """Point in time by which all downstream calls of one request must finish"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires = time.monotonic() + (DEFAULT_DEADLINE_SECONDS if seconds is None else seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+
+class DeadlineExceeded(grpc.RpcError):
+    """Stands in for a call still running when the request's deadline passed"""
+
+    def code(self):
+        return grpc.StatusCode.DEADLINE_EXCEEDED
+
+    def details(self):
+        return "Deadline exceeded"
+
+
+class Result:
+    """Outcome of one fanned-out call: its value, or the exception it raised"""
+
+    __slots__ = ('value', 'error')
+
+    def __init__(self, value: Any = None, error: Optional[BaseException] = None):
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def details(self) -> Optional[str]:
+        if self.error is None:
+            return None
+        if isinstance(self.error, grpc.RpcError) and hasattr(self.error, 'details'):
+            return self.error.details()
+        return str(self.error) or type(self.error).__name__
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Created on first use so gunicorn's preloading master never starts threads
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='fanout')
+    return _executor
+
+
+def _reset_executor():
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_executor)
+
+
+def _call(call: Callable[[float], Any], deadline: Deadline) -> Result:
+    try:
+        return Result(value=call(deadline.remaining()))
+    except Exception as e:
+        return Result(error=e)
+
+
+def fan_out(calls: Dict[str, Callable[[float], Any]], deadline: Optional[Deadline] = None) -> Dict[str, Result]:
+    """Run independent calls concurrently and wait for all of them, at most until the deadline
+
+    Each call receives the seconds left as its only argument, to pass on as the
+    gRPC timeout. Returns a Result per name, in the order given.
+    """
+    deadline = deadline or Deadline()
+    executor = _get_executor()
+    futures = {name: executor.submit(_call, call, deadline) for name, call in calls.items()}
+    wait(futures.values(), timeout=deadline.remaining())
+
+    results = {}
+    for name, future in futures.items():
+        if future.done():
+            results[name] = future.result()
+        else:
+            # Still running (e.g. a call that ignores its timeout); stop waiting for it
+            future.cancel()
+            results[name] = Result(error=DeadlineExceeded())
+        if not results[name].ok:
+            logging.warning(f"Downstream call {name} failed: {results[name].details()}")
+    return results
@@ -1,13 +1,19 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from src.user_client import UserClient
 from src.book_client import BookClient
 from src.borrowing_client import BorrowingClient
+from src.metrics import init_metrics
+from src.fanout import Deadline, fan_out
+from src.catalog_cache import create_catalog_cache
+from src.converters import BOOK, BOOK_DETAIL, BORROWING, LOAN, dumps, json_response
 import grpc
 import logging
 import jwt
+import json
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from functools import wraps
 
 app = Flask(__name__)
@@ -20,11 +26,21 @@ CORS(app,
      supports_credentials=True,
      max_age=3600)
 
+# Prometheus metrics at GET /metrics
+init_metrics(app)
+
 logging.basicConfig(level=logging.INFO)
 
 # Secret key for JWT
 SECRET_KEY = os.getenv('SECRET_KEY', 'microservices-secret-key')
 
+# Seconds a complete /api/admin/stats answer is reused
+STATS_TTL_SECONDS = float(os.getenv('GATEWAY_STATS_TTL_SECONDS', 10))
+_stats_cache = None  # (expires at, stats)
+
+# Book reads are served from here when fresh; writes below invalidate it
+catalog_cache = create_catalog_cache()
+
 # Initialize gRPC clients to None
 user_client = None
 book_client = None
@@ -242,157 +258,159 @@ def add_book():
             data.get("description", ""),
             data.get("total_copies", 1)
         )
-        return jsonify({
-            "id": response.book.id,
-            "title": response.book.title,
-            "author": response.book.author,
-            "isbn": response.book.isbn,
-            "status": response.book.status,
-            "category": response.book.category,
-            "description": response.book.description,
-            "total_copies": response.book.total_copies,
-            "available_copies": response.book.available_copies
-        })
+        catalog_cache.invalidate()
+        return json_response(BOOK_DETAIL.to_json(response.book))
     except grpc.RpcError as e:
         logging.error(f"Error adding book: {e}")
         return jsonify({"error": e.details()}), 500
 
 @app.route("/api/books/<book_id>", methods=["GET"])
 def get_book(book_id):
+    def load():
+        return BOOK_DETAIL.to_json(book_client.get_book(book_id).book)
+
     try:
-        response = book_client.get_book(book_id)
-        return jsonify({
-            "id": response.book.id,
-            "title": response.book.title,
-            "author": response.book.author,
-            "isbn": response.book.isbn,
-            "status": response.book.status,
-            "category": response.book.category,
-            "description": response.book.description,
-            "total_copies": response.book.total_copies,
-            "available_copies": response.book.available_copies
-        })
+        return json_response(catalog_cache.book(book_id, load))
     except grpc.RpcError as e:
         return jsonify({"error": e.details()}), 404
 
 @app.route("/api/books", methods=["GET"])
 def list_books():
+    """One page of the catalog; paging and filters are applied by the book service
+
+    Pass page_token (the next_page_token of the previous response) to walk the
+    catalog with keyset pagination, or page for numbered pages with totals.
+    fields=id,title,... returns only those book fields.
+    """
     if not book_client:
         return jsonify({"error": "Book service not available"}), 503
 
     try:
-        # Get pagination parameters
+        page_token = request.args.get('page_token', '')
         page = int(request.args.get('page', 1))
-        limit = int(request.args.get('limit', 12))
-
-        response = book_client.list_books()
-        all_books = [
-            {
-                "id": b.id,
-                "title": b.title,
-                "author": b.author,
-                "isbn": b.isbn,
-                "status": b.status,
-                "available": b.status == "available",
-                "category": b.category,
-                "description": b.description,
-                "total_copies": b.total_copies,
-                "available_copies": b.available_copies
-            }
-            for b in response.books
-        ]
-
-        # Paginate books
-        total_books = len(all_books)
-        total_pages = (total_books + limit - 1) // limit  # Ceiling division
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_books = all_books[start_idx:end_idx]
-
-        return jsonify({
-            "books": paginated_books,
-            "pagination": {
+        limit = min(max(int(request.args.get('limit', 12)), 1), 100)
+    except ValueError:
+        return jsonify({"error": "page and limit must be integers"}), 400
+    try:
+        fields = request.args.get('fields', '')
+        book_json = BOOK.mask(fields)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    available_only = request.args.get('available_only', '').lower() in ('1', 'true', 'yes')
+    category = request.args.get('category', '')
+
+    def load():
+        response = book_client.list_books(
+            page_size=limit,
+            page_token=page_token,
+            category=category,
+            available_only=available_only,
+            page=0 if page_token else page,
+            include_total=not page_token
+        )
+        pagination = {
+            "limit": limit,
+            "has_next": bool(response.next_page_token),
+            "next_page_token": response.next_page_token or None
+        }
+        if not page_token:
+            total_pages = (response.total_size + limit - 1) // limit  # Ceiling division
+            pagination.update({
                 "page": page,
                 "pages": total_pages,
-                "total": total_books,
-                "has_prev": page > 1,
-                "has_next": page < total_pages
-            }
+                "total": response.total_size,
+                "has_prev": page > 1
+            })
+        return dumps({
+            "books": book_json.json_list(response.books),
+            "pagination": pagination
         })
+
+    params = {"page_token": page_token, "page": page, "limit": limit, "category": category,
+              "available_only": available_only, "fields": fields}
+    try:
+        return json_response(catalog_cache.listing("books", params, load))
     except grpc.RpcError as e:
         logging.error(f"Error fetching books: {e}")
-        return jsonify({"error": e.details()}), 500
+        status = 400 if e.code() == grpc.StatusCode.INVALID_ARGUMENT else 500
+        return jsonify({"error": e.details()}), status
 
 @app.route("/api/books/<book_id>/status", methods=["PATCH"])
 def update_book_status(book_id):
     data = request.json
     try:
         response = book_client.update_book_status(book_id, data["status"])
-        return jsonify({
-            "id": response.book.id,
-            "title": response.book.title,
-            "author": response.book.author,
-            "isbn": response.book.isbn,
-            "status": response.book.status,
-            "category": response.book.category,
-            "description": response.book.description,
-            "total_copies": response.book.total_copies,
-            "available_copies": response.book.available_copies
-        })
+        catalog_cache.invalidate(book_id)
+        return json_response(BOOK_DETAIL.to_json(response.book))
     except grpc.RpcError as e:
         return jsonify({"error": e.details()}), 404
 
 @app.route("/api/books/search", methods=["GET"])
 def search_books():
-    query = request.args.get('q', '')
+    """Books matching q in title or author, best matches first; matched by the book service"""
+    if not book_client:
+        return jsonify({"error": "Book service not available"}), 503
+
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": 'Search query parameter "q" is required'}), 400
     try:
-        # Get all books and filter by query
-        response = book_client.list_books()
-        filtered_books = [
-            {
-                "id": b.id,
-                "title": b.title,
-                "author": b.author,
-                "isbn": b.isbn,
-                "status": b.status,
-                "available": b.status == "available",
-                "category": b.category,
-                "description": b.description,
-                "total_copies": b.total_copies,
-                "available_copies": b.available_copies
-            }
-            for b in response.books
-            if query.lower() in b.title.lower() or query.lower() in b.author.lower()
-        ]
-        return jsonify({"books": filtered_books})
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    try:
+        fields = request.args.get('fields', '')
+        book_json = BOOK.mask(fields)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    page_token = request.args.get('page_token', '')
+    available_only = request.args.get('available_only', '').lower() in ('1', 'true', 'yes')
+
+    def load():
+        response = book_client.search_books(
+            query,
+            page_size=limit,
+            page_token=page_token,
+            available_only=available_only
+        )
+        return dumps({
+            "books": book_json.json_list(response.books),
+            "next_page_token": response.next_page_token or None
+        })
+
+    params = {"q": query, "limit": limit, "page_token": page_token, "available_only": available_only,
+              "fields": fields}
+    try:
+        return json_response(catalog_cache.listing("search", params, load))
     except grpc.RpcError as e:
-        return jsonify({"error": e.details()}), 500
+        logging.error(f"Error searching books: {e}")
+        status = 400 if e.code() == grpc.StatusCode.INVALID_ARGUMENT else 500
+        return jsonify({"error": e.details()}), status
 
 @app.route("/api/books/popular", methods=["GET"])
 def get_popular_books():
-    """Get popular books (most borrowed)"""
-    if not book_client:
+    """Get popular books (most borrowed), optionally over the last `days` days"""
+    if not book_client or not borrowing_client:
         return jsonify({"error": "Book service not available"}), 503
 
     try:
-        limit = int(request.args.get('limit', 10))
-        # For now, just return first N books
-        # TODO: Implement actual popularity tracking
-        response = book_client.list_books()
+        limit = min(max(int(request.args.get('limit', 10)), 1), 100)
+        window_days = max(int(request.args.get('days', 0)), 0)
+    except ValueError:
+        return jsonify({"error": "limit and days must be integers"}), 400
+
+    try:
+        # Ranked ids from the borrowing service's counters, then their books in one batch
+        deadline = Deadline()
+        top = borrowing_client.get_top_books(limit, window_days, timeout=deadline.remaining()).books
+        books = {}
+        if top:
+            response = book_client.batch_get_books([t.book_id for t in top], timeout=deadline.remaining())
+            books = {book.id: book for book in response.books}
         popular_books = [
-            {
-                "id": b.id,
-                "title": b.title,
-                "author": b.author,
-                "isbn": b.isbn,
-                "status": b.status,
-                "available": b.status == "available",
-                "category": b.category,
-                "description": b.description,
-                "total_copies": b.total_copies,
-                "available_copies": b.available_copies
-            }
-            for b in response.books[:limit]
+            {**BOOK(books[t.book_id]), "borrow_count": t.borrow_count}
+            for t in top if t.book_id in books
         ]
         return jsonify({"books": popular_books})
     except grpc.RpcError as e:
@@ -406,6 +424,7 @@ def get_popular_books():
 def borrow_book():
     data = request.json
     response = borrowing_client.borrow_book(data["user_id"], data["book_id"])
+    catalog_cache.invalidate(data["book_id"])
     return jsonify({
         "borrow_id": response.borrow_id,
         "status": response.status
@@ -415,6 +434,7 @@ def borrow_book():
 def return_book(borrow_id):
     try:
         response = borrowing_client.return_book(borrow_id)
+        catalog_cache.invalidate(response.borrowing.book_id)
         return jsonify({"status": response.status})
     except grpc.RpcError as e:
         return jsonify({"error": e.details()}), 404
@@ -426,22 +446,23 @@ def get_user_borrowings(user_id):
 
     try:
         response = borrowing_client.get_borrowed_books(user_id)
-        return jsonify({
-            "borrowed_books": [
-                {
-                    "borrow_id": b.borrow_id,
-                    "user_id": b.user_id,
-                    "book_id": b.book_id,
-                    "borrowed_date": b.borrowed_date,
-                    "due_date": b.due_date
-                }
-                for b in response.borrowed_books
-            ]
-        })
+        return json_response({"borrowed_books": LOAN.json_list(response.borrowed_books)})
     except grpc.RpcError as e:
         logging.error(f"Error fetching borrowings: {e}")
         return jsonify({"error": e.details()}), 500
 
+def get_books_by_id(book_ids, deadline=None):
+    """{id: Book} for the given ids in one BatchGetBooks call; empty if the book service fails"""
+    book_ids = list(dict.fromkeys(book_ids))
+    if not book_ids:
+        return {}
+    try:
+        response = book_client.batch_get_books(book_ids, timeout=(deadline or Deadline()).remaining())
+    except grpc.RpcError as e:
+        logging.error(f"Error fetching books: {e}")
+        return {}
+    return {book.id: book for book in response.books}
+
 @app.route("/api/users/<user_id>/borrowed", methods=["GET"])
 def get_user_borrowed_books(user_id):
     """Get user's borrowed books (frontend expects this endpoint)"""
@@ -449,53 +470,32 @@ def get_user_borrowed_books(user_id):
         return jsonify({"borrowed_books": []}), 200
 
     try:
-        response = borrowing_client.get_borrowed_books(user_id)
+        # The book lookup needs the loans first; both share the request's deadline
+        deadline = Deadline()
+        response = borrowing_client.get_borrowed_books(user_id, timeout=deadline.remaining())
+        books = get_books_by_id((b.book_id for b in response.borrowed_books), deadline)
         borrowed_books = []
 
-        # Get book details for each borrowed book
         for b in response.borrowed_books:
-            try:
-                book_response = book_client.get_book(b.book_id)
-
-                # Calculate days remaining
-                from datetime import datetime, timezone
-                try:
-                    due_date = datetime.strptime(b.due_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-                    now = datetime.now(timezone.utc)
-                    days_remaining = (due_date - now).days
-                except:
-                    days_remaining = 0
-
-                borrowed_books.append({
-                    "borrowing": {
-                        "id": b.borrow_id,
-                        "user_id": b.user_id,
-                        "book_id": b.book_id,
-                        "borrowed_date": b.borrowed_date,
-                        "due_date": b.due_date,
-                        "returned": b.returned,
-                        "returned_date": b.returned_date if b.returned_date else None,
-                        "fine_amount": b.fine_amount,
-                        "is_overdue": b.is_overdue,
-                        "days_overdue": b.days_overdue
-                    },
-                    "book": {
-                        "id": book_response.book.id,
-                        "title": book_response.book.title,
-                        "author": book_response.book.author,
-                        "isbn": book_response.book.isbn,
-                        "category": book_response.book.category,
-                        "description": book_response.book.description,
-                        "status": book_response.book.status,
-                        "total_copies": book_response.book.total_copies,
-                        "available_copies": book_response.book.available_copies
-                    },
-                    "days_remaining": days_remaining
-                })
-            except grpc.RpcError:
+            book = books.get(b.book_id)
+            if book is None:
                 # Book not found, skip
                 continue
 
+            # Calculate days remaining
+            try:
+                due_date = datetime.strptime(b.due_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+                now = datetime.now(timezone.utc)
+                days_remaining = (due_date - now).days
+            except:
+                days_remaining = 0
+
+            borrowed_books.append({
+                "borrowing": BORROWING(b),
+                "book": BOOK_DETAIL(book),
+                "days_remaining": days_remaining
+            })
+
         return jsonify({
             "borrowed_books": borrowed_books,
             "count": len(borrowed_books),
@@ -513,42 +513,73 @@ def return_book_by_id(borrow_id):
 
     try:
         response = borrowing_client.return_book(borrow_id)
-
-        # Build the borrowing object response
-        borrowing_data = {
-            "id": response.borrowing.borrow_id,
-            "user_id": response.borrowing.user_id,
-            "book_id": response.borrowing.book_id,
-            "borrowed_date": response.borrowing.borrowed_date,
-            "due_date": response.borrowing.due_date,
-            "returned": response.borrowing.returned,
-            "returned_date": response.borrowing.returned_date,
-            "fine_amount": response.borrowing.fine_amount,
-            "is_overdue": response.borrowing.is_overdue,
-            "days_overdue": response.borrowing.days_overdue
-        }
+        catalog_cache.invalidate(response.borrowing.book_id)
 
         return jsonify({
             "message": "Book returned successfully",
-            "borrowing": borrowing_data
+            "borrowing": BORROWING(response.borrowing)
         })
     except grpc.RpcError as e:
         logging.error(f"Error returning book: {e}")
         return jsonify({"error": e.details()}), 400
 
+def user_to_dict(u):
+    # Never pass password_hash on
+    return {"id": u.id, "student_id": u.student_id, "name": u.name, "email": u.email, "role": u.role}
+
+def get_users_by_id(user_ids, deadline=None):
+    """{id: User} for the given ids in one BatchGetUsers call; empty if the user service fails"""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return {}
+    try:
+        response = user_client.batch_get_users(user_ids, timeout=(deadline or Deadline()).remaining())
+    except grpc.RpcError as e:
+        logging.error(f"Error fetching users: {e}")
+        return {}
+    return {user.id: user for user in response.users}
+
+OVERDUE_PAGE_SIZE = 100
+MAX_OVERDUE_PAGE_SIZE = 500
+
 @app.route("/api/overdue", methods=["GET"])
 def get_all_overdue_books():
-    """Get all overdue borrowed books"""
+    """Get overdue borrowed books, most overdue first, one page at a time"""
     if not borrowing_client:
-        return jsonify({"overdue_books": []}), 200
+        return jsonify({"overdue_books": [], "next_page_token": None}), 200
 
     try:
-        # TODO: Implement in borrowing service
-        # For now return empty list
-        return jsonify({"overdue_books": []})
-    except Exception as e:
+        limit = min(max(int(request.args.get('limit', OVERDUE_PAGE_SIZE)), 1), MAX_OVERDUE_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    try:
+        # One extra loan tells us whether another page follows
+        deadline = Deadline()
+        loans = list(borrowing_client.list_overdue(limit + 1, request.args.get('page_token', ''),
+                                                   timeout=deadline.remaining()))
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+            return jsonify({"error": e.details()}), 400
         logging.error(f"Error fetching overdue books: {e}")
-        return jsonify({"overdue_books": []}), 200
+        return jsonify({"error": e.details()}), 500
+
+    next_page_token = loans[limit - 1].cursor if len(loans) > limit else None
+    loans = [loan.borrowing for loan in loans[:limit]]
+    books = get_books_by_id((b.book_id for b in loans), deadline)
+    users = get_users_by_id((b.user_id for b in loans), deadline)
+    return jsonify({
+        "overdue_books": [
+            {
+                "borrowing": BORROWING(b),
+                # Placeholders keep the entry usable when a lookup failed
+                "book": BOOK(books[b.book_id]) if b.book_id in books else {"id": b.book_id},
+                "user": user_to_dict(users[b.user_id]) if b.user_id in users else {"id": b.user_id}
+            }
+            for b in loans
+        ],
+        "next_page_token": next_page_token
+    })
 
 # ------------------------
 # Admin routes
@@ -556,47 +587,158 @@ def get_all_overdue_books():
 @app.route("/api/admin/stats", methods=["GET"])
 def get_stats():
     """Get library statistics"""
-    try:
-        # Get all books
-        books_response = book_client.list_books()
-        total_books = len(books_response.books)
-        available_books = sum(1 for b in books_response.books if b.status == "available")
-        borrowed_books = total_books - available_books
-
-        # Get all users
-        users_response = user_client.list_users()
-        total_users = len(users_response.users)
+    global _stats_cache
+    cached = _stats_cache
+    if cached and cached[0] > time.monotonic():
+        return jsonify(cached[1])
+
+    # Each service counts its own rows in SQL; ask all three at once
+    results = fan_out({
+        "books": lambda timeout: book_client.get_book_stats(timeout=timeout),
+        "users": lambda timeout: user_client.get_user_stats(timeout=timeout),
+        "borrowings": lambda timeout: borrowing_client.get_borrowing_stats(timeout=timeout),
+    })
+    if not any(result.ok for result in results.values()):
+        return jsonify({"error": results["books"].details()}), 500
+
+    stats = dict.fromkeys([
+        "total_books", "available_books", "borrowed_books", "total_copies", "available_copies",
+        "total_users", "students", "staff",
+        "total_borrowings", "active_borrowings", "overdue_books", "total_fines"
+    ])
+    if results["books"].ok:
+        books = results["books"].value
+        stats.update(
+            total_books=books.total_books,
+            available_books=books.available_books,
+            borrowed_books=books.total_books - books.available_books,
+            total_copies=books.total_copies,
+            available_copies=books.available_copies
+        )
+    if results["users"].ok:
+        users = results["users"].value
+        stats.update(total_users=users.total_users, students=users.students, staff=users.staff)
+    if results["borrowings"].ok:
+        borrowings = results["borrowings"].value
+        stats.update(
+            total_borrowings=borrowings.total_borrowings,
+            active_borrowings=borrowings.active_borrowings,
+            overdue_books=borrowings.overdue_borrowings,
+            total_fines=round(borrowings.total_fines, 2)
+        )
 
-        return jsonify({
-            "total_books": total_books,
-            "available_books": available_books,
-            "borrowed_books": borrowed_books,
-            "total_users": total_users,
-            "overdue_books": 0  # Placeholder - would need to query borrowing service
-        })
-    except grpc.RpcError as e:
-        logging.error(f"Stats error: {e}")
-        return jsonify({"error": e.details()}), 500
+    # A failed service leaves its figures null instead of failing the whole response
+    degraded = [name for name, result in results.items() if not result.ok]
+    if degraded:
+        stats["degraded"] = degraded
+    else:
+        # Only complete answers are reused, so a recovered service shows up on the next request
+        _stats_cache = (time.monotonic() + STATS_TTL_SECONDS, stats)
+    return jsonify(stats)
 
 @app.route("/api/admin/overdue", methods=["GET"])
 def get_overdue_books():
-    """Get overdue borrowed books"""
+    """Stream every overdue loan as NDJSON, most overdue first, with its book
+
+    Loans are relayed from the ListOverdue stream as they arrive, with books
+    fetched per batch, so memory use does not grow with the number of loans.
+    Each line carries the cursor to resume from (?page_token=) if the export
+    is interrupted.
+    """
+    if not borrowing_client:
+        return jsonify({"error": "Borrowing service not available"}), 503
+
     try:
-        # Placeholder - would need to implement in borrowing service
-        # For now return empty list
-        return jsonify({
-            "overdue": []
-        })
+        stream = borrowing_client.list_overdue(page_token=request.args.get('page_token', ''))
+        # Fail with a status code while headers can still be sent
+        first = next(stream, None)
     except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+            return jsonify({"error": e.details()}), 400
         logging.error(f"Overdue books error: {e}")
         return jsonify({"error": e.details()}), 500
 
+    def generate():
+        batch = [first] if first is not None else []
+        try:
+            for loan in stream:
+                batch.append(loan)
+                if len(batch) == OVERDUE_PAGE_SIZE:
+                    yield from _overdue_lines(batch)
+                    batch = []
+            yield from _overdue_lines(batch)
+        except grpc.RpcError as e:
+            logging.error(f"Overdue stream error: {e}")
+            yield json.dumps({"error": e.details()}) + "\n"
+        finally:
+            # Stops the borrowing service too when the client goes away
+            stream.cancel()
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+def _overdue_lines(batch):
+    books = get_books_by_id(loan.borrowing.book_id for loan in batch)
+    for loan in batch:
+        b = loan.borrowing
+        yield json.dumps({
+            "borrowing": BORROWING(b),
+            "book": BOOK(books[b.book_id]) if b.book_id in books else None,
+            "cursor": loan.cursor
+        }) + "\n"
+
+@app.route("/api/admin/books/export", methods=["GET"])
+def export_books():
+    """Stream the catalog as NDJSON, one book per line, in title order
+
+    Chunks from the StreamBooks RPC are relayed as they arrive, so neither the
+    book service nor the gateway holds the whole catalog. After each chunk a
+    {"next_page_token": ...} line gives the token to resume from (?page_token=)
+    if the export is interrupted. Takes category, available_only and fields like /api/books.
+    """
+    if not book_client:
+        return jsonify({"error": "Book service not available"}), 503
+    try:
+        book_json = BOOK.mask(request.args.get('fields', ''))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        stream = book_client.stream_books(
+            category=request.args.get('category', ''),
+            available_only=request.args.get('available_only', '').lower() in ('1', 'true', 'yes'),
+            page_token=request.args.get('page_token', '')
+        )
+        # Fail with a status code while headers can still be sent
+        first = next(stream, None)
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+            return jsonify({"error": e.details()}), 400
+        logging.error(f"Book export error: {e}")
+        return jsonify({"error": e.details()}), 500
+
+    def generate():
+        try:
+            chunk = first
+            while chunk is not None:
+                yield "".join(book_json.to_json(b) + "\n" for b in chunk.books)
+                yield json.dumps({"next_page_token": chunk.next_page_token}) + "\n"
+                chunk = next(stream, None)
+        except grpc.RpcError as e:
+            logging.error(f"Book export stream error: {e}")
+            yield json.dumps({"error": e.details()}) + "\n"
+        finally:
+            # Stops the book service's query too when the client goes away
+            stream.cancel()
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
 @app.route("/api/borrow", methods=["POST"])
 def borrow_book_simple():
     """Simplified borrow endpoint for compatibility"""
     data = request.json
     try:
         response = borrowing_client.borrow_book(data["user_id"], data["book_id"])
+        catalog_cache.invalidate(data["book_id"])
         return jsonify({
             "borrow_id": response.borrow_id,
             "status": response.status,
@@ -611,6 +753,7 @@ def return_book_simple():
     data = request.json
     try:
         response = borrowing_client.return_book(data["borrow_id"])
+        catalog_cache.invalidate(response.borrowing.book_id)
         return jsonify({
             "status": response.status,
             "message": "Book returned successfully"
@@ -626,18 +769,14 @@ def get_dashboard():
         return jsonify({"error": "user_id required"}), 400
 
     try:
-        # Get user's borrowed books
-        borrowings_response = borrowing_client.get_borrowed_books(user_id)
+        # Get user's borrowed books, with the book details in one batch
+        deadline = Deadline()
+        borrowings_response = borrowing_client.get_borrowed_books(user_id, timeout=deadline.remaining())
+        books = get_books_by_id((b.book_id for b in borrowings_response.borrowed_books), deadline)
 
         return jsonify({
             "borrowed_books": [
-                {
-                    "borrow_id": b.borrow_id,
-                    "user_id": b.user_id,
-                    "book_id": b.book_id,
-                    "borrowed_date": b.borrowed_date,
-                    "due_date": b.due_date
-                }
+                {**LOAN(b), "book": BOOK(books[b.book_id]) if b.book_id in books else None}
                 for b in borrowings_response.borrowed_books
             ]
         })
@@ -0,0 +1,317 @@
+"""
+Prometheus metrics for the gateway (same registry as arch1_layered/metrics.py).
+
+Counters are recorded into per-thread shards without locks and summed when
+GET /metrics is scraped. Under gunicorn, set METRICS_DIR (gunicorn.conf.py
+does) so every worker's totals are included in each scrape.
+"""
+import bisect
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from flask import Response, g, request
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    """Metric values written by a single thread"""
+
+    __slots__ = ('counters', 'gauges', 'histograms')
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+
+class MetricsRegistry:
+    """Prometheus counters, gauges and histograms without locks on the hot path.
+
+    Each thread writes to its own shard, so recording never contends; shards are
+    summed when /metrics is scraped. With a `directory`, every process also
+    publishes its totals there (see flush/collect) so whichever gunicorn worker
+    answers a scrape reports all of them.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, directory: Optional[str] = None, flush_seconds: float = 5.0):
+        self.buckets = tuple(buckets)
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self._descriptions: Dict[str, Tuple[str, str]] = {}
+        self._collectors: Dict[str, Callable[[], List[Tuple[str, str, str, float]]]] = {}
+        self._derived: Dict[str, Callable[[Dict], List[Tuple[str, str, str, float]]]] = {}
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()
+        self._shared_shard = None
+        self._flusher = None
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        self._descriptions[name] = (kind, help_text)
+
+    def add_collector(self, key: str, collector: Callable[[], List[Tuple[str, str, str, float]]]) -> None:
+        """Register (or replace) a callable returning (kind, name, labels, value) samples read at collection time"""
+        self._collectors[key] = collector
+
+    def add_derived(self, key: str, derive: Callable[[Dict], List[Tuple[str, str, str, float]]]) -> None:
+        """Register (or replace) a callable computing extra samples (e.g. ratios) from the collected totals"""
+        self._derived[key] = derive
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is not None:
+            return shard
+
+        if _greenlets_patched():
+            # Greenlets never preempt each other, but a shard per greenlet would
+            # grow without bound; they share one
+            if self._shared_shard is None:
+                self._shared_shard = self._register_shard()
+            shard = self._shared_shard
+        else:
+            shard = self._register_shard()
+        self._local.shard = shard
+        return shard
+
+    def _register_shard(self) -> _Shard:
+        shard = _Shard()
+        with self._shards_lock:
+            self._shards.append(shard)
+            if self.directory and self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_forever, name='metrics-flush', daemon=True)
+                self._flusher.start()
+        return shard
+
+    def inc(self, name: str, labels: str = '', amount: float = 1) -> None:
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+    def gauge_add(self, name: str, labels: str = '', amount: float = 1) -> None:
+        gauges = self._shard().gauges
+        key = (name, labels)
+        gauges[key] = gauges.get(key, 0) + amount
+
+    def observe(self, name: str, labels: str, value: float) -> None:
+        histograms = self._shard().histograms
+        key = (name, labels)
+        buckets = histograms.get(key)
+        if buckets is None:
+            # One count per bucket plus +Inf, then the running sum
+            buckets = histograms[key] = [0] * (len(self.buckets) + 2)
+        buckets[bisect.bisect_left(self.buckets, value)] += 1
+        buckets[-1] += value
+
+    def snapshot(self) -> Dict:
+        """This process's values, summed over all shards"""
+        totals = {'counters': {}, 'gauges': {}, 'histograms': {}}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # dict() copies atomically under the GIL while the owner keeps writing
+            _merge(totals, {'counters': dict(shard.counters), 'gauges': dict(shard.gauges),
+                            'histograms': {key: list(value) for key, value in dict(shard.histograms).items()}})
+        for collector in list(self._collectors.values()):
+            for kind, name, labels, value in collector():
+                bucket = totals['counters'] if kind == 'counter' else totals['gauges']
+                bucket[(name, labels)] = bucket.get((name, labels), 0) + value
+        return totals
+
+    def collect(self) -> Dict:
+        """Values for every process sharing the directory (or just this one)"""
+        totals = self.snapshot()
+        if not self.directory:
+            return totals
+
+        own_file = f'{os.getpid()}.json'
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.json') and file_name != own_file:
+                _merge(totals, _read_snapshot(os.path.join(self.directory, file_name)))
+        return totals
+
+    def flush(self) -> None:
+        if self.directory:
+            _write_snapshot(os.path.join(self.directory, f'{os.getpid()}.json'), self.snapshot())
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        totals = self.collect()
+        for derive in list(self._derived.values()):
+            for kind, name, label_set, value in derive(totals):
+                totals['counters' if kind == 'counter' else 'gauges'][(name, label_set)] = value
+        lines = []
+        for name, samples, kind in _group(totals, self._descriptions):
+            _, help_text = self._descriptions.get(name, (kind, ''))
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                if kind != 'histogram':
+                    lines.append(f'{name}{{{labels}}} {_format(value)}' if labels else f'{name} {_format(value)}')
+                    continue
+                separator = ',' if labels else ''
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), value[:-1]):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else _format(bound)
+                    lines.append(f'{name}_bucket{{{labels}{separator}le="{le}"}} {cumulative}')
+                suffix = f'{{{labels}}}' if labels else ''
+                lines.append(f'{name}_sum{suffix} {_format(value[-1])}')
+                lines.append(f'{name}_count{suffix} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+def mark_process_dead(directory: str, pid: int) -> None:
+    """Fold an exited worker's counters into the archive so totals stay monotonic.
+
+    Its gauges are dropped: a dead worker has nothing in flight.
+    """
+    path = os.path.join(directory, f'{pid}.json')
+    if not os.path.exists(path):
+        return
+    archive_path = os.path.join(directory, 'archive.json')
+    archive = _read_snapshot(archive_path)
+    dead = _read_snapshot(path)
+    dead['gauges'] = {}
+    _merge(archive, dead)
+    _write_snapshot(archive_path, archive)
+    os.remove(path)
+
+
+def _greenlets_patched() -> bool:
+    gevent_monkey = sys.modules.get('gevent.monkey')
+    return bool(gevent_monkey and gevent_monkey.is_module_patched('threading'))
+
+
+def _merge(totals: Dict, other: Dict) -> None:
+    for kind in ('counters', 'gauges'):
+        target = totals[kind]
+        for key, value in other.get(kind, {}).items():
+            target[key] = target.get(key, 0) + value
+    target = totals['histograms']
+    for key, value in other.get('histograms', {}).items():
+        if key in target:
+            target[key] = [a + b for a, b in zip(target[key], value)]
+        else:
+            target[key] = list(value)
+
+
+def _write_snapshot(path: str, totals: Dict) -> None:
+    data = {kind: [[name, labels, value] for (name, labels), value in values.items()]
+            for kind, values in totals.items()}
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as handle:
+        json.dump(data, handle)
+    os.replace(temporary, path)
+
+
+def _read_snapshot(path: str) -> Dict:
+    try:
+        with open(path) as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return {'counters': {}, 'gauges': {}, 'histograms': {}}
+    return {kind: {(name, labels): value for name, labels, value in data.get(kind, [])}
+            for kind in ('counters', 'gauges', 'histograms')}
+
+
+def _group(totals: Dict, descriptions: Dict) -> List:
+    grouped = {}
+    for kind, prometheus_kind in (('counters', 'counter'), ('gauges', 'gauge'), ('histograms', 'histogram')):
+        for (name, labels), value in sorted(totals[kind].items()):
+            kind_name = descriptions.get(name, (prometheus_kind,))[0]
+            grouped.setdefault(name, (kind_name, []))[1].append((labels, value))
+    return [(name, samples, kind) for name, (kind, samples) in sorted(grouped.items())]
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def labels(**values) -> str:
+    """Render a label set, e.g. labels(method='GET') -> 'method="GET"'"""
+    parts = []
+    for key, value in values.items():
+        value = str(value)
+        if '\\' in value or '"' in value or '\n' in value:
+            value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return ','.join(parts)
+
+
+@functools.lru_cache(maxsize=1024)
+def _request_labels(method: str, route: str, status: int) -> Tuple[str, str, str]:
+    """(requests, duration, errors) label sets; routes are templates, so this stays small"""
+    return (labels(method=method, route=route, status=status),
+            labels(method=method, route=route),
+            labels(route=route, status=status))
+
+
+def hit_ratio(counter: str, ratio: str):
+    """Derived gauge: share of `counter` samples labelled result="hit" """
+    hit, miss = labels(result='hit'), labels(result='miss')
+
+    def derive(totals: Dict) -> List[Tuple[str, str, str, float]]:
+        hits = totals['counters'].get((counter, hit), 0)
+        lookups = hits + totals['counters'].get((counter, miss), 0)
+        return [('gauge', ratio, '', hits / lookups)] if lookups else []
+    return derive
+
+
+registry = MetricsRegistry(directory=os.getenv('METRICS_DIR') or None,
+                           flush_seconds=float(os.getenv('METRICS_FLUSH_SECONDS', 5)))
+
+
+def init_metrics(app, metrics: MetricsRegistry = registry) -> None:
+    """Record per-route request metrics and serve them at GET /metrics"""
+    metrics.describe('http_requests_total', 'counter', 'Requests handled, by route and status')
+    metrics.describe('http_request_errors_total', 'counter', 'Requests answered with a 4xx/5xx status')
+    metrics.describe('http_request_duration_seconds', 'histogram', 'Request latency by route')
+    metrics.describe('http_requests_in_flight', 'gauge', 'Requests currently being handled')
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        metrics.gauge_add('http_requests_in_flight')
+
+    @app.after_request
+    def record_response_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def record_request_metrics(exc):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        metrics.gauge_add('http_requests_in_flight', amount=-1)
+
+        # The URL rule template keeps label cardinality bounded (/api/books/<int:book_id>)
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        status = g.pop('metrics_status', 500)
+        request_labels, duration_labels, error_labels = _request_labels(request.method, route, status)
+        metrics.inc('http_requests_total', request_labels)
+        metrics.observe('http_request_duration_seconds', duration_labels, time.perf_counter() - started)
+        if status >= 400:
+            metrics.inc('http_request_errors_total', error_labels)
+
+    @app.route('/metrics', methods=['GET'])
+    def prometheus_metrics():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -22,12 +22,19 @@ class UserClient:
         )
         return self.stub.CreateUser(request)
 
-    def get_user(self, user_id):
+    def get_user(self, user_id, timeout=None):
         """
         Calls the GetUser RPC on the server.
         """
         request = user_pb2.GetUserRequest(id=user_id)
-        return self.stub.GetUser(request)
+        return self.stub.GetUser(request, timeout=timeout)
+
+    def batch_get_users(self, user_ids, timeout=None):
+        """
+        Calls the BatchGetUsers RPC: several users in one round-trip.
+        """
+        request = user_pb2.BatchGetUsersRequest(ids=list(user_ids))
+        return self.stub.BatchGetUsers(request, timeout=timeout)
 
     def authenticate_user(self, student_id):
         """
@@ -36,12 +43,19 @@ class UserClient:
         request = user_pb2.AuthenticateUserRequest(student_id=student_id)
         return self.stub.AuthenticateUser(request)
 
-    def list_users(self):
+    def list_users(self, timeout=None):
         """
         Calls the ListUsers RPC on the server.
         """
         request = user_pb2.ListUsersRequest()
-        return self.stub.ListUsers(request)
+        return self.stub.ListUsers(request, timeout=timeout)
+
+    def get_user_stats(self, timeout=None):
+        """
+        Calls the GetUserStats RPC on the server.
+        """
+        request = user_pb2.GetUserStatsRequest()
+        return self.stub.GetUserStats(request, timeout=timeout)
 
     def close(self):
         """
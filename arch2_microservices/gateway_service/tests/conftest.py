@@ -0,0 +1,91 @@
+import grpc
+import pytest
+from concurrent import futures
+from src import book_pb2, book_pb2_grpc, gateway_server
+from src.book_client import BookClient
+
+
+class FakeBookService(book_pb2_grpc.BookServiceServicer):
+    """Book service double that records the requests it receives"""
+
+    def __init__(self):
+        self.requests = []
+
+    def GetBook(self, request, context):
+        self.requests.append(request)
+        if request.id == "missing":
+            context.abort(grpc.StatusCode.NOT_FOUND, "Book not found")
+        return book_pb2.GetBookResponse(book=book_pb2.Book(id=request.id, title="Algorithms", status="available"))
+
+    def UpdateBookStatus(self, request, context):
+        self.requests.append(request)
+        return book_pb2.UpdateBookStatusResponse(book=book_pb2.Book(id=request.id, status=request.status))
+
+    def ListBooks(self, request, context):
+        self.requests.append(request)
+        if request.page_token == "bad":
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Invalid page_token")
+        return book_pb2.ListBooksResponse(
+            books=[book_pb2.Book(id="b1", title="Algorithms", status="available", total_copies=2, available_copies=1)],
+            next_page_token="next" if request.page_size == 1 else "",
+            total_size=25 if request.include_total else 0
+        )
+
+    def SearchBooks(self, request, context):
+        self.requests.append(request)
+        return book_pb2.SearchBooksResponse(
+            books=[book_pb2.Book(id="b2", title="Python", status="borrowed")],
+            next_page_token="more"
+        )
+
+    def StreamBooks(self, request, context):
+        self.requests.append(request)
+        if request.page_token == "bad":
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Invalid page_token")
+        # Five books b0..b4 in chunks of two; the token is the index to continue from
+        for start in range(int(request.page_token or 0), 5, 2):
+            end = min(start + 2, 5)
+            yield book_pb2.BookChunk(
+                books=[book_pb2.Book(id=f"b{n}", title=f"Title {n}") for n in range(start, end)],
+                next_page_token=str(end)
+            )
+
+    def BatchGetBooks(self, request, context):
+        self.requests.append(request)
+        # Request order, unknown ids left out
+        return book_pb2.BatchGetBooksResponse(
+            books=[book_pb2.Book(id=book_id, title=f"Title {book_id}") for book_id in request.ids if book_id != "gone"]
+        )
+
+
+@pytest.fixture(autouse=True)
+def empty_catalog_cache():
+    # Cached book responses would leak from one test's fake services into the next
+    gateway_server.catalog_cache.clear()
+    yield
+    gateway_server.catalog_cache.clear()
+
+
+@pytest.fixture
+def book_service(monkeypatch):
+    servicer = FakeBookService()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    book_pb2_grpc.add_BookServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+
+    client = BookClient(host="localhost", port=port)
+    monkeypatch.setattr(gateway_server, "book_client", client)
+    # Other clients are unused here but must be set, or the gateway (re)creates all three
+    monkeypatch.setattr(gateway_server, "user_client", object())
+    monkeypatch.setattr(gateway_server, "borrowing_client", object())
+    yield servicer
+    client.close()
+    server.stop(0)
+
+
+@pytest.fixture
+def client():
+    gateway_server.app.testing = True
+    with gateway_server.app.test_client() as client:
+        yield client
@@ -0,0 +1,207 @@
+import time
+
+import pytest
+import redis
+
+from src import borrowing_pb2, gateway_server
+from src.catalog_cache import CACHE_HIT, CatalogCache, LRUBackend, RedisBackend
+from src.metrics import registry
+
+
+def _redis_available():
+    try:
+        return redis.Redis(host='localhost', port=6379, socket_connect_timeout=0.2).ping()
+    except redis.RedisError:
+        return False
+
+
+requires_redis = pytest.mark.skipif(not _redis_available(), reason='Redis is not running on localhost:6379')
+
+
+class BrokenBackend:
+    """Backend whose every operation fails, like an unreachable Redis"""
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("cache down")
+        return fail
+
+
+class FakeBorrowingClient:
+    """Borrowing client double for the write routes that change a book's availability"""
+
+    def borrow_book(self, user_id, book_id):
+        return borrowing_pb2.BorrowResponse(borrow_id="l1", status="success")
+
+    def return_book(self, borrow_id):
+        return borrowing_pb2.ReturnResponse(
+            status="success", borrowing=borrowing_pb2.BorrowedBook(borrow_id=borrow_id, book_id="b1")
+        )
+
+
+def _loader(value):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return value
+    return load, calls
+
+
+def test_lru_evicts_least_recently_used():
+    backend = LRUBackend(max_entries=2)
+    backend.set("a", 1, 60)
+    backend.set("b", 2, 60)
+    backend.get("a")
+    backend.set("c", 3, 60)
+
+    assert (backend.get("a"), backend.get("b"), backend.get("c")) == (1, None, 3)
+
+
+def test_entries_expire_after_ttl():
+    cache = CatalogCache(LRUBackend(), ttl=0.05)
+    load, calls = _loader({"id": "b1"})
+
+    cache.book("b1", load)
+    cache.book("b1", load)
+    time.sleep(0.06)
+    cache.book("b1", load)
+
+    assert len(calls) == 2
+
+
+def test_invalidate_drops_book_and_retires_listings():
+    cache = CatalogCache(LRUBackend())
+    load, calls = _loader({"books": []})
+    cache.book("b1", load)
+    cache.book("b2", load)
+    cache.listing("books", {"page": 1}, load)
+
+    cache.invalidate("b1")
+    for _ in range(2):
+        cache.book("b1", load)
+        cache.book("b2", load)
+        cache.listing("books", {"page": 1}, load)
+
+    # b1 and the listing are loaded again once each, b2 stays cached
+    assert len(calls) == 3 + 2
+
+
+def test_listing_key_depends_on_params():
+    cache = CatalogCache(LRUBackend())
+    load, calls = _loader({"books": []})
+
+    cache.listing("search", {"q": "a", "limit": 20}, load)
+    cache.listing("search", {"limit": 20, "q": "a"}, load)
+    cache.listing("search", {"q": "b", "limit": 20}, load)
+
+    assert len(calls) == 2
+
+
+def test_errors_are_not_cached():
+    cache = CatalogCache(LRUBackend())
+
+    def load():
+        raise RuntimeError("book service down")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            cache.book("b1", load)
+    assert cache.backend.get("book:b1") is None
+
+
+def test_broken_backend_falls_through_to_service():
+    cache = CatalogCache(BrokenBackend())
+    load, calls = _loader({"id": "b1"})
+
+    assert cache.book("b1", load) == {"id": "b1"}
+    assert cache.listing("books", {}, load) == {"id": "b1"}
+    cache.invalidate("b1")
+
+    assert len(calls) == 2
+
+
+def test_disabled_cache_always_loads():
+    cache = CatalogCache(LRUBackend(), enabled=False)
+    load, calls = _loader({"id": "b1"})
+
+    cache.book("b1", load)
+    cache.book("b1", load)
+
+    assert len(calls) == 2
+
+
+def test_book_route_served_from_cache(book_service, client):
+    first = client.get("/api/books/b1")
+    second = client.get("/api/books/b1")
+
+    assert first.get_json() == second.get_json()
+    assert first.get_json()["title"] == "Algorithms"
+    assert len(book_service.requests) == 1
+
+
+def test_missing_book_is_not_cached(book_service, client):
+    assert client.get("/api/books/missing").status_code == 404
+    assert client.get("/api/books/missing").status_code == 404
+    assert len(book_service.requests) == 2
+
+
+def test_list_and_search_routes_served_from_cache(book_service, client):
+    hits_before = registry.snapshot()['counters'].get(('cache_requests_total', CACHE_HIT), 0)
+
+    client.get("/api/books?page=2&limit=10")
+    client.get("/api/books?page=2&limit=10")
+    client.get("/api/books?page=3&limit=10")
+    client.get("/api/books/search?q=python")
+    client.get("/api/books/search?q=python")
+
+    assert len(book_service.requests) == 3
+    hits = registry.snapshot()['counters'].get(('cache_requests_total', CACHE_HIT), 0)
+    assert hits - hits_before == 2
+
+
+def test_status_update_invalidates(book_service, client):
+    client.get("/api/books/b1")
+    client.get("/api/books?limit=10")
+
+    client.patch("/api/books/b1/status", json={"status": "lost"})
+    client.get("/api/books/b1")
+    client.get("/api/books?limit=10")
+
+    assert [type(r).__name__ for r in book_service.requests] == [
+        "GetBookRequest", "ListBooksRequest", "UpdateBookStatusRequest", "GetBookRequest", "ListBooksRequest"
+    ]
+
+
+@pytest.mark.parametrize("method, path, payload", [
+    ("post", "/api/borrow", {"user_id": "u1", "book_id": "b1"}),
+    ("post", "/api/borrowings", {"user_id": "u1", "book_id": "b1"}),
+    ("post", "/api/return", {"borrow_id": "l1"}),
+    ("post", "/api/return/l1", None),
+])
+def test_borrow_and_return_invalidate(book_service, client, monkeypatch, method, path, payload):
+    monkeypatch.setattr(gateway_server, "borrowing_client", FakeBorrowingClient())
+    client.get("/api/books/b1")
+
+    response = getattr(client, method)(path, json=payload)
+    client.get("/api/books/b1")
+
+    assert response.status_code in (200, 201)
+    assert len(book_service.requests) == 2
+
+
+@requires_redis
+def test_redis_backend_round_trip():
+    backend = RedisBackend(redis.Redis(host='localhost', port=6379), prefix='test:gateway:catalog:')
+    backend.clear()
+    cache = CatalogCache(backend)
+    load, calls = _loader({"id": "b1", "tags": ["x"]})
+
+    assert cache.book("b1", load) == {"id": "b1", "tags": ["x"]}
+    assert cache.book("b1", load) == {"id": "b1", "tags": ["x"]}
+    cache.invalidate("b1")
+    cache.book("b1", load)
+
+    assert len(calls) == 2
+    assert backend.counter("generation") == 1
+    backend.clear()
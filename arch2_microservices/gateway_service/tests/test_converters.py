@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from src import book_pb2, borrowing_pb2
+from src.converters import BOOK, BOOK_DETAIL, BORROWING, LOAN, JSONText, dumps, json_response
+
+
+def tricky_book(**overrides):
+    fields = dict(id="b1", title='Quotes " and \\ backslash', author="Émile Zola 日本", isbn="1\n2",
+                  status="available", category="", description="tab\there", total_copies=3, available_copies=0)
+    return book_pb2.Book(**{**fields, **overrides})
+
+
+def test_book_dict_matches_hand_written():
+    b = tricky_book()
+
+    assert BOOK(b) == {
+        "id": b.id, "title": b.title, "author": b.author, "isbn": b.isbn, "status": b.status,
+        "available": True, "category": "", "description": b.description,
+        "total_copies": 3, "available_copies": 0
+    }
+    assert "available" not in BOOK_DETAIL(b)
+
+
+@pytest.mark.parametrize("converter, message", [
+    (BOOK, tricky_book()),
+    (BOOK, tricky_book(status="borrowed")),
+    (BOOK_DETAIL, tricky_book()),
+    (BORROWING, borrowing_pb2.BorrowedBook(borrow_id="l1", book_id="b1", fine_amount=1.5, returned=True,
+                                           returned_date="2025-01-02", is_overdue=True, days_overdue=4)),
+    (BORROWING, borrowing_pb2.BorrowedBook(borrow_id="l2", fine_amount=0.1)),
+    (LOAN, borrowing_pb2.BorrowedBook(borrow_id="l3", user_id="u1", due_date="2025-02-01")),
+])
+def test_json_text_is_the_dict_encoded(converter, message):
+    text = converter.to_json(message)
+
+    assert json.loads(text) == converter(message)
+    assert text == json.dumps(converter(message), separators=(",", ":"))
+
+
+def test_empty_returned_date_is_null():
+    assert json.loads(BORROWING.to_json(borrowing_pb2.BorrowedBook()))["returned_date"] is None
+
+
+def test_field_mask():
+    b = tricky_book()
+
+    assert BOOK.only("title", "id")(b) == {"id": "b1", "title": b.title}
+    assert BOOK.mask("id, available").to_json(b) == '{"id":"b1","available":true}'
+    assert BOOK.mask("") is BOOK
+    assert BOOK.only("id") is BOOK.only("id")
+    with pytest.raises(ValueError, match="Unknown fields: password"):
+        BOOK.mask("id,password")
+
+
+def test_dumps_keeps_json_text():
+    body = {"books": BOOK.only("id").json_list([tricky_book(), tricky_book(id="b2")]),
+            "pagination": {"next": None, "has_next": False}, "empty": JSONText("[]")}
+
+    assert json.loads(dumps(body)) == {
+        "books": [{"id": "b1"}, {"id": "b2"}],
+        "pagination": {"next": None, "has_next": False},
+        "empty": []
+    }
+
+
+def test_json_response():
+    response = json_response({"books": BOOK.json_list([])}, status=201)
+
+    assert (response.status_code, response.mimetype) == (201, "application/json")
+    assert response.get_json() == {"books": []}
@@ -0,0 +1,56 @@
+import time
+import grpc
+from src.fanout import Deadline, DeadlineExceeded, fan_out
+
+
+class Unavailable(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self):
+        return "Service unavailable"
+
+
+def slow(seconds, value):
+    def call(timeout):
+        time.sleep(seconds)
+        return value
+    return call
+
+
+def failing(timeout):
+    raise Unavailable()
+
+
+def test_calls_run_concurrently():
+    started = time.monotonic()
+    results = fan_out({"a": slow(0.2, 1), "b": slow(0.2, 2), "c": slow(0.2, 3)})
+
+    assert time.monotonic() - started < 0.4
+    assert [(name, result.value) for name, result in results.items()] == [("a", 1), ("b", 2), ("c", 3)]
+
+
+def test_each_call_gets_the_time_left_as_timeout():
+    timeouts = []
+    fan_out({"a": timeouts.append, "b": timeouts.append}, Deadline(1.5))
+
+    assert len(timeouts) == 2
+    assert all(1.0 < timeout <= 1.5 for timeout in timeouts)
+
+
+def test_failures_are_reported_not_raised():
+    results = fan_out({"ok": slow(0, "value"), "down": failing})
+
+    assert results["ok"].ok and results["ok"].value == "value"
+    assert not results["down"].ok
+    assert results["down"].details() == "Service unavailable"
+
+
+def test_deadline_stops_the_wait():
+    started = time.monotonic()
+    results = fan_out({"fast": slow(0, 1), "stuck": slow(1, 2)}, Deadline(0.1))
+
+    assert time.monotonic() - started < 0.5
+    assert results["fast"].value == 1
+    assert isinstance(results["stuck"].error, DeadlineExceeded)
+    assert results["stuck"].error.code() == grpc.StatusCode.DEADLINE_EXCEEDED
@@ -0,0 +1,146 @@
+from src import borrowing_pb2, gateway_server
+
+
+class FakeBorrowingClient:
+    """Borrowing client double returning fixed loans for any user, and those books as the most borrowed"""
+
+    def __init__(self, book_ids):
+        self.book_ids = book_ids
+        self.top_requests = []
+
+    def get_top_books(self, limit=10, window_days=0, timeout=None):
+        self.top_requests.append((limit, window_days))
+        return borrowing_pb2.TopBooksResponse(books=[
+            borrowing_pb2.TopBook(book_id=book_id, borrow_count=10 - n) for n, book_id in enumerate(self.book_ids)
+        ])
+
+    def get_borrowed_books(self, user_id, timeout=None):
+        return borrowing_pb2.BorrowedBooksResponse(borrowed_books=[
+            borrowing_pb2.BorrowedBook(borrow_id=f"l{n}", user_id=user_id, book_id=book_id, due_date="2030-01-01")
+            for n, book_id in enumerate(self.book_ids)
+        ])
+
+
+def test_numbered_page_passes_paging_and_filters_through(book_service, client):
+    response = client.get("/api/books?page=3&limit=10&category=AI&available_only=true")
+
+    sent = book_service.requests[-1]
+    assert (sent.page_size, sent.page, sent.category, sent.available_only, sent.include_total) == (10, 3, "AI", True, True)
+    body = response.get_json()
+    assert body["books"][0]["title"] == "Algorithms"
+    assert body["pagination"] == {
+        "limit": 10, "page": 3, "pages": 3, "total": 25,
+        "has_prev": True, "has_next": False, "next_page_token": None
+    }
+
+
+def test_page_token_skips_the_count(book_service, client):
+    response = client.get("/api/books?page_token=abc&limit=1")
+
+    sent = book_service.requests[-1]
+    assert (sent.page_token, sent.page, sent.include_total) == ("abc", 0, False)
+    assert response.get_json()["pagination"] == {"limit": 1, "has_next": True, "next_page_token": "next"}
+
+
+def test_limit_is_capped(book_service, client):
+    client.get("/api/books?limit=5000")
+
+    assert book_service.requests[-1].page_size == 100
+
+
+def test_bad_page_token_is_a_client_error(book_service, client):
+    response = client.get("/api/books?page_token=bad")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid page_token"}
+
+
+def test_search_is_done_by_the_book_service(book_service, client):
+    response = client.get("/api/books/search?q=%20py%20&limit=5&page_token=t&available_only=1")
+
+    sent = book_service.requests[-1]
+    assert (sent.query, sent.page_size, sent.page_token, sent.available_only) == ("py", 5, "t", True)
+    assert response.get_json() == {
+        "books": [{
+            "id": "b2", "title": "Python", "author": "", "isbn": "", "status": "borrowed", "available": False,
+            "category": "", "description": "", "total_copies": 0, "available_copies": 0
+        }],
+        "next_page_token": "more"
+    }
+
+
+def test_search_requires_a_query(book_service, client):
+    response = client.get("/api/books/search?q=")
+
+    assert response.status_code == 400
+    assert book_service.requests == []
+
+
+def test_borrowed_books_are_fetched_in_one_batch(book_service, client, monkeypatch):
+    monkeypatch.setattr(gateway_server, "borrowing_client", FakeBorrowingClient(["b1", "gone", "b2", "b1"]))
+
+    response = client.get("/api/users/u1/borrowed")
+
+    assert [list(sent.ids) for sent in book_service.requests] == [["b1", "gone", "b2"]]
+    body = response.get_json()
+    # The loan of the missing book is skipped, as when GetBook failed per loan
+    assert [(entry["borrowing"]["id"], entry["book"]["title"]) for entry in body["borrowed_books"]] == [
+        ("l0", "Title b1"), ("l2", "Title b2"), ("l3", "Title b1")
+    ]
+    assert body["count"] == 3
+
+
+def test_dashboard_includes_book_details(book_service, client, monkeypatch):
+    monkeypatch.setattr(gateway_server, "borrowing_client", FakeBorrowingClient(["b1", "gone"]))
+
+    loans = client.get("/api/dashboard?user_id=u1").get_json()["borrowed_books"]
+
+    assert len(book_service.requests) == 1
+    assert loans[0]["book"]["title"] == "Title b1"
+    assert loans[1]["book"] is None
+
+
+def test_no_loans_needs_no_book_lookup(book_service, client, monkeypatch):
+    monkeypatch.setattr(gateway_server, "borrowing_client", FakeBorrowingClient([]))
+
+    assert client.get("/api/users/u1/borrowed").get_json()["count"] == 0
+    assert book_service.requests == []
+
+
+def test_popular_books_are_ranked_by_borrows(book_service, client, monkeypatch):
+    borrowing = FakeBorrowingClient(["b2", "gone", "b1"])
+    monkeypatch.setattr(gateway_server, "borrowing_client", borrowing)
+
+    response = client.get("/api/books/popular?limit=3&days=30")
+
+    assert borrowing.top_requests == [(3, 30)]
+    # One batch for all ranked ids; a book deleted since it was counted is skipped
+    assert [list(sent.ids) for sent in book_service.requests] == [["b2", "gone", "b1"]]
+    assert [(b["id"], b["borrow_count"]) for b in response.get_json()["books"]] == [("b2", 10), ("b1", 8)]
+
+
+def test_popular_books_validates_parameters(book_service, client, monkeypatch):
+    borrowing = FakeBorrowingClient([])
+    monkeypatch.setattr(gateway_server, "borrowing_client", borrowing)
+
+    assert client.get("/api/books/popular?days=week").status_code == 400
+    assert client.get("/api/books/popular?limit=500").get_json() == {"books": []}
+    assert borrowing.top_requests == [(100, 0)]
+    assert book_service.requests == []
+
+
+def test_fields_limits_book_fields(book_service, client):
+    listed = client.get("/api/books?limit=10&fields=id,title")
+    found = client.get("/api/books/search?q=py&fields=id")
+
+    assert listed.get_json()["books"] == [{"id": "b1", "title": "Algorithms"}]
+    assert "pagination" in listed.get_json()
+    assert found.get_json()["books"] == [{"id": "b2"}]
+
+
+def test_unknown_field_is_rejected(book_service, client):
+    response = client.get("/api/books?fields=id,password_hash")
+
+    assert response.status_code == 400
+    assert "password_hash" in response.get_json()["error"]
+    assert book_service.requests == []
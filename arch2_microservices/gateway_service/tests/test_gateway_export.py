@@ -0,0 +1,38 @@
+import json
+
+
+def lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_export_streams_every_book_with_tokens(book_service, client):
+    response = client.get("/api/admin/books/export")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    body = lines(response)
+    assert [line.get("id") for line in body if "id" in line] == ["b0", "b1", "b2", "b3", "b4"]
+    assert [line["next_page_token"] for line in body if "next_page_token" in line] == ["2", "4", "5"]
+    assert body[2] == {"next_page_token": "2"}
+
+
+def test_export_resumes_and_passes_filters(book_service, client):
+    response = client.get("/api/admin/books/export?page_token=4&category=AI&available_only=true")
+
+    sent = book_service.requests[-1]
+    assert (sent.page_token, sent.category, sent.available_only) == ("4", "AI", True)
+    assert [line.get("id") for line in lines(response)] == ["b4", None]
+
+
+def test_export_of_empty_result(book_service, client):
+    response = client.get("/api/admin/books/export?page_token=5")
+
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == ""
+
+
+def test_export_bad_token(book_service, client):
+    response = client.get("/api/admin/books/export?page_token=bad")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid page_token"
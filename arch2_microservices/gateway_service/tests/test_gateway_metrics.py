@@ -0,0 +1,38 @@
+import pytest
+from src.gateway_server import app
+
+@pytest.fixture
+def client():
+    app.testing = True
+    with app.test_client() as client:
+        yield client
+
+def _sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0
+
+def test_metrics_endpoint_counts_routes(client):
+    sample = 'http_requests_total{method="GET",route="/api/health",status="200"}'
+    before = _sample(client.get("/metrics").get_data(as_text=True), sample)
+
+    client.get("/api/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert _sample(text, sample) == before + 1
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert _sample(text, "http_requests_in_flight") == 1
+
+def test_metrics_count_errors_by_status(client):
+    response = client.get("/api/no-such-route")
+    sample = f'http_request_errors_total{{route="unmatched",status="{response.status_code}"}}'
+    before = _sample(client.get("/metrics").get_data(as_text=True), sample)
+
+    client.get("/api/no-such-route")
+
+    assert response.status_code >= 400
+    assert _sample(client.get("/metrics").get_data(as_text=True), sample) == before + 1
@@ -0,0 +1,170 @@
+import json
+import grpc
+import pytest
+from src import borrowing_pb2, gateway_server, user_pb2
+
+
+class BadCursor(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.INVALID_ARGUMENT
+
+    def details(self):
+        return "Invalid page_token"
+
+
+class FakeStream:
+    """Iterator over streamed loans that records how far it was read and whether it was cancelled"""
+
+    def __init__(self, loans):
+        self.loans = iter(loans)
+        self.read = 0
+        self.cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        loan = next(self.loans)
+        self.read += 1
+        return loan
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeBorrowingClient:
+    """Streams `count` overdue loans (loan-0 most overdue), starting after the page_token cursor"""
+
+    def __init__(self, count, users=2):
+        self.count = count
+        self.users = users
+        self.requests = []
+        self.streams = []
+
+    def list_overdue(self, limit=0, page_token="", timeout=None):
+        self.requests.append((limit, page_token))
+        if page_token == "bad":
+            # Like a real stream, the error surfaces when reading it
+            return FakeStream(self._fail())
+        start = int(page_token.split("-")[1]) + 1 if page_token else 0
+        end = min(self.count, start + limit) if limit else self.count
+        stream = FakeStream(
+            borrowing_pb2.OverdueLoan(
+                borrowing=borrowing_pb2.BorrowedBook(borrow_id=f"loan-{n}", book_id=f"b{n % 3}", user_id=f"u{n % self.users}",
+                                                     is_overdue=True, days_overdue=100 - n),
+                cursor=f"cursor-{n}"
+            )
+            for n in range(start, end)
+        )
+        self.streams.append(stream)
+        return stream
+
+    def _fail(self):
+        raise BadCursor()
+        yield
+
+
+class FakeUserClient:
+    """Answers BatchGetUsers for any id, recording the ids of each call"""
+
+    def __init__(self):
+        self.batches = []
+
+    def batch_get_users(self, user_ids, timeout=None):
+        self.batches.append(list(user_ids))
+        return user_pb2.BatchGetUsersResponse(users=[user_pb2.User(
+            id=user_id, student_id=f"s-{user_id}", name=f"Name {user_id}", email=f"{user_id}@example.com",
+            password_hash="secret"
+        ) for user_id in user_ids])
+
+
+@pytest.fixture
+def users(monkeypatch):
+    fake = FakeUserClient()
+    monkeypatch.setattr(gateway_server, "user_client", fake)
+    return fake
+
+
+@pytest.fixture
+def borrowing(book_service, users, monkeypatch):
+    fake = FakeBorrowingClient(count=5)
+    monkeypatch.setattr(gateway_server, "borrowing_client", fake)
+    return fake
+
+
+def test_overdue_page_with_books_and_users(borrowing, book_service, users, client):
+    body = client.get("/api/overdue?limit=2").get_json()
+
+    # One extra loan is read to find out whether there is a next page
+    assert borrowing.requests == [(3, "")]
+    assert body["next_page_token"] == "cursor-1"
+    first = body["overdue_books"][0]
+    assert (first["borrowing"]["id"], first["borrowing"]["days_overdue"]) == ("loan-0", 100)
+    assert first["book"]["title"] == "Title b0"
+    assert first["user"] == {"id": "u0", "student_id": "s-u0", "name": "Name u0", "email": "u0@example.com",
+                             "role": ""}
+    # Books and users for the whole page in one batch each
+    assert [list(sent.ids) for sent in book_service.requests] == [["b0", "b1"]]
+    assert users.batches == [["u0", "u1"]]
+
+
+def test_full_overdue_page_makes_one_user_call(borrowing, users, client):
+    page = gateway_server.MAX_OVERDUE_PAGE_SIZE
+    borrowing.count = borrowing.users = page + 1
+
+    body = client.get(f"/api/overdue?limit={page}").get_json()
+
+    # A distinct user per loan is still one BatchGetUsers call, not one GetUser each
+    assert len(body["overdue_books"]) == page
+    assert [len(batch) for batch in users.batches] == [page]
+    assert body["overdue_books"][-1]["user"]["name"] == f"Name u{page - 1}"
+
+
+def test_overdue_pages_follow_the_token(borrowing, client):
+    pages = [client.get("/api/overdue?limit=2").get_json()]
+    while pages[-1]["next_page_token"]:
+        pages.append(client.get(f"/api/overdue?limit=2&page_token={pages[-1]['next_page_token']}").get_json())
+
+    ids = [entry["borrowing"]["id"] for page in pages for entry in page["overdue_books"]]
+    assert ids == [f"loan-{n}" for n in range(5)]
+    assert len(pages) == 3
+
+
+def test_overdue_bad_token_is_a_client_error(borrowing, client):
+    response = client.get("/api/overdue?page_token=bad")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid page_token"}
+
+
+def test_admin_export_streams_ndjson(borrowing, book_service, client, monkeypatch):
+    monkeypatch.setattr(gateway_server, "OVERDUE_PAGE_SIZE", 2)
+
+    response = client.get("/api/admin/overdue")
+
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [(line["borrowing"]["id"], line["book"]["title"], line["cursor"]) for line in lines] == [
+        (f"loan-{n}", f"Title b{n % 3}", f"cursor-{n}") for n in range(5)
+    ]
+    # Books are fetched per batch of loans, not per loan and not all at once
+    assert [len(sent.ids) for sent in book_service.requests] == [2, 2, 1]
+    assert borrowing.streams[0].cancelled
+
+
+def test_admin_export_is_relayed_lazily(borrowing, client, monkeypatch):
+    monkeypatch.setattr(gateway_server, "OVERDUE_PAGE_SIZE", 2)
+    borrowing.count = 1000
+
+    response = client.get("/api/admin/overdue", buffered=False)
+    chunks = response.iter_encoded()
+    next(chunks)
+
+    # Only about one batch has been read from the borrowing service so far
+    assert borrowing.streams[0].read <= 3
+    response.close()
+    assert borrowing.streams[0].cancelled
+
+
+def test_admin_export_bad_token(borrowing, client):
+    assert client.get("/api/admin/overdue?page_token=bad").status_code == 400
@@ -0,0 +1,90 @@
+import time
+import grpc
+import pytest
+from src import book_pb2, borrowing_pb2, gateway_server, user_pb2
+
+
+class Unavailable(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self):
+        return "Service unavailable"
+
+
+class FakeClient:
+    """Answers one stats RPC after `delay` seconds, counting calls; raises when `fail`"""
+
+    def __init__(self, method, response, delay=0.0, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+        def stats(timeout=None):
+            self.calls += 1
+            time.sleep(delay)
+            if self.fail:
+                raise Unavailable()
+            return response
+        setattr(self, method, stats)
+
+
+@pytest.fixture
+def services(monkeypatch):
+    clients = {
+        "book_client": FakeClient("get_book_stats", book_pb2.GetBookStatsResponse(
+            total_books=10, available_books=7, total_copies=25, available_copies=18), delay=0.2),
+        "user_client": FakeClient("get_user_stats", user_pb2.GetUserStatsResponse(
+            total_users=4, students=3, staff=1), delay=0.2),
+        "borrowing_client": FakeClient("get_borrowing_stats", borrowing_pb2.BorrowingStatsResponse(
+            total_borrowings=30, active_borrowings=7, overdue_borrowings=2, total_fines=12.5), delay=0.2),
+    }
+    for name, fake in clients.items():
+        monkeypatch.setattr(gateway_server, name, fake)
+    monkeypatch.setattr(gateway_server, "_stats_cache", None)
+    return clients
+
+
+def test_stats_combine_all_services_concurrently(services, client):
+    started = time.monotonic()
+    response = client.get("/api/admin/stats")
+
+    assert time.monotonic() - started < 0.4  # three 0.2s calls side by side
+    assert response.get_json() == {
+        "total_books": 10, "available_books": 7, "borrowed_books": 3, "total_copies": 25, "available_copies": 18,
+        "total_users": 4, "students": 3, "staff": 1,
+        "total_borrowings": 30, "active_borrowings": 7, "overdue_books": 2, "total_fines": 12.5
+    }
+
+
+def test_stats_are_cached_briefly(services, client, monkeypatch):
+    client.get("/api/admin/stats")
+    client.get("/api/admin/stats")
+    assert [fake.calls for fake in services.values()] == [1, 1, 1]
+
+    monkeypatch.setattr(gateway_server, "STATS_TTL_SECONDS", 0)
+    monkeypatch.setattr(gateway_server, "_stats_cache", None)
+    client.get("/api/admin/stats")
+    client.get("/api/admin/stats")
+    assert [fake.calls for fake in services.values()] == [3, 3, 3]
+
+
+def test_stats_degrade_when_one_service_fails(services, client):
+    services["user_client"].fail = True
+
+    body = client.get("/api/admin/stats").get_json()
+
+    assert (body["total_books"], body["total_users"], body["overdue_books"]) == (10, None, 2)
+    assert body["degraded"] == ["users"]
+    # Partial answers are not cached
+    services["user_client"].fail = False
+    assert client.get("/api/admin/stats").get_json()["total_users"] == 4
+
+
+def test_stats_fail_when_every_service_fails(services, client):
+    for fake in services.values():
+        fake.fail = True
+
+    response = client.get("/api/admin/stats")
+
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "Service unavailable"}
@@ -0,0 +1,104 @@
+"""
+Microbenchmark for turning book messages into a gateway JSON response.
+
+Compares, for a list response of --rows books, the ways the gateway can build
+the response body:
+
+    hand dict + jsonify     a dict written out per row, then jsonify (the gateway before src/converters.py)
+    MessageToDict + jsonify protobuf's generic json_format conversion
+    BOOK dict + jsonify     the compiled dict converter, still encoded by jsonify
+    BOOK.json_list          the compiled JSON writer and json_response, no dicts at all
+    BOOK.only(id, title)    the same with a field mask (?fields=id,title)
+
+    python performance_tests/converter_benchmark.py
+    python performance_tests/converter_benchmark.py --rows 1000 --rows 10000 --repeat 20 --json
+
+Only the gateway's own modules are needed; no service has to be running.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'gateway_service')))
+
+from flask import Flask, jsonify
+from google.protobuf.json_format import MessageToDict
+from src import book_pb2
+from src.converters import BOOK, dumps, json_response
+
+
+def hand_dict(b):
+    return {
+        "id": b.id,
+        "title": b.title,
+        "author": b.author,
+        "isbn": b.isbn,
+        "status": b.status,
+        "available": b.status == "available",
+        "category": b.category,
+        "description": b.description,
+        "total_copies": b.total_copies,
+        "available_copies": b.available_copies
+    }
+
+
+def make_books(rows):
+    return [book_pb2.Book(
+        id=f"{n:08x}-4b1e-4c6a-9d2f-5e8a7b3c1d0f", title=f"Distributed Systems, Volume {n}",
+        author="Martin Kleppmann", isbn=f"978{n:010d}", status="available" if n % 3 else "borrowed",
+        category="Computer Science", description="Designing data-intensive applications. " * 3,
+        total_copies=3, available_copies=n % 4
+    ) for n in range(rows)]
+
+
+def variants(books):
+    masked = BOOK.only("id", "title")
+    return {
+        'hand dict + jsonify': lambda: jsonify({"books": [hand_dict(b) for b in books]}).get_data(),
+        'MessageToDict + jsonify': lambda: jsonify({"books": [MessageToDict(b) for b in books]}).get_data(),
+        'BOOK dict + jsonify': lambda: jsonify({"books": BOOK.many(books)}).get_data(),
+        'BOOK.json_list': lambda: json_response(dumps({"books": BOOK.json_list(books)})).get_data(),
+        'BOOK.only(id, title)': lambda: json_response(dumps({"books": masked.json_list(books)})).get_data(),
+    }
+
+
+def measure(run, repeat):
+    """Best of `repeat` runs in seconds, and the response size"""
+    size = len(run())
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, action='append', help='repeatable; defaults to 1000 and 10000')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    results = []
+    with app.app_context():
+        for rows in args.rows or [1000, 10000]:
+            books = make_books(rows)
+            for name, run in variants(books).items():
+                seconds, size = measure(run, args.repeat)
+                results.append({'rows': rows, 'variant': name, 'ms': round(seconds * 1000, 2),
+                                'rows_per_s': int(rows / seconds), 'bytes': size})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'rows':>6} {'variant':26} {'ms':>8} {'rows/s':>10} {'bytes':>10}")
+    for result in results:
+        print(f"{result['rows']:6} {result['variant']:26} {result['ms']:8} {result['rows_per_s']:10} {result['bytes']:10}")
+
+
+if __name__ == '__main__':
+    main()
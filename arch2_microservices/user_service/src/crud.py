@@ -1,10 +1,13 @@
 # functions for create, get, update users
 # has grpc functions so grpc server stays clean
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from .models import User, UserType
 from . import user_pb2 # Used for type mapping, gRPC request/response messages
 
+MAX_BATCH_SIZE = 1000
+
 # Helper function (Placeholder for robust hashing)
 def hash_password(password):
     import hashlib
@@ -48,6 +51,13 @@ def get_user_by_id(db: Session, user_id: str) -> User | None:
     """Fetches a user record by ID."""
     return db.query(User).filter(User.id == user_id).first()
 
+def get_users(db: Session, user_ids) -> list[User]:
+    """Fetches several user records by ID in one query; unknown IDs are skipped."""
+    ids = set(user_ids)
+    if not ids:
+        return []
+    return db.query(User).filter(User.id.in_(ids)).all()
+
 def get_user_by_email(db: Session, email: str) -> User | None:
     """Fetches a user record by email for authentication."""
     return db.query(User).filter(User.email == email).first()
@@ -56,6 +66,15 @@ def get_user_by_student_id(db: Session, student_id: str) -> User | None:
     """Fetches a user record by student_id for authentication."""
     return db.query(User).filter(User.student_id == student_id).first()
 
+def get_user_stats(db: Session) -> dict:
+    """Counts users per user_type with one GROUP BY instead of loading the table."""
+    counts = dict(db.query(User.user_type, func.count(User.id)).group_by(User.user_type).all())
+    return {
+        "total_users": sum(counts.values()),
+        "students": counts.get(UserType.STUDENT.name, 0),
+        "staff": counts.get(UserType.STAFF.name, 0),
+    }
+
 # ----------------------------------------------------
 # PROTO MAPPING Helper
 # ----------------------------------------------------
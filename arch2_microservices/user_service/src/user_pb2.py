@@ -24,15 +24,15 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nuser.proto\x12\x04user\"\x8b\x01\n\x04User\x12\n\n\x02id\x18\x01 \x01(\t\x12\x12\n\nstudent_id\x18\x02 \x01(\t\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\r\n\x05\x65mail\x18\x04 \x01(\t\x12\x15\n\rpassword_hash\x18\x05 \x01(\t\x12!\n\tuser_type\x18\x06 \x01(\x0e\x32\x0e.user.UserType\x12\x0c\n\x04role\x18\x07 \x01(\t\"e\n\x11\x43reateUserRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\x12\x10\n\x08password\x18\x03 \x01(\t\x12!\n\tuser_type\x18\x04 \x01(\x0e\x32\x0e.user.UserType\".\n\x12\x43reateUserResponse\x12\x18\n\x04user\x18\x01 \x01(\x0b\x32\n.user.User\"\x1c\n\x0eGetUserRequest\x12\n\n\x02id\x18\x01 \x01(\t\"+\n\x0fGetUserResponse\x12\x18\n\x04user\x18\x01 \x01(\x0b\x32\n.user.User\"-\n\x17\x41uthenticateUserRequest\x12\x12\n\nstudent_id\x18\x01 \x01(\t\"E\n\x18\x41uthenticateUserResponse\x12\x18\n\x04user\x18\x01 \x01(\x0b\x32\n.user.User\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x12\n\x10ListUsersRequest\".\n\x11ListUsersResponse\x12\x19\n\x05users\x18\x01 \x03(\x0b\x32\n.user.User*/\n\x08UserType\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x0b\n\x07STUDENT\x10\x01\x12\t\n\x05STAFF\x10\x02\x32\x97\x02\n\x0bUserService\x12?\n\nCreateUser\x12\x17.user.CreateUserRequest\x1a\x18.user.CreateUserResponse\x12\x36\n\x07GetUser\x12\x14.user.GetUserRequest\x1a\x15.user.GetUserResponse\x12Q\n\x10\x41uthenticateUser\x12\x1d.user.AuthenticateUserRequest\x1a\x1e.user.AuthenticateUserResponse\x12<\n\tListUsers\x12\x16.user.ListUsersRequest\x1a\x17.user.ListUsersResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nuser.proto\x12\x04user\"\x8b\x01\n\x04User\x12\n\n\x02id\x18\x01 \x01(\t\x12\x12\n\nstudent_id\x18\x02 \x01(\t\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\r\n\x05\x65mail\x18\x04 \x01(\t\x12\x15\n\rpassword_hash\x18\x05 \x01(\t\x12!\n\tuser_type\x18\x06 \x01(\x0e\x32\x0e.user.UserType\x12\x0c\n\x04role\x18\x07 \x01(\t\"e\n\x11\x43reateUserRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\x12\x10\n\x08password\x18\x03 \x01(\t\x12!\n\tuser_type\x18\x04 \x01(\x0e\x32\x0e.user.UserType\".\n\x12\x43reateUserResponse\x12\x18\n\x04user\x18\x01 \x01(\x0b\x32\n.user.User\"\x1c\n\x0eGetUserRequest\x12\n\n\x02id\x18\x01 \x01(\t\"+\n\x0fGetUserResponse\x12\x18\n\x04user\x18\x01 \x01(\x0b\x32\n.user.User\"#\n\x14\x42\x61tchGetUsersRequest\x12\x0b\n\x03ids\x18\x01 \x03(\t\"2\n\x15\x42\x61tchGetUsersResponse\x12\x19\n\x05users\x18\x01 \x03(\x0b\x32\n.user.User\"-\n\x17\x41uthenticateUserRequest\x12\x12\n\nstudent_id\x18\x01 \x01(\t\"E\n\x18\x41uthenticateUserResponse\x12\x18\n\x04user\x18\x01 \x01(\x0b\x32\n.user.User\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x12\n\x10ListUsersRequest\".\n\x11ListUsersResponse\x12\x19\n\x05users\x18\x01 \x03(\x0b\x32\n.user.User\"\x15\n\x13GetUserStatsRequest\"L\n\x14GetUserStatsResponse\x12\x13\n\x0btotal_users\x18\x01 \x01(\x05\x12\x10\n\x08students\x18\x02 \x01(\x05\x12\r\n\x05staff\x18\x03 \x01(\x05*/\n\x08UserType\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x0b\n\x07STUDENT\x10\x01\x12\t\n\x05STAFF\x10\x02\x32\xa8\x03\n\x0bUserService\x12?\n\nCreateUser\x12\x17.user.CreateUserRequest\x1a\x18.user.CreateUserResponse\x12\x36\n\x07GetUser\x12\x14.user.GetUserRequest\x1a\x15.user.GetUserResponse\x12H\n\rBatchGetUsers\x12\x1a.user.BatchGetUsersRequest\x1a\x1b.user.BatchGetUsersResponse\x12Q\n\x10\x41uthenticateUser\x12\x1d.user.AuthenticateUserRequest\x1a\x1e.user.AuthenticateUserResponse\x12<\n\tListUsers\x12\x16.user.ListUsersRequest\x1a\x17.user.ListUsersResponse\x12\x45\n\x0cGetUserStats\x12\x19.user.GetUserStatsRequest\x1a\x1a.user.GetUserStatsResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'user_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_USERTYPE']._serialized_start=574
-  _globals['_USERTYPE']._serialized_end=621
+  _globals['_USERTYPE']._serialized_start=764
+  _globals['_USERTYPE']._serialized_end=811
   _globals['_USER']._serialized_start=21
   _globals['_USER']._serialized_end=160
   _globals['_CREATEUSERREQUEST']._serialized_start=162
@@ -43,14 +43,22 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_GETUSERREQUEST']._serialized_end=341
   _globals['_GETUSERRESPONSE']._serialized_start=343
   _globals['_GETUSERRESPONSE']._serialized_end=386
-  _globals['_AUTHENTICATEUSERREQUEST']._serialized_start=388
-  _globals['_AUTHENTICATEUSERREQUEST']._serialized_end=433
-  _globals['_AUTHENTICATEUSERRESPONSE']._serialized_start=435
-  _globals['_AUTHENTICATEUSERRESPONSE']._serialized_end=504
-  _globals['_LISTUSERSREQUEST']._serialized_start=506
-  _globals['_LISTUSERSREQUEST']._serialized_end=524
-  _globals['_LISTUSERSRESPONSE']._serialized_start=526
-  _globals['_LISTUSERSRESPONSE']._serialized_end=572
-  _globals['_USERSERVICE']._serialized_start=624
-  _globals['_USERSERVICE']._serialized_end=903
+  _globals['_BATCHGETUSERSREQUEST']._serialized_start=388
+  _globals['_BATCHGETUSERSREQUEST']._serialized_end=423
+  _globals['_BATCHGETUSERSRESPONSE']._serialized_start=425
+  _globals['_BATCHGETUSERSRESPONSE']._serialized_end=475
+  _globals['_AUTHENTICATEUSERREQUEST']._serialized_start=477
+  _globals['_AUTHENTICATEUSERREQUEST']._serialized_end=522
+  _globals['_AUTHENTICATEUSERRESPONSE']._serialized_start=524
+  _globals['_AUTHENTICATEUSERRESPONSE']._serialized_end=593
+  _globals['_LISTUSERSREQUEST']._serialized_start=595
+  _globals['_LISTUSERSREQUEST']._serialized_end=613
+  _globals['_LISTUSERSRESPONSE']._serialized_start=615
+  _globals['_LISTUSERSRESPONSE']._serialized_end=661
+  _globals['_GETUSERSTATSREQUEST']._serialized_start=663
+  _globals['_GETUSERSTATSREQUEST']._serialized_end=684
+  _globals['_GETUSERSTATSRESPONSE']._serialized_start=686
+  _globals['_GETUSERSTATSRESPONSE']._serialized_end=762
+  _globals['_USERSERVICE']._serialized_start=814
+  _globals['_USERSERVICE']._serialized_end=1238
 # @@protoc_insertion_point(module_scope)
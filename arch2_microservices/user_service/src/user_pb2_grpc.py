@@ -45,6 +45,11 @@ class UserServiceStub(object):
                 request_serializer=user__pb2.GetUserRequest.SerializeToString,
                 response_deserializer=user__pb2.GetUserResponse.FromString,
                 _registered_method=True)
+        self.BatchGetUsers = channel.unary_unary(
+                '/user.UserService/BatchGetUsers',
+                request_serializer=user__pb2.BatchGetUsersRequest.SerializeToString,
+                response_deserializer=user__pb2.BatchGetUsersResponse.FromString,
+                _registered_method=True)
         self.AuthenticateUser = channel.unary_unary(
                 '/user.UserService/AuthenticateUser',
                 request_serializer=user__pb2.AuthenticateUserRequest.SerializeToString,
@@ -55,6 +60,11 @@ class UserServiceStub(object):
                 request_serializer=user__pb2.ListUsersRequest.SerializeToString,
                 response_deserializer=user__pb2.ListUsersResponse.FromString,
                 _registered_method=True)
+        self.GetUserStats = channel.unary_unary(
+                '/user.UserService/GetUserStats',
+                request_serializer=user__pb2.GetUserStatsRequest.SerializeToString,
+                response_deserializer=user__pb2.GetUserStatsResponse.FromString,
+                _registered_method=True)
 
 
 class UserServiceServicer(object):
@@ -75,6 +85,13 @@ class UserServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchGetUsers(self, request, context):
+        """Several users in one round-trip and one query
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def AuthenticateUser(self, request, context):
         """Authenticate a user (login)
         """
@@ -89,6 +106,13 @@ class UserServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetUserStats(self, request, context):
+        """User counts, computed in SQL (cheaper than ListUsers for dashboards)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_UserServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -102,6 +126,11 @@ def add_UserServiceServicer_to_server(servicer, server):
                     request_deserializer=user__pb2.GetUserRequest.FromString,
                     response_serializer=user__pb2.GetUserResponse.SerializeToString,
             ),
+            'BatchGetUsers': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetUsers,
+                    request_deserializer=user__pb2.BatchGetUsersRequest.FromString,
+                    response_serializer=user__pb2.BatchGetUsersResponse.SerializeToString,
+            ),
             'AuthenticateUser': grpc.unary_unary_rpc_method_handler(
                     servicer.AuthenticateUser,
                     request_deserializer=user__pb2.AuthenticateUserRequest.FromString,
@@ -112,6 +141,11 @@ def add_UserServiceServicer_to_server(servicer, server):
                     request_deserializer=user__pb2.ListUsersRequest.FromString,
                     response_serializer=user__pb2.ListUsersResponse.SerializeToString,
             ),
+            'GetUserStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUserStats,
+                    request_deserializer=user__pb2.GetUserStatsRequest.FromString,
+                    response_serializer=user__pb2.GetUserStatsResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'user.UserService', rpc_method_handlers)
@@ -178,6 +212,33 @@ class UserService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def BatchGetUsers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/user.UserService/BatchGetUsers',
+            user__pb2.BatchGetUsersRequest.SerializeToString,
+            user__pb2.BatchGetUsersResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def AuthenticateUser(request,
             target,
@@ -231,3 +292,30 @@ class UserService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetUserStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/user.UserService/GetUserStats',
+            user__pb2.GetUserStatsRequest.SerializeToString,
+            user__pb2.GetUserStatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
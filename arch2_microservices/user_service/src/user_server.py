@@ -59,6 +59,20 @@ class UserService(user_pb2_grpc.UserServiceServicer):
             print(f"Error retrieving user: {e}")
             context.abort(grpc.StatusCode.INTERNAL, "Could not retrieve user due to database error.")
 
+    def BatchGetUsers(self, request, context):
+        if len(request.ids) > crud.MAX_BATCH_SIZE:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"At most {crud.MAX_BATCH_SIZE} ids per batch")
+
+        try:
+            with get_db() as db:
+                users = {user.id: user for user in crud.get_users(db, request.ids)}
+                ordered = [crud.user_model_to_proto(users[user_id])
+                           for user_id in dict.fromkeys(request.ids) if user_id in users]
+                return user_pb2.BatchGetUsersResponse(users=ordered)
+        except Exception as e:
+            print(f"Error retrieving users: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, "Could not retrieve users due to database error.")
+
     def AuthenticateUser(self, request, context):
         try:
             with get_db() as db:
@@ -97,6 +111,15 @@ class UserService(user_pb2_grpc.UserServiceServicer):
             print(f"Error listing users: {e}")
             context.abort(grpc.StatusCode.INTERNAL, "Could not list users due to database error.")
 
+    def GetUserStats(self, request, context):
+        try:
+            with get_db() as db:
+                # Counted in SQL; ListUsers would ship every row (and hash) just to be counted
+                return user_pb2.GetUserStatsResponse(**crud.get_user_stats(db))
+        except Exception as e:
+            print(f"Error counting users: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, "Could not count users due to database error.")
+
 
 def serve():
     # --- NEW: Initialize the database tables on startup ---
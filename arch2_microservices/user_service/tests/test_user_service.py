@@ -129,3 +129,34 @@ def test_authenticate_user(grpc_server):
             password="pass456"
         ))
     assert e.value.code() == grpc.StatusCode.UNAUTHENTICATED
+
+
+def test_user_stats_are_counted_per_type(grpc_server):
+    """Tests GetUserStats counts users by type without listing them."""
+    for name, user_type in [("Ann", user_pb2.STUDENT), ("Ben", user_pb2.STUDENT), ("Cy", user_pb2.STAFF)]:
+        grpc_server.CreateUser(user_pb2.CreateUserRequest(
+            name=name, email=f"{name.lower()}@example.com", password="pw", user_type=user_type
+        ))
+
+    stats = grpc_server.GetUserStats(user_pb2.GetUserStatsRequest())
+
+    assert (stats.total_users, stats.students, stats.staff) == (3, 2, 1)
+
+
+def test_batch_get_users(grpc_server):
+    """Tests BatchGetUsers keeps request order, drops duplicates and skips unknown ids."""
+    ids = [grpc_server.CreateUser(user_pb2.CreateUserRequest(
+        name=name, email=f"{name.lower()}@example.com", password="pw", user_type=user_pb2.STUDENT
+    )).user.id for name in ("Ann", "Ben", "Cy")]
+
+    resp = grpc_server.BatchGetUsers(user_pb2.BatchGetUsersRequest(ids=[ids[2], "missing", ids[0], ids[2]]))
+
+    assert [u.name for u in resp.users] == ["Cy", "Ann"]
+    assert list(grpc_server.BatchGetUsers(user_pb2.BatchGetUsersRequest()).users) == []
+
+
+def test_batch_get_users_rejects_oversized_batches(grpc_server):
+    """Tests BatchGetUsers caps the number of ids per call."""
+    with pytest.raises(grpc.RpcError) as e:
+        grpc_server.BatchGetUsers(user_pb2.BatchGetUsersRequest(ids=[str(n) for n in range(1001)]))
+    assert e.value.code() == grpc.StatusCode.INVALID_ARGUMENT
@@ -48,6 +48,23 @@ CREATE TABLE IF NOT EXISTS reservations (
     notified BOOLEAN DEFAULT FALSE
 );
 
+-- Statistics counters table (maintained when STATS_COUNTERS_ENABLED=true)
+CREATE TABLE IF NOT EXISTS library_counters (
+    name VARCHAR(50) PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+
+-- Daily rollups for time-range analytics (maintained by `flask rollup-stats`)
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day DATE PRIMARY KEY,
+    borrows INTEGER NOT NULL DEFAULT 0,
+    returns INTEGER NOT NULL DEFAULT 0,
+    new_users INTEGER NOT NULL DEFAULT 0,
+    overdue INTEGER NOT NULL DEFAULT 0,
+    fines DOUBLE PRECISION NOT NULL DEFAULT 0.0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_users_student_id ON users(student_id);
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
@@ -57,10 +74,12 @@ CREATE INDEX IF NOT EXISTS idx_books_category ON books(category);
 CREATE INDEX IF NOT EXISTS idx_books_isbn ON books(isbn);
 CREATE INDEX IF NOT EXISTS idx_borrowings_user_id ON borrowings(user_id);
 CREATE INDEX IF NOT EXISTS idx_borrowings_book_id ON borrowings(book_id);
-CREATE INDEX IF NOT EXISTS idx_borrowings_returned ON borrowings(returned);
+CREATE INDEX IF NOT EXISTS idx_borrowings_active_user_book ON borrowings(user_id, book_id) WHERE returned = false;
+CREATE INDEX IF NOT EXISTS idx_borrowings_active_due_date ON borrowings(due_date) WHERE returned = false;
 CREATE INDEX IF NOT EXISTS idx_reservations_user_id ON reservations(user_id);
 CREATE INDEX IF NOT EXISTS idx_reservations_book_id ON reservations(book_id);
 CREATE INDEX IF NOT EXISTS idx_reservations_status ON reservations(status);
+CREATE INDEX IF NOT EXISTS idx_reservations_book_status_priority ON reservations(book_id, status, priority);
 
 -- Grant permissions
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO admin;